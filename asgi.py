@@ -0,0 +1,9 @@
+"""Punto de entrada ASGI (engine asyncio) para servidores como Uvicorn.
+
+Uso: ``uvicorn asgi:app --workers 2``
+"""
+
+from src.asgi import create_asgi_app
+from src.config import ProductionConfig
+
+app = create_asgi_app(ProductionConfig)
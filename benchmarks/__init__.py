@@ -0,0 +1 @@
+"""Scripts de benchmark para medir el rendimiento de la API."""
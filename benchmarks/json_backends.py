@@ -0,0 +1,86 @@
+"""Microbenchmark de los backends de ``WatchlogJSONProvider``.
+
+Uso::
+
+    python -m benchmarks.json_backends --sizes 10000 100000
+
+Serializa el mismo listado de peliculas (con ``created_at`` como ``datetime``,
+igual que lo devuelven los serializadores) con cada backend disponible y con
+el proveedor por defecto de Flask como referencia.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from src.json_provider import WatchlogJSONProvider, msgspec, orjson
+
+
+def _payload(size: int) -> list[dict]:
+    """Listado sintetico con la forma de ``GET /movies/?all=1``."""
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": i,
+            "title": f"movie {i}",
+            "genre": ["drama", "thriller"],
+            "release_year": 2000 + i % 25,
+            "created_at": base + timedelta(seconds=i),
+        }
+        for i in range(size)
+    ]
+
+
+def _timed(fn, repeat: int) -> float:
+    """Mejor tiempo de ``repeat`` ejecuciones, en milisegundos."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        fn()
+        best = min(best, perf_counter() - start)
+    return round(best * 1000, 2)
+
+
+def _providers() -> dict:
+    """Proveedores a comparar segun los paquetes instalados."""
+    backends = ["stdlib"]
+    if orjson is not None:
+        backends.append("orjson")
+    if msgspec is not None:
+        backends.append("msgspec")
+
+    flask_app = Flask(__name__)
+    providers = {"flask_default": DefaultJSONProvider(flask_app)}
+    for backend in backends:
+        app = Flask(__name__)
+        app.config["JSON_BACKEND"] = backend
+        providers[backend] = WatchlogJSONProvider(app)
+    return providers
+
+
+def main() -> None:
+    """Punto de entrada del microbenchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    providers = _providers()
+    results = {}
+    for size in args.sizes:
+        payload = _payload(size)
+        results[str(size)] = {
+            f"{name}_ms": _timed(lambda p=provider: p.dumps(payload), args.repeat)
+            for name, provider in providers.items()
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
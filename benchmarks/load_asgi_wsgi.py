@@ -0,0 +1,207 @@
+"""Prueba de carga: modo WSGI (gunicorn gthread) vs ASGI (uvicorn + engine asyncio).
+
+Uso::
+
+    python -m benchmarks.load_asgi_wsgi --workers 2 --threads 4 --concurrency 64 --duration 10
+
+Crea una base SQLite temporal con una watchlist por usuario, levanta cada
+servidor con la misma cantidad de procesos y lo satura con clientes HTTP/1.1
+keep-alive que piden ``GET /me/watchlist``. Informa solicitudes por segundo,
+latencias p50/p99 y la memoria residente total (maestro + workers) medida al
+terminar la carga, para comparar ambos modos a memoria similar. El cache se
+desactiva para medir el camino hasta la base. Requiere Linux (lee ``/proc``),
+gunicorn y uvicorn.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _seed(env: dict, users: int, entries: int) -> None:
+    """Crea el esquema y ``users`` watchlists de ``entries`` peliculas."""
+    code = f"""
+from src import create_app
+from src.config import ProductionConfig
+from src.extensions import db
+from src.models import Movie, User, WatchEntry
+app = create_app(ProductionConfig)
+with app.app_context():
+    db.create_all()
+    db.session.execute(db.insert(User), [{{"id": u, "name": f"u{{u}}", "email": f"u{{u}}@bench"}} for u in range(1, {users} + 1)])
+    db.session.execute(db.insert(Movie), [{{"id": m, "title": f"movie {{m}}", "genre": ["drama"]}} for m in range(1, {entries} + 1)])
+    db.session.execute(db.insert(WatchEntry), [
+        {{"user_id": u, "content_type": "movie", "content_id": m, "movie_id": m, "watched_episodes": 0}}
+        for u in range(1, {users} + 1) for m in range(1, {entries} + 1)
+    ])
+    db.session.commit()
+"""
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True)
+
+
+def _server_command(mode: str, port: int, workers: int, threads: int) -> list[str]:
+    if mode == "wsgi":
+        return [
+            sys.executable, "-m", "gunicorn", "wsgi:app",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(workers),
+            "--worker-class", "gthread",
+            "--threads", str(threads),
+            "--log-level", "warning",
+        ]
+    return [
+        sys.executable, "-m", "uvicorn", "asgi:app",
+        "--host", "127.0.0.1",
+        "--port", str(port),
+        "--workers", str(workers),
+        "--log-level", "warning",
+        "--no-access-log",
+    ]
+
+
+def _tree_rss_mb(pid: int) -> float:
+    """Memoria residente de ``pid`` y sus descendientes, en MB."""
+    children: dict[int, list[int]] = {}
+    for entry in Path("/proc").iterdir():
+        if entry.name.isdigit():
+            try:
+                fields = (entry / "stat").read_text().rsplit(")", 1)[1].split()
+            except OSError:
+                continue
+            children.setdefault(int(fields[1]), []).append(int(entry.name))
+    total_kb, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            for line in Path(f"/proc/{current}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return round(total_kb / 1024, 1)
+
+
+async def _request(reader, writer, path: str, user_id: int) -> int:
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: bench\r\nX-User-Id: {user_id}\r\nConnection: keep-alive\r\n\r\n".encode()
+    )
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(port: int, path: str, users: int, deadline: float, latencies: list[float], errors: list[int]) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while perf_counter() < deadline:
+            start = perf_counter()
+            status = await _request(reader, writer, path, random.randint(1, users))
+            latencies.append(perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def _load(port: int, path: str, users: int, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors: list[int] = []
+    deadline = perf_counter() + duration
+    await asyncio.gather(*[_client(port, path, users, deadline, latencies, errors) for _ in range(concurrency)])
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": pct(0.50),
+        "p99_ms": pct(0.99),
+    }
+
+
+def _wait_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+                sock.sendall(b"GET /health/ HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n")
+                if b" 200 " in sock.recv(64):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"el servidor en el puerto {port} no respondio")
+
+
+def run_mode(mode: str, env: dict, args: argparse.Namespace) -> dict:
+    """Levanta el servidor de ``mode``, lo calienta y mide."""
+    port = _free_port()
+    server = subprocess.Popen(_server_command(mode, port, args.workers, args.threads), cwd=ROOT, env=env)
+    try:
+        _wait_ready(port)
+        asyncio.run(_load(port, args.path, args.users, args.concurrency, 2.0))
+        result = asyncio.run(_load(port, args.path, args.users, args.concurrency, args.duration))
+        result["rss_mb"] = _tree_rss_mb(server.pid)
+        return result
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main() -> None:
+    """Punto de entrada de la prueba de carga."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4, help="hilos por worker en modo WSGI")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--entries", type=int, default=50, help="entradas por watchlist")
+    parser.add_argument("--path", default="/me/watchlist")
+    parser.add_argument("--modes", nargs="+", default=["wsgi", "asgi"], choices=["wsgi", "asgi"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+            "SQLITE_TUNING": "1",
+            "CACHE_ENABLED": "0",
+            "DB_POOL_SIZE": str(max(args.threads, 5)),
+        }
+        _seed(env, args.users, args.entries)
+        results = {mode: run_mode(mode, env, args) for mode in args.modes}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
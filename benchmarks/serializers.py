@@ -0,0 +1,132 @@
+"""Microbenchmark de serializacion: ``to_dict`` clasico vs serializadores precompilados.
+
+Uso::
+
+    python -m benchmarks.serializers --sizes 10000 100000
+
+Para peliculas y entradas de watchlist mide tres estrategias, incluyendo la
+consulta: objetos ORM con el ``to_dict`` anterior (basado en ``getattr``),
+objetos ORM con el ``to_dict`` actual y filas de columnas con ``from_row``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime, timezone
+from time import perf_counter
+
+from src import create_app
+from src.config import TestingConfig
+from src.extensions import db
+from src.models import Movie, User, WatchEntry
+from src.models.movie import MOVIE_SERIALIZER
+from src.models.watch_entry import ENTRY_SERIALIZER, serialize_entry_row
+
+
+def _legacy_movie_to_dict(self) -> dict:
+    """Copia del ``Movie.to_dict`` previo a los serializadores."""
+    created = getattr(self, "created_at", datetime.now(timezone.utc))
+    return {
+        "id": getattr(self, "id", None),
+        "title": getattr(self, "title", None),
+        "genre": getattr(self, "genre", None),
+        "release_year": getattr(self, "release_year", None),
+        "created_at": created.isoformat(),
+    }
+
+
+def _legacy_entry_to_dict(self) -> dict:
+    """Copia del ``WatchEntry.to_dict`` previo a los serializadores."""
+    updated = getattr(self, "updated_at", datetime.now(timezone.utc))
+    return {
+        "id": getattr(self, "id", None),
+        "user_id": getattr(self, "user_id", None),
+        "content_type": getattr(self, "content_type", None),
+        "movie_id": getattr(self, "movie_id", None),
+        "series_id": getattr(self, "series_id", None),
+        "content_id": getattr(self, "content_id", None),
+        "status": getattr(self, "status", None),
+        "current_season": getattr(self, "current_season", None),
+        "current_episode": getattr(self, "current_episode", None),
+        "watched_episodes": getattr(self, "watched_episodes", None),
+        "total_episodes": getattr(self, "total_episodes", None),
+        "percentage": self.percentage_watched(),
+        "updated_at": updated.isoformat(),
+    }
+
+
+def _seed(size: int) -> None:
+    """Carga ``size`` peliculas y una entrada de watchlist por pelicula."""
+    db.session.execute(db.delete(WatchEntry))
+    db.session.execute(db.delete(Movie))
+    db.session.execute(db.delete(User))
+    db.session.execute(db.insert(User), [{"id": 1, "name": "bench", "email": "bench@bench"}])
+    db.session.execute(
+        db.insert(Movie),
+        [{"id": i, "title": f"movie {i}", "genre": ["drama"], "release_year": 2000} for i in range(1, size + 1)],
+    )
+    db.session.execute(
+        db.insert(WatchEntry),
+        [
+            {"user_id": 1, "content_type": "movie", "content_id": i, "movie_id": i, "watched_episodes": 0}
+            for i in range(1, size + 1)
+        ],
+    )
+    db.session.commit()
+
+
+def _timed(fn) -> float:
+    """Ejecuta ``fn`` con la sesion limpia y devuelve los milisegundos."""
+    db.session.expunge_all()
+    start = perf_counter()
+    fn()
+    elapsed = (perf_counter() - start) * 1000
+    db.session.expunge_all()
+    return round(elapsed, 2)
+
+
+def _bench(size: int) -> dict:
+    """Mide las tres estrategias para peliculas y entradas."""
+    movie_cols = MOVIE_SERIALIZER.columns(Movie)
+    entry_cols = [*ENTRY_SERIALIZER.columns(WatchEntry), db.null()]
+    return {
+        "movies": {
+            "orm_legacy_to_dict_ms": _timed(
+                lambda: [_legacy_movie_to_dict(m) for m in db.session.scalars(db.select(Movie))]
+            ),
+            "orm_to_dict_ms": _timed(lambda: [m.to_dict() for m in db.session.scalars(db.select(Movie))]),
+            "rows_from_row_ms": _timed(
+                lambda: [MOVIE_SERIALIZER.from_row(r) for r in db.session.execute(db.select(*movie_cols))]
+            ),
+        },
+        "watch_entries": {
+            "orm_legacy_to_dict_ms": _timed(
+                lambda: [_legacy_entry_to_dict(e) for e in db.session.scalars(db.select(WatchEntry))]
+            ),
+            "orm_to_dict_ms": _timed(lambda: [e.to_dict() for e in db.session.scalars(db.select(WatchEntry))]),
+            "rows_from_row_ms": _timed(
+                lambda: [serialize_entry_row(r) for r in db.session.execute(db.select(*entry_cols))]
+            ),
+        },
+    }
+
+
+def main() -> None:
+    """Punto de entrada del microbenchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    app = create_app(TestingConfig)
+    results = {}
+    with app.app_context():
+        db.create_all()
+        for size in args.sizes:
+            _seed(size)
+            results[str(size)] = _bench(size)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,506 @@
+"""Suite de benchmarks de todos los endpoints, con comparacion contra una linea base.
+
+Uso::
+
+    python -m benchmarks.suite run --users 200 --movies 5000 --series 500 --entries 40 --output base.json
+    python -m benchmarks.suite run --server wsgi --baseline base.json
+    python -m benchmarks.suite compare base.json nuevo.json --tolerance 0.15
+
+``run`` carga un dataset sintetico determinista (``--seed``) con inserts Core
+en una base SQLite temporal o en ``--database-url`` (por ejemplo un Postgres
+local), que debe estar vacia salvo que se pase ``--recreate`` para borrar y
+recrear sus tablas, y recorre cada ruta de la API con
+el test client de Flask o, con ``--server``, contra gunicorn/uvicorn reales.
+Por escenario informa solicitudes por segundo, latencia p50/p99 y sentencias
+SQL por solicitud (del header ``Server-Timing``) como JSON. ``compare`` (o
+``run --baseline``) marca como regresion una caida de rps o una suba de p99
+mayor a ``--tolerance``, mas de media sentencia SQL extra por solicitud (el
+promedio varia algo con los aciertos del cache) y errores nuevos; sale con
+codigo 1 si encuentra alguna.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable
+
+from benchmarks.load_asgi_wsgi import ROOT, _free_port, _server_command, _wait_ready
+from src import create_app
+from src.config import ProductionConfig
+from src.extensions import db
+from src.models import Movie, MovieGenre, Season, Serie, User, UserStats, WatchEntry
+from src.models.movie_genre import genre_keys
+from src.models.user_stats import STATS_COUNTERS, entry_contribution
+from src.models.watch_entry import compute_percentage
+
+GENRES = ("drama", "comedy", "action", "thriller", "horror", "sci-fi", "romance", "documentary", "animation")
+STATUSES = ("watching", "completed", "paused")
+INSERT_CHUNK = 5000
+BULK_LINES = 100
+PROGRESS_BATCH_ITEMS = 20
+# Sentencias extra por solicitud que cuentan como regresion
+SQL_TOLERANCE = 0.5
+
+_SQL_COUNT = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+@dataclass
+class Sizes:
+    """Cardinalidades del dataset sintetico."""
+
+    users: int
+    movies: int
+    series: int
+    seasons: int
+    episodes: int
+    entries: int
+
+
+@dataclass
+class Request:
+    """Solicitud ya armada de un escenario."""
+
+    method: str
+    path: str
+    user_id: int | None = None
+    json: Any = None
+    body: bytes | None = None
+    content_type: str | None = None
+
+
+@dataclass
+class Dataset:
+    """Ids cargados que los escenarios usan para armar solicitudes."""
+
+    sizes: Sizes
+    rng: random.Random
+    # (user_id, series_id, total de episodios) de las entradas de series
+    series_entries: list[tuple[int, int, int]] = field(default_factory=list)
+    users_with_series: dict[int, list[tuple[int, int]]] = field(default_factory=dict)
+
+
+def _insert(table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), INSERT_CHUNK):
+        db.session.execute(db.insert(table), rows[start:start + INSERT_CHUNK])
+
+
+def seed(sizes: Sizes, seed_value: int) -> Dataset:
+    """Carga el dataset en tablas recien creadas (los ids quedan 1..N en orden).
+
+    Completa tambien lo derivado: ``movie_genres``, ``series.total_episodes``,
+    ``watch_entries.percentage`` y ``user_stats``.
+    """
+    rng = random.Random(seed_value)
+    data = Dataset(sizes, rng)
+    _insert(User, [{"name": f"user {u}", "email": f"user{u}@bench.local"} for u in range(1, sizes.users + 1)])
+
+    movies, links = [], []
+    for movie_id in range(1, sizes.movies + 1):
+        genre = rng.sample(GENRES, rng.randint(1, 3))
+        movies.append({"title": f"movie {movie_id}", "genre": genre, "release_year": rng.randint(1970, 2025)})
+        links.extend({"movie_id": movie_id, "genre": key} for key in genre_keys(genre))
+    _insert(Movie, movies)
+    _insert(MovieGenre, links)
+
+    series, seasons, series_totals = [], [], {}
+    for series_id in range(1, sizes.series + 1):
+        counts = [rng.randint(max(1, sizes.episodes // 2), sizes.episodes) for _ in range(sizes.seasons)]
+        series_totals[series_id] = sum(counts)
+        series.append({"title": f"series {series_id}", "total_seasons": sizes.seasons, "total_episodes": sum(counts)})
+        seasons.extend(
+            {"series_id": series_id, "number": number, "episodes_count": count}
+            for number, count in enumerate(counts, start=1)
+        )
+    _insert(Serie, series)
+    _insert(Season, seasons)
+
+    entries, stats = [], []
+    for user_id in range(1, sizes.users + 1):
+        n_series = min(sizes.series, sizes.entries // 2)
+        n_movies = min(sizes.movies, sizes.entries - n_series)
+        totals = dict.fromkeys(STATS_COUNTERS, 0)
+        for movie_id in rng.sample(range(1, sizes.movies + 1), n_movies):
+            status = rng.choice(STATUSES)
+            entries.append({
+                "user_id": user_id, "content_type": "movie", "content_id": movie_id, "movie_id": movie_id,
+                "status": status, "watched_episodes": 0, "percentage": compute_percentage(None, 0, status),
+            })
+            for key, value in entry_contribution("movie", status, 0).items():
+                totals[key] += value
+        for series_id in rng.sample(range(1, sizes.series + 1), n_series):
+            status, total = rng.choice(STATUSES), series_totals[series_id]
+            watched = total if status == "completed" else rng.randint(0, total)
+            entries.append({
+                "user_id": user_id, "content_type": "series", "content_id": series_id, "series_id": series_id,
+                "status": status, "current_season": 1, "current_episode": 0, "watched_episodes": watched,
+                "percentage": compute_percentage(total, watched, status),
+            })
+            data.series_entries.append((user_id, series_id, total))
+            data.users_with_series.setdefault(user_id, []).append((series_id, total))
+            for key, value in entry_contribution("series", status, watched).items():
+                totals[key] += value
+        stats.append({"user_id": user_id, **totals})
+    _insert(WatchEntry, entries)
+    _insert(UserStats, stats)
+    db.session.commit()
+    return data
+
+
+def _spare_movies(count: int) -> list[int]:
+    """Peliculas extra para escenarios que las modifican o borran."""
+    rows = [{"title": f"spare movie {i}", "genre": ["drama"]} for i in range(count)]
+    ids = db.session.execute(
+        db.insert(Movie).returning(Movie.id, sort_by_parameter_order=True), rows
+    ).scalars().all()
+    _insert(MovieGenre, [{"movie_id": movie_id, "genre": "drama"} for movie_id in ids])
+    db.session.commit()
+    return list(ids)
+
+
+def _spare_series(count: int, with_season: bool) -> list[int]:
+    """Series extra (con una temporada de 10 episodios si ``with_season``)."""
+    rows = [
+        {"title": f"spare series {i}", "total_seasons": 1, "total_episodes": 10 if with_season else 0}
+        for i in range(count)
+    ]
+    ids = db.session.execute(
+        db.insert(Serie).returning(Serie.id, sort_by_parameter_order=True), rows
+    ).scalars().all()
+    if with_season:
+        _insert(Season, [{"series_id": series_id, "number": 1, "episodes_count": 10} for series_id in ids])
+    db.session.commit()
+    return list(ids)
+
+
+def _ndjson(rows: list[dict]) -> bytes:
+    return "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+
+
+def _any_user(data: Dataset) -> int:
+    return data.rng.randint(1, data.sizes.users)
+
+
+def build_scenarios(data: Dataset, n: int) -> dict[str, list[Request]]:
+    """Arma ``n`` solicitudes por escenario; lecturas primero, borrados al final."""
+    rng, sizes = data.rng, data.sizes
+
+    def many(factory: Callable[[int], Request]) -> list[Request]:
+        return [factory(i) for i in range(n)]
+
+    def progress(i: int) -> Request:
+        user_id, series_id, total = rng.choice(data.series_entries)
+        return Request("PATCH", f"/progress/series/{series_id}", user_id,
+                       {"status": "watching", "watched_episodes": rng.randint(0, total)})
+
+    def progress_batch(i: int) -> Request:
+        user_id = rng.choice(list(data.users_with_series))
+        items = data.users_with_series[user_id][:PROGRESS_BATCH_ITEMS]
+        updates = [{"series_id": series_id, "watched_episodes": rng.randint(0, total)} for series_id, total in items]
+        return Request("PATCH", "/progress/series", user_id, updates)
+
+    spare_movies_add = _spare_movies(n)
+    spare_series_add = _spare_series(n, with_season=False)
+    spare_seasons_add = _spare_series(n, with_season=False)
+    spare_seasons_update = _spare_series(n, with_season=True)
+    spare_seasons_delete = _spare_series(n, with_season=True)
+    spare_movies_delete = _spare_movies(n)
+    spare_series_delete = _spare_series(n, with_season=True)
+
+    return {
+        "health_live": many(lambda i: Request("GET", "/health/live")),
+        "health_ready": many(lambda i: Request("GET", "/health/ready")),
+        "health_pool": many(lambda i: Request("GET", "/health/pool")),
+        "health_cache": many(lambda i: Request("GET", "/health/cache")),
+        "metrics": many(lambda i: Request("GET", "/metrics")),
+        "movies_list": many(lambda i: Request("GET", "/movies/?limit=50")),
+        "movies_list_genre": many(lambda i: Request("GET", f"/movies/?genre={rng.choice(GENRES)}&limit=50")),
+        "movies_get": many(lambda i: Request("GET", f"/movies/{rng.randint(1, sizes.movies)}")),
+        "series_list": many(lambda i: Request("GET", "/series/?limit=50")),
+        "series_list_seasons": many(lambda i: Request("GET", "/series/?limit=50&include_seasons=1")),
+        "series_get": many(lambda i: Request("GET", f"/series/{rng.randint(1, sizes.series)}")),
+        "watchlist": many(lambda i: Request("GET", "/me/watchlist", _any_user(data))),
+        "watchlist_filtered": many(
+            lambda i: Request("GET", "/me/watchlist?status=watching&sort=-percentage&limit=20", _any_user(data))
+        ),
+        "watchlist_changes": many(lambda i: Request("GET", "/me/watchlist/changes?limit=100", _any_user(data))),
+        "stats": many(lambda i: Request("GET", "/me/stats", _any_user(data))),
+        "movies_create": many(
+            lambda i: Request("POST", "/movies/", json={"title": f"new movie {i}", "genre": ["drama"]})
+        ),
+        "movies_update": many(
+            lambda i: Request("PUT", f"/movies/{rng.randint(1, sizes.movies)}", json={"title": f"edited {i}"})
+        ),
+        "movies_bulk": many(lambda i: Request(
+            "POST", "/movies/bulk", content_type="application/x-ndjson",
+            body=_ndjson([{"title": f"bulk {i}-{j}", "genre": ["comedy"]} for j in range(BULK_LINES)]),
+        )),
+        "series_create": many(lambda i: Request("POST", "/series/", json={"title": f"new series {i}"})),
+        "series_update": many(
+            lambda i: Request("PUT", f"/series/{rng.randint(1, sizes.series)}", json={"title": f"edited {i}"})
+        ),
+        "series_bulk": many(lambda i: Request(
+            "POST", "/series/bulk", content_type="application/x-ndjson",
+            body=_ndjson([{"title": f"bulk {i}-{j}"} for j in range(BULK_LINES)]),
+        )),
+        "season_add": [
+            Request("POST", f"/series/{series_id}/seasons", json={"number": 1, "episodes_count": 8})
+            for series_id in spare_seasons_add
+        ],
+        "season_update": [
+            Request("PUT", f"/series/{series_id}/seasons/1", json={"episodes_count": 12})
+            for series_id in spare_seasons_update
+        ],
+        "watchlist_add_movie": [
+            Request("POST", f"/watchlist/movies/{movie_id}", _any_user(data)) for movie_id in spare_movies_add
+        ],
+        "watchlist_add_series": [
+            Request("POST", f"/watchlist/series/{series_id}", _any_user(data)) for series_id in spare_series_add
+        ],
+        "progress_update": many(progress),
+        "progress_batch": many(progress_batch),
+        "season_delete": [Request("DELETE", f"/series/{series_id}/seasons/1") for series_id in spare_seasons_delete],
+        "movies_delete": [Request("DELETE", f"/movies/{movie_id}") for movie_id in spare_movies_delete],
+        "series_delete": [Request("DELETE", f"/series/{series_id}") for series_id in spare_series_delete],
+    }
+
+
+class TestClientDriver:
+    """Envia las solicitudes con el test client de Flask, en el mismo proceso."""
+
+    def __init__(self, app) -> None:
+        self.client = app.test_client()
+
+    def send(self, req: Request) -> tuple[int, str | None]:
+        headers = {"X-User-Id": str(req.user_id)} if req.user_id else {}
+        response = self.client.open(
+            req.path, method=req.method, headers=headers, json=req.json, data=req.body, content_type=req.content_type
+        )
+        response.get_data()
+        return response.status_code, response.headers.get("Server-Timing")
+
+    def close(self) -> None:
+        pass
+
+
+class HTTPDriver:
+    """Envia las solicitudes a un servidor real por una conexion keep-alive."""
+
+    def __init__(self, port: int) -> None:
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+
+    def send(self, req: Request) -> tuple[int, str | None]:
+        headers = {"X-User-Id": str(req.user_id)} if req.user_id else {}
+        body = req.body
+        if req.json is not None:
+            body = json.dumps(req.json).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        elif req.content_type:
+            headers["Content-Type"] = req.content_type
+        self.conn.request(req.method, req.path, body=body, headers=headers)
+        response = self.conn.getresponse()
+        response.read()
+        return response.status, response.getheader("Server-Timing")
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _percentile(values: list[float], p: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run_scenario(driver, requests: list[Request], warmup: int) -> dict:
+    """Ejecuta las solicitudes en orden; las primeras ``warmup`` no se miden."""
+    for req in requests[:warmup]:
+        driver.send(req)
+    measured = requests[warmup:]
+    latencies, statements, errors, first_error = [], [], 0, None
+    started = perf_counter()
+    for req in measured:
+        start = perf_counter()
+        status, timing = driver.send(req)
+        latencies.append(perf_counter() - start)
+        match = _SQL_COUNT.search(timing or "")
+        if match:
+            statements.append(int(match.group(1)))
+        if status >= 400:
+            errors += 1
+            first_error = first_error or f"{req.method} {req.path} -> {status}"
+    elapsed = perf_counter() - started
+    latencies.sort()
+    result = {
+        "requests": len(measured),
+        "errors": errors,
+        "rps": round(len(measured) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "sql_per_request": round(sum(statements) / len(statements), 2) if statements else None,
+        "sql_max": max(statements) if statements else None,
+    }
+    if first_error:
+        result["first_error"] = first_error
+    return result
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[dict]:
+    """Escenarios de ``current`` peores que ``baseline`` mas alla de ``tolerance``."""
+    regressions = []
+    for name, base in baseline["scenarios"].items():
+        now = current["scenarios"].get(name)
+        if now is None:
+            continue
+        reasons = []
+        if now["rps"] < base["rps"] * (1 - tolerance):
+            reasons.append(f"rps {base['rps']} -> {now['rps']}")
+        if now["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            reasons.append(f"p99_ms {base['p99_ms']} -> {now['p99_ms']}")
+        base_sql = base.get("sql_per_request")
+        if base_sql is not None and (now.get("sql_per_request") or 0) > base_sql + SQL_TOLERANCE:
+            reasons.append(f"sql_per_request {base_sql} -> {now['sql_per_request']}")
+        if now["errors"] > base["errors"]:
+            reasons.append(f"errors {base['errors']} -> {now['errors']}")
+        if reasons:
+            regressions.append({"scenario": name, "reasons": reasons})
+    return regressions
+
+
+def _report_comparison(baseline_path: str, current: dict, tolerance: float) -> int:
+    baseline = json.loads(Path(baseline_path).read_text())
+    regressions = compare(baseline, current, tolerance)
+    report: dict[str, Any] = {"baseline": baseline_path, "tolerance": tolerance, "regressions": regressions}
+    differing = [
+        key for key in ("mode", "database", "sizes", "seed", "cache")
+        if baseline["meta"].get(key) != current["meta"].get(key)
+    ]
+    if differing:
+        report["warning"] = f"las corridas difieren en {', '.join(differing)}; la comparacion es orientativa"
+    print(json.dumps(report, indent=2))
+    return 1 if regressions else 0
+
+
+def run(args: argparse.Namespace) -> int:
+    """Carga el dataset, mide cada escenario y escribe el resultado."""
+    sizes = Sizes(args.users, args.movies, args.series, args.seasons, args.episodes, args.entries)
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{tmp}/bench.db"
+        env = {
+            **os.environ,
+            "DATABASE_URL": url,
+            "CACHE_ENABLED": "1" if args.cache else "0",
+            "SQLITE_TUNING": "1",
+            "REQUEST_METRICS_ENABLED": "1",
+            "SERVER_TIMING_HEADER": "1",
+        }
+
+        class BenchConfig(ProductionConfig):
+            SQLALCHEMY_DATABASE_URI = url
+            CACHE_ENABLED = args.cache
+            SQLITE_TUNING = True
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            from flask_migrate import stamp
+
+            if args.database_url and not args.recreate and db.inspect(db.engine).get_table_names():
+                print("La base de --database-url no esta vacia; usar --recreate para borrar sus tablas", file=sys.stderr)
+                return 2
+            db.drop_all()
+            db.create_all()
+            stamp(directory=str(ROOT / "migrations"))
+            start = perf_counter()
+            data = seed(sizes, args.seed)
+            seed_seconds = round(perf_counter() - start, 2)
+            scenarios = build_scenarios(data, args.requests + args.warmup)
+            db.session.remove()
+
+        server = None
+        if args.server:
+            port = _free_port()
+            server = subprocess.Popen(_server_command(args.server, port, 1, 1), cwd=ROOT, env=env)
+            _wait_ready(port)
+            driver = HTTPDriver(port)
+        else:
+            driver = TestClientDriver(app)
+        selected = [name for name in scenarios if not args.only or any(pattern in name for pattern in args.only)]
+        try:
+            results = {name: run_scenario(driver, scenarios[name], args.warmup) for name in selected}
+        finally:
+            driver.close()
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+    report = {
+        "meta": {
+            "mode": args.server or "test-client",
+            "database": url.split(":", 1)[0],
+            "sizes": vars(sizes),
+            "seed": args.seed,
+            "seed_seconds": seed_seconds,
+            "requests": args.requests,
+            "cache": args.cache,
+            "python": platform.python_version(),
+        },
+        "scenarios": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    print(output)
+    if args.baseline:
+        return _report_comparison(args.baseline, report, args.tolerance)
+    return 0
+
+
+def main() -> None:
+    """Punto de entrada de la suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="carga el dataset y mide cada endpoint")
+    run_parser.add_argument("--users", type=int, default=100)
+    run_parser.add_argument("--movies", type=int, default=2000)
+    run_parser.add_argument("--series", type=int, default=300)
+    run_parser.add_argument("--seasons", type=int, default=4, help="temporadas por serie")
+    run_parser.add_argument("--episodes", type=int, default=10, help="episodios maximos por temporada")
+    run_parser.add_argument("--entries", type=int, default=40, help="entradas de watchlist por usuario")
+    run_parser.add_argument("--seed", type=int, default=1)
+    run_parser.add_argument("--requests", type=int, default=200, help="solicitudes medidas por escenario")
+    run_parser.add_argument("--warmup", type=int, default=10)
+    run_parser.add_argument("--database-url", help="por defecto, SQLite en un directorio temporal")
+    run_parser.add_argument(
+        "--recreate", action="store_true", help="borra y recrea las tablas de --database-url aunque tenga datos"
+    )
+    run_parser.add_argument("--server", choices=["wsgi", "asgi"], help="mide contra gunicorn/uvicorn reales")
+    run_parser.add_argument("--no-cache", dest="cache", action="store_false", help="desactiva el cache de catalogo")
+    run_parser.add_argument("--only", nargs="+", help="solo los escenarios cuyo nombre contiene alguno de estos textos")
+    run_parser.add_argument("--output", help="archivo donde guardar el JSON")
+    run_parser.add_argument("--baseline", help="JSON de una corrida anterior para comparar")
+    run_parser.add_argument("--tolerance", type=float, default=0.15)
+
+    compare_parser = commands.add_parser("compare", help="compara dos resultados guardados")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--tolerance", type=float, default=0.15)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        sys.exit(run(args))
+    current = json.loads(Path(args.current).read_text())
+    sys.exit(_report_comparison(args.baseline, current, args.tolerance))
+
+
+if __name__ == "__main__":
+    main()
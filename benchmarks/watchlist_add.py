@@ -0,0 +1,94 @@
+"""Compara las altas en la watchlist: ruta clasica vs sentencia unica.
+
+Uso::
+
+    python -m benchmarks.watchlist_add --rows 2000
+
+Mide, para ``add_movie`` y ``add_series``, las sentencias SQL por alta y la
+latencia media/p99 de cada modo sobre una base SQLite en un archivo temporal.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from sqlalchemy import event
+
+from src import create_app
+from src.api.progress import ProgressService
+from src.config import TestingConfig
+from src.extensions import db
+from src.models import Movie, Season, Serie, User
+
+
+def _seed(rows: int) -> None:
+    """Carga usuarios, peliculas y series con temporadas."""
+    db.session.execute(db.insert(User), [{"name": f"u{i}", "email": f"u{i}@bench"} for i in range(rows)])
+    db.session.execute(db.insert(Movie), [{"title": f"m{i}", "genre": []} for i in range(rows)])
+    db.session.execute(db.insert(Serie), [{"title": f"s{i}", "total_seasons": 3} for i in range(rows)])
+    db.session.execute(
+        db.insert(Season),
+        [{"series_id": i + 1, "number": n, "episodes_count": 10} for i in range(rows) for n in (1, 2, 3)],
+    )
+    db.session.commit()
+
+
+def _run(service: ProgressService, method: str, user_offset: int, rows: int) -> dict:
+    """Ejecuta ``rows`` altas y devuelve sentencias y latencias."""
+    statements = 0
+
+    def count(*_args) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    latencies = []
+    try:
+        for i in range(1, rows + 1):
+            start = perf_counter()
+            getattr(service, method)((i + user_offset - 1) % rows + 1, i)
+            latencies.append((perf_counter() - start) * 1000)
+            db.session.expunge_all()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+    latencies.sort()
+    return {
+        "statements_per_add": round(statements / rows, 2),
+        "mean_ms": round(statistics.fmean(latencies), 4),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 4),
+    }
+
+
+def main() -> None:
+    """Punto de entrada del benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="altas por modo y tipo de contenido")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(tmp) / 'bench.db'}"
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            _seed(args.rows)
+            results = {}
+            # Cada modo usa pares (usuario, contenido) distintos para no chocar
+            # con las altas del modo anterior.
+            for label, single, offset in (("single_statement", True, 1), ("legacy", False, 0)):
+                service = ProgressService(single_statement_writes=single)
+                results[label] = {
+                    "add_movie": _run(service, "add_movie", offset, args.rows),
+                    "add_series": _run(service, "add_series", offset, args.rows),
+                }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""indices para paginacion keyset
+
+Revision ID: 5b9e2c41d7a3
+Revises: 23c7dc8d0a56
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9e2c41d7a3'
+down_revision = '23c7dc8d0a56'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        # CURRENT_TIMESTAMP guarda 'YYYY-MM-DD HH:MM:SS' y SQLAlchemy compara con
+        # 'YYYY-MM-DD HH:MM:SS.ffffff'; se normalizan las filas existentes para
+        # que el cursor (created_at, id) no salte registros del mismo segundo.
+        for table in ('movies', 'series'):
+            op.execute(sa.text(
+                f"UPDATE {table} "
+                "SET created_at = strftime('%Y-%m-%d %H:%M:%f', created_at) || '000' "
+                "WHERE length(created_at) = 19"
+            ))
+
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.create_index('ix_movies_created_at_id', ['created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('series', schema=None) as batch_op:
+        batch_op.create_index('ix_series_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('series', schema=None) as batch_op:
+        batch_op.drop_index('ix_series_created_at_id')
+
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_index('ix_movies_created_at_id')
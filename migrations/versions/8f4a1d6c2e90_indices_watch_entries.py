@@ -0,0 +1,57 @@
+"""indices y unicidad en watch_entries
+
+Revision ID: 8f4a1d6c2e90
+Revises: 5b9e2c41d7a3
+Create Date: 2026-10-18 10:03:15.472911
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f4a1d6c2e90'
+down_revision = '5b9e2c41d7a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Los duplicados creados por la antigua verificacion leer-luego-insertar
+    # impedirian crear los indices unicos; se conserva la entrada mas antigua.
+    for content_type, column in (('movie', 'movie_id'), ('series', 'series_id')):
+        op.execute(sa.text(
+            "DELETE FROM watch_entries "
+            f"WHERE content_type = '{content_type}' AND id NOT IN ("
+            "SELECT min(id) FROM watch_entries "
+            f"WHERE content_type = '{content_type}' "
+            f"GROUP BY user_id, {column})"
+        ))
+
+    with op.batch_alter_table('watch_entries', schema=None) as batch_op:
+        batch_op.create_index('ix_watch_entries_user_content_type', ['user_id', 'content_type'], unique=False)
+        batch_op.create_index(
+            'uq_watch_entries_user_movie',
+            ['user_id', 'movie_id'],
+            unique=True,
+            sqlite_where=sa.text("content_type = 'movie'"),
+            postgresql_where=sa.text("content_type = 'movie'"),
+        )
+        batch_op.create_index(
+            'uq_watch_entries_user_series',
+            ['user_id', 'series_id'],
+            unique=True,
+            sqlite_where=sa.text("content_type = 'series'"),
+            postgresql_where=sa.text("content_type = 'series'"),
+        )
+        batch_op.create_index('ix_watch_entries_movie_id', ['movie_id'], unique=False)
+        batch_op.create_index('ix_watch_entries_series_id', ['series_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('watch_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_watch_entries_series_id')
+        batch_op.drop_index('ix_watch_entries_movie_id')
+        batch_op.drop_index('uq_watch_entries_user_series')
+        batch_op.drop_index('uq_watch_entries_user_movie')
+        batch_op.drop_index('ix_watch_entries_user_content_type')
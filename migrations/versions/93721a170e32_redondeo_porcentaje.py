@@ -0,0 +1,42 @@
+"""recalcula el porcentaje guardado con redondeo a la mitad hacia arriba
+
+Revision ID: 93721a170e32
+Revises: f5c1a7d9e246
+Create Date: 2026-10-19 10:02:41.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '93721a170e32'
+down_revision = 'f5c1a7d9e246'
+branch_labels = None
+depends_on = None
+
+# Total efectivo de cada entrada: el propio o, en series, el de la serie
+EFFECTIVE_TOTAL = (
+    "coalesce(watch_entries.total_episodes, CASE WHEN watch_entries.content_type = 'series' "
+    "THEN (SELECT series.total_episodes FROM series WHERE series.id = watch_entries.series_id) END, 0)"
+)
+# Centesimas con division entera, como percentage_expression
+HUNDREDTHS = (
+    f"((coalesce(watch_entries.watched_episodes, 0) * 20000 + {EFFECTIVE_TOTAL}) / ({EFFECTIVE_TOTAL} * 2))"
+)
+PERCENTAGE = f"""CASE
+    WHEN {EFFECTIVE_TOTAL} <= 0 THEN CASE WHEN status = 'completed' THEN 100.0 ELSE 0.0 END
+    WHEN {HUNDREDTHS} > 10000 THEN 100.0
+    WHEN {HUNDREDTHS} < 0 THEN 0.0
+    ELSE CAST({HUNDREDTHS} AS FLOAT) / 100.0
+END"""
+
+
+def upgrade():
+    # Solo se reescriben las filas que cambian (los casos de media centesima)
+    op.execute(sa.text(f"UPDATE watch_entries SET percentage = {PERCENTAGE} WHERE percentage <> {PERCENTAGE}"))
+
+
+def downgrade():
+    # El redondeo anterior no se restaura: ambos valores son validos para ordenar
+    pass
@@ -0,0 +1,53 @@
+"""estadisticas precalculadas por usuario
+
+Revision ID: a4f2c8e61d39
+Revises: e1a9c4b7f352
+Create Date: 2026-10-18 16:05:44.218734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f2c8e61d39'
+down_revision = 'e1a9c4b7f352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entries', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('movies', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('series', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('watching', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('completed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('paused', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('episodes_watched', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Estado inicial calculado desde las entradas existentes
+    op.execute(sa.text(
+        """
+        INSERT INTO user_stats (user_id, entries, movies, series, watching, completed, paused, episodes_watched)
+        SELECT user_id,
+               count(*),
+               sum(CASE WHEN content_type = 'movie' THEN 1 ELSE 0 END),
+               sum(CASE WHEN content_type = 'series' THEN 1 ELSE 0 END),
+               sum(CASE WHEN status = 'watching' THEN 1 ELSE 0 END),
+               sum(CASE WHEN status = 'completed' THEN 1 ELSE 0 END),
+               sum(CASE WHEN status = 'paused' THEN 1 ELSE 0 END),
+               sum(CASE WHEN content_type = 'series' THEN coalesce(watched_episodes, 0) ELSE 0 END)
+        FROM watch_entries
+        GROUP BY user_id
+        """
+    ))
+
+
+def downgrade():
+    op.drop_table('user_stats')
@@ -0,0 +1,62 @@
+"""porcentaje guardado e indices para filtrar y ordenar la watchlist
+
+Revision ID: b7d3e9f1a2c4
+Revises: a4f2c8e61d39
+Create Date: 2026-10-18 17:12:09.640215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3e9f1a2c4'
+down_revision = 'a4f2c8e61d39'
+branch_labels = None
+depends_on = None
+
+# Total efectivo de cada entrada: el propio o, en series, el de la serie
+EFFECTIVE_TOTAL = (
+    "coalesce(watch_entries.total_episodes, CASE WHEN watch_entries.content_type = 'series' "
+    "THEN (SELECT series.total_episodes FROM series WHERE series.id = watch_entries.series_id) END, 0)"
+)
+RAW_PERCENTAGE = (
+    f"round(CAST(coalesce(watch_entries.watched_episodes, 0) * 100.0 / {EFFECTIVE_TOTAL} AS NUMERIC(12, 4)), 2)"
+)
+
+
+def upgrade():
+    with op.batch_alter_table('watch_entries', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('percentage', sa.Float(), server_default='0', nullable=False))
+
+    op.execute(sa.text(
+        f"""
+        UPDATE watch_entries SET percentage = CASE
+            WHEN {EFFECTIVE_TOTAL} <= 0 THEN CASE WHEN status = 'completed' THEN 100.0 ELSE 0.0 END
+            WHEN {RAW_PERCENTAGE} > 100 THEN 100.0
+            WHEN {RAW_PERCENTAGE} < 0 THEN 0.0
+            ELSE {RAW_PERCENTAGE}
+        END
+        """
+    ))
+
+    if op.get_bind().dialect.name == 'sqlite':
+        # Las fechas de CURRENT_TIMESTAMP no tienen fraccion; se llevan al
+        # formato con microsegundos para que el cursor compare bien el texto
+        op.execute(sa.text(
+            "UPDATE watch_entries SET updated_at = strftime('%Y-%m-%d %H:%M:%f000', updated_at) "
+            "WHERE length(updated_at) = 19"
+        ))
+
+    with op.batch_alter_table('watch_entries', schema=None) as batch_op:
+        batch_op.create_index('ix_watch_entries_user_updated_at_id', ['user_id', 'updated_at', 'id'], unique=False)
+        batch_op.create_index('ix_watch_entries_user_status_updated_at_id', ['user_id', 'status', 'updated_at', 'id'], unique=False)
+        batch_op.create_index('ix_watch_entries_user_percentage_id', ['user_id', 'percentage', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('watch_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_watch_entries_user_percentage_id')
+        batch_op.drop_index('ix_watch_entries_user_status_updated_at_id')
+        batch_op.drop_index('ix_watch_entries_user_updated_at_id')
+        batch_op.drop_column('percentage')
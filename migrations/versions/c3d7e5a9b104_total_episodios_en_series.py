@@ -0,0 +1,41 @@
+"""total de episodios desnormalizado en series
+
+Revision ID: c3d7e5a9b104
+Revises: 8f4a1d6c2e90
+Create Date: 2026-10-18 11:26:02.905317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d7e5a9b104'
+down_revision = '8f4a1d6c2e90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('series', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_episodes', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(sa.text(
+        "UPDATE series SET total_episodes = ("
+        "SELECT coalesce(sum(seasons.episodes_count), 0) FROM seasons "
+        "WHERE seasons.series_id = series.id)"
+    ))
+    # Las entradas de series dejan de copiar el total: lo leen de la serie
+    op.execute(sa.text(
+        "UPDATE watch_entries SET total_episodes = NULL WHERE content_type = 'series'"
+    ))
+
+
+def downgrade():
+    op.execute(sa.text(
+        "UPDATE watch_entries SET total_episodes = ("
+        "SELECT series.total_episodes FROM series WHERE series.id = watch_entries.series_id) "
+        "WHERE content_type = 'series' AND total_episodes IS NULL"
+    ))
+    with op.batch_alter_table('series', schema=None) as batch_op:
+        batch_op.drop_column('total_episodes')
@@ -0,0 +1,39 @@
+"""tombstones de entradas eliminadas para la sincronizacion incremental
+
+Revision ID: d2b6f4a8c013
+Revises: b7d3e9f1a2c4
+Create Date: 2026-10-18 18:03:51.027416
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b6f4a8c013'
+down_revision = 'b7d3e9f1a2c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('watch_entry_tombstones',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('content_type', sa.String(length=50), nullable=False),
+    sa.Column('content_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('watch_entry_tombstones', schema=None) as batch_op:
+        batch_op.create_index('ix_watch_entry_tombstones_deleted_at', ['deleted_at'], unique=False)
+        batch_op.create_index('ix_watch_entry_tombstones_user_deleted_at_id', ['user_id', 'deleted_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('watch_entry_tombstones', schema=None) as batch_op:
+        batch_op.drop_index('ix_watch_entry_tombstones_user_deleted_at_id')
+        batch_op.drop_index('ix_watch_entry_tombstones_deleted_at')
+
+    op.drop_table('watch_entry_tombstones')
@@ -0,0 +1,48 @@
+"""updated_at y version para GET condicional
+
+Revision ID: e1a9c4b7f352
+Revises: c3d7e5a9b104
+Create Date: 2026-10-18 13:40:17.502981
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a9c4b7f352'
+down_revision = 'c3d7e5a9b104'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('movies', 'series'):
+        # SQLite no admite ADD COLUMN con default CURRENT_TIMESTAMP: se agrega
+        # nullable, se completa con created_at y luego se vuelve NOT NULL.
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+        op.execute(sa.text(f"UPDATE {table} SET updated_at = created_at"))
+
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(
+                'updated_at',
+                existing_type=sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.text('(CURRENT_TIMESTAMP)'),
+            )
+
+    with op.batch_alter_table('watch_entries', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('watch_entries', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    for table in ('series', 'movies'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('version')
+            batch_op.drop_column('updated_at')
@@ -0,0 +1,78 @@
+"""indice normalizado de generos de peliculas
+
+Revision ID: f5c1a7d9e246
+Revises: d2b6f4a8c013
+Create Date: 2026-10-18 18:47:30.591842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5c1a7d9e246'
+down_revision = 'd2b6f4a8c013'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+movies = sa.table(
+    'movies',
+    sa.column('id', sa.Integer()),
+    sa.column('genre', sa.JSON()),
+)
+movie_genres = sa.table(
+    'movie_genres',
+    sa.column('movie_id', sa.Integer()),
+    sa.column('genre', sa.String(50)),
+)
+
+
+def _genre_keys(genres):
+    # Misma normalizacion que src.models.movie_genre.genre_keys
+    if not isinstance(genres, list):
+        return []
+    keys = (name.strip().lower()[:50] for name in genres if isinstance(name, str))
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+def upgrade():
+    op.create_table('movie_genres',
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('genre', sa.String(length=50), nullable=False),
+    sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('movie_id', 'genre')
+    )
+    with op.batch_alter_table('movie_genres', schema=None) as batch_op:
+        batch_op.create_index('ix_movie_genres_genre_movie_id', ['genre', 'movie_id'], unique=False)
+
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.create_index('ix_movies_release_year_created_at_id', ['release_year', 'created_at', 'id'], unique=False)
+
+    # Backfill por lotes de id para no cargar todo el catalogo en memoria
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(movies.c.id, movies.c.genre)
+            .where(movies.c.id > last_id)
+            .order_by(movies.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        links = [{'movie_id': movie_id, 'genre': key} for movie_id, genre in rows for key in _genre_keys(genre)]
+        if links:
+            bind.execute(movie_genres.insert(), links)
+        last_id = rows[-1][0]
+
+
+def downgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_index('ix_movies_release_year_created_at_id')
+
+    with op.batch_alter_table('movie_genres', schema=None) as batch_op:
+        batch_op.drop_index('ix_movie_genres_genre_movie_id')
+
+    op.drop_table('movie_genres')
@@ -3,16 +3,20 @@
 from flask import Flask
 from flask_cors import CORS
 from .config import DevelopmentConfig
-from .extensions import db, migrate
+from .extensions import cache, db, migrate, query_debugger, readiness, request_metrics
+from .json_provider import WatchlogJSONProvider
+from .sqlite_tuning import configure_engine, prepare_engine_options
 
 
 def create_app(config_object: type[DevelopmentConfig] = DevelopmentConfig) -> Flask:
     """Crea y configura la aplicacion utilizando application factory."""
     app = Flask(__name__)
     app.config.from_object(config_object)
+    app.json = WatchlogJSONProvider(app)
 
     register_extensions(app)
     register_blueprints(app)
+    register_commands(app)
     CORS(app)
 
     return app
@@ -20,8 +24,22 @@ def create_app(config_object: type[DevelopmentConfig] = DevelopmentConfig) -> Fl
 
 def register_extensions(app: Flask) -> None:
     """Inicializa extensiones de terceros."""
+    prepare_engine_options(app)
     db.init_app(app)
+    with app.app_context():
+        configure_engine(app, db.engine)
+        request_metrics.init_app(app, db.engine)
+        query_debugger.init_app(app, db.engine)
     migrate.init_app(app, db)
+    cache.init_app(app)
+    readiness.init_app(app)
+
+
+def register_commands(app: Flask) -> None:
+    """Registra los comandos de ``flask`` del proyecto."""
+    from .cli import register_commands as register_cli_commands
+
+    register_cli_commands(app)
 
 
 def register_blueprints(app: Flask) -> None:
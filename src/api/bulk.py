@@ -0,0 +1,115 @@
+"""Importacion masiva de catalogo a partir de cuerpos NDJSON."""
+
+from __future__ import annotations
+
+import io
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from flask import current_app
+from sqlalchemy.exc import DBAPIError
+from werkzeug.exceptions import BadRequest
+
+NDJSON_MIMETYPES = {"application/x-ndjson", "application/jsonl", "application/jsonlines"}
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_MAX_ERRORS = 1000
+READ_BUFFER_SIZE = 64 * 1024
+
+
+class _InvalidLine:
+    """Marca una linea que no se pudo decodificar como JSON."""
+
+
+INVALID_JSON = _InvalidLine()
+
+
+def iter_ndjson(stream: io.RawIOBase) -> Iterator[tuple[int, Any]]:
+    """Recorre el cuerpo linea a linea sin cargarlo completo en memoria.
+
+    Devuelve pares ``(numero_de_linea, objeto)``; las lineas vacias se omiten
+    y las que no son JSON valido se devuelven como ``INVALID_JSON``.
+    """
+    # El stream de Werkzeug es "raw": sin buffer, readline lee byte a byte
+    buffered = io.BufferedReader(stream, buffer_size=READ_BUFFER_SIZE)
+    loads = current_app.json.loads
+    for line_no, raw in enumerate(buffered, start=1):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            yield line_no, loads(raw)
+        except ValueError:
+            yield line_no, INVALID_JSON
+
+
+def bulk_insert(
+    session,
+    table,
+    lines: Iterable[tuple[int, Any]],
+    validate: Callable[[Any], dict],
+    batch_size: int | None = None,
+    after_insert: Callable[[list], None] | None = None,
+    returning: Sequence[str] = ("id",),
+) -> dict:
+    """Valida e inserta filas por lotes con ``executemany``.
+
+    Cada lote se confirma por separado. Si un lote falla en la base de datos
+    se reintenta fila a fila para reportar exactamente las lineas culpables.
+    ``after_insert(insertadas)`` corre antes de cada commit, para escribir
+    tablas derivadas en la misma transaccion; recibe las columnas
+    ``returning`` de cada fila insertada. El RETURNING no pide el orden de
+    los parametros: asi SQLAlchemy lo agrupa en una sola sentencia tambien
+    en SQLite, por eso las filas deben traer lo necesario para usarlas.
+    """
+    batch_size = batch_size or current_app.config.get("BULK_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    max_errors = current_app.config.get("BULK_MAX_ERRORS", DEFAULT_MAX_ERRORS)
+    report: dict[str, Any] = {"inserted": 0, "error_count": 0, "errors": []}
+
+    def add_error(line_no: int, detail: str) -> None:
+        report["error_count"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"line": line_no, "detail": detail})
+
+    stmt = table.insert()
+    if after_insert is not None:
+        stmt = stmt.returning(*(table.c[name] for name in returning))
+
+    def insert(rows: list[dict] | dict) -> None:
+        result = session.execute(stmt, rows)
+        if after_insert is not None:
+            after_insert(result.all())
+
+    def flush(rows: list[dict], line_numbers: list[int]) -> None:
+        try:
+            insert(rows)
+            session.commit()
+            report["inserted"] += len(rows)
+            return
+        except DBAPIError:
+            session.rollback()
+        for row, line_no in zip(rows, line_numbers):
+            try:
+                insert(row)
+                session.commit()
+                report["inserted"] += 1
+            except DBAPIError as exc:
+                session.rollback()
+                add_error(line_no, str(exc.orig))
+
+    rows: list[dict] = []
+    line_numbers: list[int] = []
+    for line_no, payload in lines:
+        if payload is INVALID_JSON:
+            add_error(line_no, "JSON invalido")
+            continue
+        try:
+            rows.append(validate(payload))
+        except BadRequest as br:
+            add_error(line_no, br.description)
+            continue
+        line_numbers.append(line_no)
+        if len(rows) >= batch_size:
+            flush(rows, line_numbers)
+            rows, line_numbers = [], []
+    if rows:
+        flush(rows, line_numbers)
+    return report
@@ -0,0 +1,60 @@
+"""GET condicionales: ETag debil, Last-Modified y respuestas 304."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from flask import Request, Response, jsonify
+
+Validators = tuple[str, datetime | None]
+
+
+def weak_etag(*parts: Any) -> str:
+    """Resume ``parts`` (ids, versiones, fechas) en un ETag corto.
+
+    Se calcula a partir de metadatos de las filas, sin serializar el cuerpo.
+    """
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def as_utc(value: datetime | None) -> datetime | None:
+    """Normaliza una fecha a UTC; SQLite devuelve fechas sin zona horaria."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def is_not_modified(req: Request, etag: str, last_modified: datetime | None) -> bool:
+    """Evalua ``If-None-Match`` y, si no vino, ``If-Modified-Since``."""
+    if req.if_none_match:
+        return req.if_none_match.contains_weak(etag)
+    since = req.if_modified_since
+    if since is not None and last_modified is not None:
+        # Las fechas HTTP tienen resolucion de segundos
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def _with_validators(response: Response, etag: str, last_modified: datetime | None) -> Response:
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def conditional_json(req: Request, validators: Validators, build: Callable[[], Any]) -> Response:
+    """Devuelve 304 si el cliente ya tiene la version actual, o el JSON de ``build()``.
+
+    ``build`` solo se invoca cuando hay que enviar el cuerpo, de modo que una
+    revalidacion exitosa no consulta ni serializa el recurso.
+    """
+    etag, last_modified = validators
+    last_modified = as_utc(last_modified)
+    if is_not_modified(req, etag, last_modified):
+        return _with_validators(Response(status=304), etag, last_modified)
+    return _with_validators(jsonify(build()), etag, last_modified)
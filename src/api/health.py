@@ -3,35 +3,39 @@
 from __future__ import annotations
 from flask import Blueprint, jsonify, Response
 from datetime import datetime, timezone
-from time import perf_counter
-from sqlalchemy import text
-from src.extensions import db
+from src.extensions import cache, db, readiness
+from src.pool import pool_status
 
 
 bp = Blueprint("health", __name__, url_prefix="/health")
 
 
+@bp.get("/live")
+def liveness() -> tuple[Response, int]:
+    """El proceso atiende solicitudes; no toca dependencias."""
+    return jsonify({"status": "ok", "time": datetime.now(timezone.utc).isoformat()}), 200
+
+
+@bp.get("/ready")
+def readiness_check() -> tuple[Response, int]:
+    """Ultimo resultado de las comprobaciones en segundo plano; 503 si falla una critica."""
+    payload = readiness.status()
+    return jsonify(payload), 503 if payload["status"] == "error" else 200
+
+
 @bp.get("/")
 def healthcheck() -> tuple[Response, int]:
-    """Devuelve el estado actual de la aplicacion."""
-    # TODO: agregar comprobaciones reales (db, cache, servicios externos).
-    overall_ok = True
-
-    # Comprobacion de base de datos
-    database_status = "ok"
-    try:
-        db.session.execute(text("SELECT 1"))
-    except Exception:
-        try:
-            db.session.rollback()
-        except Exception:
-            pass
-        database_status = "error"
-        overall_ok = False
-
-    payload: dict[str, str] = {
-        "status": "ok" if overall_ok else "error",
-        "database": database_status,
-        "time": datetime.now(timezone.utc).isoformat(),
-    }
-    return jsonify(payload), 200 if overall_ok else 500
\ No newline at end of file
+    """Alias de ``/health/ready`` para los sondeos existentes."""
+    return readiness_check()
+
+
+@bp.get("/cache")
+def cache_stats() -> tuple[Response, int]:
+    """Devuelve los contadores del cache en proceso de este worker."""
+    return jsonify(cache.stats()), 200
+
+
+@bp.get("/pool")
+def pool_metrics() -> tuple[Response, int]:
+    """Ocupacion del pool de conexiones de este worker y latencia de checkout."""
+    return jsonify(pool_status(db.engine.pool)), 200
@@ -0,0 +1,16 @@
+"""Exposicion de metricas en formato de texto de Prometheus."""
+
+from __future__ import annotations
+from flask import Blueprint, Response
+from src.metrics import render_prometheus
+
+# Formato de exposicion de texto 0.0.4
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+bp = Blueprint("metrics", __name__)
+
+
+@bp.get("/metrics")
+def metrics() -> Response:
+    """Metricas de este worker: solicitudes por endpoint, SQL por solicitud y pool."""
+    return Response(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
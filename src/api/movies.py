@@ -1,46 +1,148 @@
 """Endpoints relacionados con peliculas."""
 
 from __future__ import annotations
+from typing import Iterator
 from flask import Blueprint, jsonify, request
-from src.extensions import db
-from src.models.movie import Movie
+from src.extensions import cache, db
+from src.models.movie import MOVIE_SERIALIZER, Movie
+from src.models.movie_genre import GENRE_MAX_LENGTH, MovieGenre, genre_keys, normalize_genre
+from src.models.watch_entry import WatchEntry
 from werkzeug.exceptions import NotFound, BadRequest
+from src.api.bulk import NDJSON_MIMETYPES, bulk_insert, iter_ndjson
+from src.api.conditional import Validators, conditional_json, weak_etag
+from src.api.pagination import keyset_page, parse_page_args, wants_all
+from src.api.stats import UserStatsService
+from src.api.sync import record_tombstones
+from src.api.streaming import stream_format, stream_response, yield_per
 
 
 bp = Blueprint("movies", __name__, url_prefix="/movies")
 
 
+def parse_movie_filters(args) -> dict:
+    """Filtros ``genre`` y ``year`` de ``GET /movies/``."""
+    filters: dict = {"genre": None, "year": None}
+    genre = args.get("genre")
+    if genre is not None:
+        filters["genre"] = normalize_genre(genre)
+        if not filters["genre"]:
+            raise BadRequest("genre no puede estar vacio")
+    year = args.get("year")
+    if year is not None:
+        try:
+            filters["year"] = int(year)
+        except ValueError:
+            raise BadRequest("year debe ser un entero") from None
+    return filters
+
+
 class MovieService:
     """Orquesta la logica de negocio para el recurso Movie."""
 
     # TODO: inyectar dependencias necesarias (db.session, modelos, esquemas, etc.).
-    def __init__(self, session=None, model=None, schema=None) -> None:
+    def __init__(self, session=None, model=None, schema=None, cache_backend=None, stats_service=None) -> None:
         """Permite inyectar dependencias para facilitar pruebas."""
         self.session = session or db.session
         self.model = model or Movie
         self.schema = schema
+        self.cache = cache_backend or cache
+        self.stats = stats_service or UserStatsService(self.session)
 
-    def list_movies(self) -> list[dict]:
+    def list_movies(self, genre: str | None = None, year: int | None = None) -> list[dict]:
         """Retorna todas las peliculas registradas."""
         # TODO: consultar la base de datos y serializar a una lista de dicts.
-        items = self.session.execute(db.select(self.model)).scalars().all()
-        return [item.to_dict() for item in items]
+        rows = self.session.execute(self._select_columns(genre, year)).all()
+        return [MOVIE_SERIALIZER.from_row(row) for row in rows]
 
-    def create_movie(self, payload: dict) -> dict:
-        """Crea una nueva pelicula."""
-        # TODO: validar el payload y persistir un nuevo registro Movie.
+    def _select_columns(self, genre: str | None = None, year: int | None = None):
+        """Select de solo columnas: las filas se serializan sin hidratar objetos ORM.
+
+        ``genre`` (ya normalizado) se resuelve con un join contra el indice
+        ``movie_genres`` y ``year`` con el indice por ``release_year``.
+        """
+        stmt = db.select(*MOVIE_SERIALIZER.columns(self.model))
+        if genre is not None:
+            stmt = stmt.join(
+                MovieGenre,
+                db.and_(MovieGenre.movie_id == self.model.id, MovieGenre.genre == genre),
+            )
+        if year is not None:
+            stmt = stmt.where(self.model.release_year == year)
+        return stmt
+
+    def list_movies_page(self, cursor: str | None, limit: int, genre: str | None = None, year: int | None = None) -> dict:
+        """Retorna una pagina de peliculas ordenada por (created_at, id)."""
+        rows, next_cursor = keyset_page(
+            self.session,
+            self._select_columns(genre, year),
+            self.model.created_at,
+            self.model.id,
+            cursor,
+            limit,
+        )
+        return {"items": [MOVIE_SERIALIZER.from_row(row) for row in rows], "next_cursor": next_cursor}
+
+    def iter_movies(self, batch_size: int, genre: str | None = None, year: int | None = None) -> Iterator[dict]:
+        """Recorre las peliculas (con los filtros de ``list_movies``) de a ``batch_size`` filas.
+
+        Es un generador: la consulta se ejecuta al empezar a recorrerlo, ya
+        dentro del contexto de la respuesta en streaming.
+        """
+        result = self.session.execute(
+            self._select_columns(genre, year)
+            .order_by(self.model.created_at, self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for row in result:
+            yield MOVIE_SERIALIZER.from_row(row)
+
+    def validate_create(self, payload: dict) -> dict:
+        """Valida el payload de alta y devuelve los valores de las columnas."""
         if not isinstance(payload, dict):
             raise BadRequest("el cuerpo de la solicitud debe ser un diccionario")
         
         title = payload.get("title")
         if not title or not isinstance(title, str) or not title.strip():
             raise BadRequest("titulo invalido o faltante")
-        
-        movie = self.model(
-            title=title.strip(),
-            genre=payload.get("genre", []) or [],
-            release_year=payload.get("release_year"),
-        )
+
+        return {
+            "title": title.strip(),
+            "genre": self.validate_genre(payload.get("genre", [])),
+            "release_year": payload.get("release_year"),
+        }
+
+    @staticmethod
+    def validate_genre(value) -> list[str]:
+        """Valida la lista de generos; ``None`` equivale a lista vacia."""
+        genre = value or []
+        if not isinstance(genre, list) or not all(
+            isinstance(name, str) and len(name.strip()) <= GENRE_MAX_LENGTH for name in genre
+        ):
+            raise BadRequest(f"genre debe ser una lista de textos de hasta {GENRE_MAX_LENGTH} caracteres")
+        return genre
+
+    def _set_genres(self, movie, genre: list[str]) -> None:
+        """Asigna ``Movie.genre`` y sincroniza sus filas de ``movie_genres``."""
+        movie.genre = genre
+        existing = {link.genre: link for link in movie.genre_links}
+        movie.genre_links = [existing.get(key) or MovieGenre(genre=key) for key in genre_keys(genre)]
+
+    def _index_genres(self, inserted: list) -> None:
+        """Escribe ``movie_genres`` para filas ``(id, genre)`` insertadas con ``bulk_insert``."""
+        links = [
+            {"movie_id": movie_id, "genre": key}
+            for movie_id, genre in inserted
+            for key in genre_keys(genre)
+        ]
+        if links:
+            self.session.execute(db.insert(MovieGenre.__table__), links)
+
+    def create_movie(self, payload: dict) -> dict:
+        """Crea una nueva pelicula."""
+        values = self.validate_create(payload)
+        genre = values.pop("genre")
+        movie = self.model(**values)
+        self._set_genres(movie, genre)
         self.session.add(movie)
         try:
             self.session.commit()
@@ -49,13 +151,39 @@ class MovieService:
             raise
         return movie.to_dict()
 
+    def bulk_create_movies(self, lines, batch_size: int | None = None) -> dict:
+        """Importa peliculas desde lineas NDJSON ya decodificadas, por lotes."""
+        return bulk_insert(
+            self.session,
+            self.model.__table__,
+            lines,
+            self.validate_create,
+            batch_size,
+            after_insert=self._index_genres,
+            returning=("id", "genre"),
+        )
+
+    def _load_movie(self, movie_id: int) -> tuple[Validators, dict]:
+        """Validadores y detalle de una pelicula, leidos a traves del cache."""
+
+        def load() -> tuple[Validators, dict]:
+            movie = self.session.get(self.model, movie_id)
+            if not movie:
+                raise NotFound(f"Pelicula con id {movie_id} no encontrada")
+            etag = weak_etag("movie", movie.id, movie.version, movie.updated_at)
+            return (etag, movie.updated_at), movie.to_dict()
+
+        return self.cache.get_or_set(("movie", movie_id), load)
+
     def get_movie(self, movie_id: int) -> dict:
         """Obtiene una pelicula por su identificador."""
         # TODO: buscar la pelicula y manejar el caso de no encontrada.
-        movie = self.session.get(self.model, movie_id)
-        if not movie:
-            raise NotFound(f"Pelicula con id {movie_id} no encontrada")
-        return movie.to_dict()
+        return dict(self._load_movie(movie_id)[1])
+
+    def movie_detail(self, movie_id: int) -> tuple[Validators, dict]:
+        """Validadores y detalle de una pelicula con una sola lectura."""
+        validators, detail = self._load_movie(movie_id)
+        return validators, dict(detail)
 
     def update_movie(self, movie_id: int, payload: dict) -> dict:
         """Actualiza los datos de una pelicula."""
@@ -74,7 +202,7 @@ class MovieService:
             movie.title = title.strip()
         
         if "genre" in payload:
-            movie.genre = payload.get("genre", []) or []
+            self._set_genres(movie, self.validate_genre(payload.get("genre")))
 
         if "release_year" in payload:
             movie.release_year = payload.get("release_year")
@@ -84,6 +212,7 @@ class MovieService:
         except Exception:
             self.session.rollback()
             raise
+        self.cache.invalidate(("movie", movie_id))
         return movie.to_dict()
 
     def delete_movie(self, movie_id: int) -> None:
@@ -92,13 +221,17 @@ class MovieService:
         movie = self.session.get(self.model, movie_id)
         if not movie:
             raise NotFound(f"Pelicula con id {movie_id} no encontrada")
-        
-        self.session.delete(movie)
+
         try:
+            # Las entradas de la pelicula se borran en cascada
+            self.stats.remove_entries(WatchEntry.content_type == "movie", WatchEntry.movie_id == movie_id)
+            record_tombstones(self.session, WatchEntry.content_type == "movie", WatchEntry.movie_id == movie_id)
+            self.session.delete(movie)
             self.session.commit()
         except Exception as e:
             self.session.rollback()
             raise e
+        self.cache.invalidate(("movie", movie_id))
         
 
 
@@ -107,10 +240,21 @@ service = MovieService()
 
 @bp.get("/")
 def list_movies():
-    """Lista todas las peliculas disponibles."""
-    # TODO: invocar service.list_movies y devolver la respuesta serializada.
+    """Lista las peliculas paginadas por cursor (``?all=1`` devuelve todas).
+
+    ``?genre=`` y ``?year=`` filtran usando los indices de genero y anio.
+    ``?stream=1`` o ``Accept: application/x-ndjson`` exportan en streaming
+    todas las peliculas que cumplen los filtros.
+    """
     try:
-        return jsonify(service.list_movies()), 200
+        filters = parse_movie_filters(request.args)
+        fmt = stream_format(request)
+        if fmt:
+            return stream_response(service.iter_movies(yield_per(), **filters), fmt)
+        if wants_all(request.args):
+            return jsonify(service.list_movies(**filters)), 200
+        cursor, limit = parse_page_args(request.args)
+        return jsonify(service.list_movies_page(cursor, limit, **filters)), 200
     except BadRequest as br:
         return jsonify({"detail": str(br)}), 400
 
@@ -126,12 +270,26 @@ def create_movie():
     except BadRequest as br:
         return jsonify({"detail": str(br)}), 400
 
+@bp.post("/bulk")
+def bulk_create_movies():
+    """Importa peliculas desde un cuerpo NDJSON (un objeto JSON por linea)."""
+    if request.mimetype not in NDJSON_MIMETYPES:
+        return jsonify({"detail": "Content-Type debe ser application/x-ndjson"}), 415
+    report = service.bulk_create_movies(iter_ndjson(request.stream))
+    return jsonify(report), 200
+
+
 @bp.get("/<int:movie_id>")
 def retrieve_movie(movie_id: int):
-    """Devuelve el detalle de una pelicula concreta."""
+    """Devuelve el detalle de una pelicula concreta.
+
+    Responde 304 si ``If-None-Match``/``If-Modified-Since`` coinciden con la
+    version actual.
+    """
     # TODO: invocar service.get_movie y manejar 404 cuando corresponda.
     try:
-        return jsonify(service.get_movie(movie_id)), 200
+        validators, detail = service.movie_detail(movie_id)
+        return conditional_json(request, validators, lambda: detail)
     except NotFound as nf:
         return jsonify({"detail": str(nf)}), 404
 
@@ -0,0 +1,103 @@
+"""Utilidades de paginacion por cursor (keyset) para los listados."""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable
+
+from flask import current_app
+from sqlalchemy import and_, or_
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import BadRequest
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def encode_cursor(value: Any, item_id: int) -> str:
+    """Construye un cursor opaco a partir de la clave (valor de orden, id)."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, parse_value: Callable[[Any], Any] = datetime.fromisoformat) -> tuple[Any, int]:
+    """Recupera la clave (valor de orden, id) contenida en un cursor.
+
+    ``parse_value`` convierte el valor guardado; por defecto es una fecha.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw_value, item_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = parse_value(raw_value)
+    except (ValueError, TypeError, UnicodeError):
+        raise BadRequest("cursor invalido") from None
+    if not isinstance(item_id, int) or isinstance(item_id, bool):
+        raise BadRequest("cursor invalido")
+    return value, item_id
+
+
+def wants_all(args: MultiDict) -> bool:
+    """Indica si el cliente pidio explicitamente el listado sin paginar."""
+    return args.get("all", "").lower() in {"1", "true", "yes"}
+
+
+def parse_page_args(args: MultiDict) -> tuple[str | None, int]:
+    """Extrae y valida los parametros ``cursor`` y ``limit`` de la query string."""
+    default_limit = current_app.config.get("PAGINATION_DEFAULT_LIMIT", DEFAULT_LIMIT)
+    max_limit = current_app.config.get("PAGINATION_MAX_LIMIT", MAX_LIMIT)
+
+    raw_limit = args.get("limit")
+    if raw_limit is None:
+        limit = default_limit
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise BadRequest("limit debe ser un entero") from None
+        if limit < 1 or limit > max_limit:
+            raise BadRequest(f"limit debe estar entre 1 y {max_limit}")
+
+    cursor = args.get("cursor") or None
+    return cursor, limit
+
+
+def keyset_page(
+    session,
+    stmt,
+    sort_col,
+    id_col,
+    cursor: str | None,
+    limit: int,
+    descending: bool = False,
+    parse_value: Callable[[Any], Any] = datetime.fromisoformat,
+) -> tuple[list[Any], str | None]:
+    """Ejecuta ``stmt`` paginado por (sort_col, id) y devuelve las filas y el siguiente cursor.
+
+    El costo de cada pagina es independiente de su posicion porque el filtro
+    por clave aprovecha el indice compuesto en lugar de saltar filas con OFFSET.
+    ``stmt`` debe seleccionar columnas que incluyan ``sort_col`` e ``id_col``,
+    y ``sort_col`` no debe admitir nulos. ``parse_value`` interpreta el valor
+    de ``sort_col`` guardado en el cursor (fechas por defecto).
+    """
+    if cursor:
+        value, item_id = decode_cursor(cursor, parse_value)
+        if descending:
+            stmt = stmt.where(or_(sort_col < value, and_(sort_col == value, id_col < item_id)))
+        else:
+            stmt = stmt.where(or_(sort_col > value, and_(sort_col == value, id_col > item_id)))
+    if descending:
+        stmt = stmt.order_by(sort_col.desc(), id_col.desc())
+    else:
+        stmt = stmt.order_by(sort_col, id_col)
+    rows = session.execute(stmt.limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_col.key), getattr(last, id_col.key))
+    return rows, next_cursor
@@ -2,14 +2,95 @@
 
 from __future__ import annotations
 
-from flask import Blueprint, jsonify, request
-from werkzeug.exceptions import BadRequest, NotFound
-
-from src.extensions import db
-from src.models import User, Movie, Serie, WatchEntry, Season
+from datetime import datetime, timezone
+from typing import Iterator
+
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import contains_eager
+from werkzeug.exceptions import BadRequest, Gone, NotFound
+
+from src.api.conditional import Validators, conditional_json, weak_etag
+from src.api.pagination import keyset_page, parse_page_args
+from src.api.stats import UserStatsService
+from src.api.sync import (
+    EPOCH,
+    advance,
+    after,
+    decode_sync_token,
+    encode_sync_token,
+    retention_limit,
+    sync_horizon,
+)
+from src.api.streaming import stream_format, stream_response, yield_per
+from src.extensions import cache, db
+from src.models import User, Movie, Serie, WatchEntry, WatchEntryTombstone, Season
+from src.models.user_stats import STATS_SERIALIZER, contribution_delta, entry_contribution, serialize_stats_row
+from src.models.watch_entry import ENTRY_SERIALIZER, serialize_entry_row
+from src.models.watch_entry_tombstone import TOMBSTONE_SERIALIZER
 
 bp = Blueprint("progress", __name__, url_prefix="")
 
+DEFAULT_BATCH_MAX_ITEMS = 200
+PROGRESS_FIELDS = ("current_season", "current_episode", "total_episodes", "watched_episodes", "status")
+ENTRY_STATUSES = ("watching", "completed", "paused")
+CONTENT_TYPES = ("movie", "series")
+# Parametros que activan el listado filtrado y paginado de la watchlist
+WATCHLIST_QUERY_ARGS = ("status", "content_type", "updated_since", "sort", "cursor", "limit")
+WATCHLIST_SORTS = ("updated_at", "percentage")
+
+
+def _is_unique_violation(error: IntegrityError) -> bool:
+    """Distingue una violacion de unicidad de otros errores de integridad."""
+    orig = error.orig
+    if getattr(orig, "pgcode", None) == "23505":
+        return True
+    return "unique" in str(orig).lower()
+
+
+def parse_watchlist_args(args) -> dict | None:
+    """Valida filtros, orden y cursor de ``GET /me/watchlist``.
+
+    Devuelve ``None`` si no vino ninguno, para conservar el listado completo.
+    ``sort`` admite ``updated_at`` o ``percentage``, con ``-`` para orden
+    descendente; por defecto ``-updated_at``.
+    """
+    if not any(name in args for name in WATCHLIST_QUERY_ARGS):
+        return None
+
+    status = args.get("status") or None
+    if status is not None and status not in ENTRY_STATUSES:
+        raise BadRequest(f"status invalido, opciones: {', '.join(ENTRY_STATUSES)}")
+    content_type = args.get("content_type") or None
+    if content_type is not None and content_type not in CONTENT_TYPES:
+        raise BadRequest(f"content_type invalido, opciones: {', '.join(CONTENT_TYPES)}")
+
+    updated_since = args.get("updated_since") or None
+    if updated_since is not None:
+        try:
+            updated_since = datetime.fromisoformat(updated_since.replace("Z", "+00:00"))
+        except ValueError:
+            raise BadRequest("updated_since debe ser una fecha ISO 8601") from None
+        if updated_since.tzinfo is None:
+            updated_since = updated_since.replace(tzinfo=timezone.utc)
+        updated_since = updated_since.astimezone(timezone.utc)
+
+    sort = args.get("sort") or "-updated_at"
+    descending = sort.startswith("-")
+    if sort.lstrip("-") not in WATCHLIST_SORTS:
+        raise BadRequest(f"sort invalido, opciones: {', '.join(WATCHLIST_SORTS)} (prefijo - para descendente)")
+
+    cursor, limit = parse_page_args(args)
+    return {
+        "status": status,
+        "content_type": content_type,
+        "updated_since": updated_since,
+        "sort": sort.lstrip("-"),
+        "descending": descending,
+        "cursor": cursor,
+        "limit": limit,
+    }
+
 
 class ProgressService:
     """Coordina operaciones sobre la lista de seguimiento y progreso."""
@@ -23,6 +104,9 @@ class ProgressService:
         series_model=None,
         entry_model=None,
         season_model=None,
+        single_statement_writes: bool | None = None,
+        cache_backend=None,
+        stats_service=None,
     ) -> None:
         self.session = session or db.session
         self.user_model = user_model or User
@@ -30,40 +114,292 @@ class ProgressService:
         self.series_model = series_model or Serie
         self.entry_model = entry_model or WatchEntry
         self.season_model = season_model or Season
+        # None: usar la sentencia unica cuando el dialecto la soporte
+        self.single_statement_writes = single_statement_writes
+        self.cache = cache_backend or cache
+        self.stats = stats_service or UserStatsService(self.session, entry_model=self.entry_model)
+
+    def _ensure_user(self, user_id: int) -> None:
+        """Verifica que el usuario exista; solo se cachean los positivos."""
+
+        def load() -> bool:
+            if self.session.get(self.user_model, user_id) is None:
+                raise NotFound(f"Usuario con id {user_id} no encontrado")
+            return True
+
+        self.cache.get_or_set(("user", user_id), load)
+
+    def _use_single_statement(self) -> bool:
+        """Indica si las altas pueden resolverse con una sola sentencia."""
+        if self.single_statement_writes is False:
+            return False
+        return self.session.get_bind().dialect.insert_returning
 
-    def list_watchlist(self, user_id: int) -> list[dict]:
-        """Devuelve los contenidos asociados a un usuario."""
-        # TODO: consultar entradas filtradas por user_id y calcular porcentajes.
-        user = self.session.get(self.user_model, user_id)
-        if not user:
+    def _insert_entry(
+        self,
+        user_id: int,
+        content_model,
+        content_id: int,
+        duplicate,
+        values: dict,
+        series_total=None,
+        stats_delta: dict | None = None,
+    ) -> dict | None:
+        """Inserta una entrada con ``INSERT ... SELECT ... WHERE NOT EXISTS ... RETURNING``.
+
+        La existencia del usuario y del contenido y la unicidad se resuelven en
+        la misma sentencia. Equivale a ``ON CONFLICT DO NOTHING`` pero es valido
+        en SQLite y Postgres y, a diferencia de los ``insert`` de cada dialecto,
+        SQLAlchemy puede cachear su compilacion. ``series_total`` agrega al
+        RETURNING el total de episodios de la serie para serializar sin otra
+        consulta. ``stats_delta`` se suma a ``UserStats`` en la misma
+        transaccion. Devuelve ``None`` si no se inserto ninguna fila.
+        """
+        entry_model = self.entry_model
+        source = (
+            db.select(self.user_model.id, *values.values())
+            .join(content_model, content_model.id == content_id)
+            .where(
+                self.user_model.id == user_id,
+                ~db.select(entry_model.id).where(entry_model.user_id == user_id, duplicate).exists(),
+            )
+        )
+        stmt = (
+            db.insert(entry_model)
+            .from_select(["user_id", *values], source)
+            .returning(entry_model, *([series_total] if series_total is not None else []))
+        )
+        try:
+            row = self.session.execute(stmt).first()
+            if row is None:
+                self.session.rollback()
+                return None
+            data = row[0].to_dict(*row[1:])
+            self.stats.apply_delta(user_id, stats_delta)
+            self.session.commit()
+        except IntegrityError as exc:
+            # Otra transaccion inserto el mismo contenido entre el SELECT y el INSERT
+            self.session.rollback()
+            if _is_unique_violation(exc):
+                return None
+            raise
+        except Exception:
+            self.session.rollback()
+            raise
+        return data
+
+    def _raise_insert_failure(self, user_id: int, content_model, content_id: int, not_found: str, duplicate: str) -> None:
+        """Reconstruye el error 404/400 cuando la insercion no produjo filas."""
+        user_exists, content_exists = self.session.execute(
+            db.select(
+                db.select(self.user_model.id).where(self.user_model.id == user_id).exists(),
+                db.select(content_model.id).where(content_model.id == content_id).exists(),
+            )
+        ).one()
+        self.session.rollback()
+        if not user_exists:
             raise NotFound(f"Usuario con id {user_id} no encontrado")
+        if not content_exists:
+            raise NotFound(not_found)
+        raise BadRequest(duplicate)
+
+    def _watchlist_query(self, user_id: int, *extra_columns):
+        """Entradas del usuario junto al total de episodios de cada serie.
+
+        No verifica el usuario: cada llamador lo hace una sola vez con
+        ``_ensure_user``, que sin cache es una consulta.
+        """
+        # Solo columnas, con el total de episodios de cada serie al final de la fila
+        return (
+            db.select(*ENTRY_SERIALIZER.columns(self.entry_model), *extra_columns, self.series_model.total_episodes)
+            .outerjoin(self.series_model, self.series_model.id == self.entry_model.series_id)
+            .where(self.entry_model.user_id == user_id)
+        )
 
-        items = self.session.execute(
-            db.select(self.entry_model).where(self.entry_model.user_id == user_id)
-        ).scalars().all()
-        return [e.to_dict() for e in items]
+    def list_watchlist_page(self, user_id: int, query: dict) -> dict:
+        """Pagina la watchlist con los filtros y el orden de ``parse_watchlist_args``.
+
+        Filtra y ordena en SQL sobre los indices ``(user_id, [status,]
+        updated_at, id)`` y ``(user_id, percentage, id)``; el porcentaje se
+        ordena por la columna guardada ``WatchEntry.percentage``.
+        """
+        self._ensure_user(user_id)
+        entry = self.entry_model
+        sort_col = self._watchlist_sort_column(query)
+        stmt = self._filter_watchlist(self._watchlist_query(user_id, entry.percentage), query)
+        rows, next_cursor = keyset_page(
+            self.session,
+            stmt,
+            sort_col,
+            entry.id,
+            query["cursor"],
+            query["limit"],
+            descending=query["descending"],
+            parse_value=float if query["sort"] == "percentage" else datetime.fromisoformat,
+        )
+        return {"items": [serialize_entry_row(row) for row in rows], "next_cursor": next_cursor}
+
+    def _filter_watchlist(self, stmt, query: dict):
+        """Agrega a ``stmt`` los filtros de ``parse_watchlist_args``."""
+        entry = self.entry_model
+        if query["status"] is not None:
+            stmt = stmt.where(entry.status == query["status"])
+        if query["content_type"] is not None:
+            stmt = stmt.where(entry.content_type == query["content_type"])
+        if query["updated_since"] is not None:
+            stmt = stmt.where(entry.updated_at >= query["updated_since"])
+        return stmt
+
+    def _watchlist_sort_column(self, query: dict):
+        entry = self.entry_model
+        return entry.percentage if query["sort"] == "percentage" else entry.updated_at
+
+    def watchlist_validators(self, user_id: int) -> Validators:
+        """ETag de la watchlist a partir de un agregado sobre las entradas.
+
+        Cuenta, id maximo y suma de versiones cambian con cualquier alta,
+        baja o edicion; la suma de versiones de las series cubre cambios en su
+        total de episodios. No hay Last-Modified: una baja no mueve ninguna
+        fecha y ``If-Modified-Since`` podria responder 304 con datos viejos.
+        """
+        self._ensure_user(user_id)
+
+        entry, serie = self.entry_model, self.series_model
+        summary = self.session.execute(
+            db.select(
+                db.func.count(entry.id),
+                db.func.max(entry.id),
+                db.func.sum(entry.version),
+                db.func.max(entry.updated_at),
+                db.func.sum(serie.version),
+            )
+            .outerjoin(serie, serie.id == entry.series_id)
+            .where(entry.user_id == user_id)
+        ).one()
+        return weak_etag("watchlist", user_id, *summary), None
+
+    def list_watchlist(self, user_id: int, etag: str | None = None) -> list[dict]:
+        """Devuelve los contenidos asociados a un usuario.
+
+        Con ``etag`` (de ``watchlist_validators``) el listado se cachea junto a
+        ese ETag y solo se reutiliza mientras coincida: los cambios en el
+        catalogo de series no necesitan invalidar la watchlist de cada usuario.
+        """
+        if etag is None:
+            self._ensure_user(user_id)
+            return self._load_watchlist(user_id)
+        key = ("watchlist", user_id)
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] == etag:
+            return cached[1]
+        items = self._load_watchlist(user_id)
+        self.cache.set(key, (etag, items))
+        return items
+
+    def _load_watchlist(self, user_id: int) -> list[dict]:
+        rows = self.session.execute(self._watchlist_query(user_id)).all()
+        return [serialize_entry_row(row) for row in rows]
+
+    def list_changes(self, user_id: int, token: str | None, limit: int) -> dict:
+        """Entradas modificadas y eliminadas desde ``token`` (ver ``src.api.sync``).
+
+        Sin token devuelve la watchlist completa (de a ``limit`` entradas) y
+        un token para seguir. Cada consulta es un rango sobre los indices
+        ``(user_id, updated_at, id)`` y ``(user_id, deleted_at, id)``: sin
+        cambios no lee filas y el token solo avanza hasta la ventana de seguridad. ``has_more`` indica
+        que hay que volver a llamar enseguida con ``next_token``.
+        """
+        self._ensure_user(user_id)
+        config = current_app.config
+        horizon = sync_horizon(config)
+        if token is None:
+            entries_mark, deleted_mark = (EPOCH, 0), (horizon, 0)
+        else:
+            entries_mark, deleted_mark = decode_sync_token(token)
+            if deleted_mark[0] < retention_limit(config):
+                raise Gone("El token es anterior a la retencion de eliminaciones; descargar la watchlist completa")
+
+        entry = self.entry_model
+        rows = self.session.execute(
+            self._watchlist_query(user_id)
+            .where(after(entry.updated_at, entry.id, entries_mark))
+            .order_by(entry.updated_at, entry.id)
+            .limit(limit + 1)
+        ).all()
+        tombstone = WatchEntryTombstone
+        deleted = self.session.execute(
+            db.select(*TOMBSTONE_SERIALIZER.columns(tombstone), tombstone.id)
+            .where(tombstone.user_id == user_id, after(tombstone.deleted_at, tombstone.id, deleted_mark))
+            .order_by(tombstone.deleted_at, tombstone.id)
+            .limit(limit + 1)
+        ).all()
+
+        entries_more, deleted_more = len(rows) > limit, len(deleted) > limit
+        rows, deleted = rows[:limit], deleted[:limit]
+        entries_mark = advance(entries_mark, (rows[-1].updated_at, rows[-1].id) if rows else None, entries_more, horizon)
+        deleted_mark = advance(deleted_mark, (deleted[-1].deleted_at, deleted[-1].id) if deleted else None, deleted_more, horizon)
+        return {
+            "changes": [serialize_entry_row(row) for row in rows],
+            "deleted": [TOMBSTONE_SERIALIZER.from_row(row) for row in deleted],
+            "next_token": encode_sync_token(entries_mark, deleted_mark),
+            "has_more": entries_more or deleted_more,
+        }
+
+    def iter_watchlist(self, user_id: int, batch_size: int, query: dict | None = None) -> Iterator[dict]:
+        """Recorre la watchlist trayendo las entradas de a ``batch_size`` filas.
+
+        Con ``query`` (de ``parse_watchlist_args``) aplica sus filtros y su
+        orden; ``cursor`` y ``limit`` no se usan, se exporta todo. La
+        validacion del usuario ocurre al invocar el metodo, antes de que la
+        respuesta en streaming comience; la consulta de entradas se ejecuta al
+        empezar a recorrer el generador devuelto.
+        """
+        self._ensure_user(user_id)
+        entry = self.entry_model
+        stmt = self._watchlist_query(user_id)
+        if query is None:
+            stmt = stmt.order_by(entry.id)
+        else:
+            sort_col = self._watchlist_sort_column(query)
+            order = (sort_col.desc(), entry.id.desc()) if query["descending"] else (sort_col, entry.id)
+            stmt = self._filter_watchlist(stmt, query).order_by(*order)
+        return self._iter_entries(stmt.execution_options(yield_per=batch_size))
+
+    def _iter_entries(self, stmt) -> Iterator[dict]:
+        """Serializa las filas de la watchlist a medida que llegan."""
+        for row in self.session.execute(stmt):
+            yield serialize_entry_row(row)
 
     def add_movie(self, user_id: int, movie_id: int) -> dict:
         """Agrega una pelicula a la lista del usuario."""
-        # TODO: validar existencia del usuario y pelicula antes de crear el registro.
-        user = self.session.get(self.user_model, user_id)
-        if not user:
-            raise NotFound(f"Usuario con id {user_id} no encontrado")
+        if self._use_single_statement():
+            movie = self.movie_model
+            entry = self.entry_model
+            duplicate = db.and_(entry.content_type == "movie", entry.movie_id == movie_id)
+            created = self._insert_entry(user_id, movie, movie_id, duplicate, {
+                "content_type": db.literal("movie"),
+                "content_id": movie.id,
+                "movie_id": movie.id,
+                "status": db.literal("watching"),
+                "watched_episodes": db.literal(0),
+            }, stats_delta=entry_contribution("movie", "watching", 0))
+            if created is None:
+                self._raise_insert_failure(
+                    user_id,
+                    movie,
+                    movie_id,
+                    f"Pelicula con id {movie_id} no encontrada",
+                    "La pelicula ya existe en la watchlist del usuario",
+                )
+            self.cache.invalidate(("watchlist", user_id))
+            return created
+
+        self._ensure_user(user_id)
 
         movie = self.session.get(self.movie_model, movie_id)
         if not movie:
             raise NotFound(f"Pelicula con id {movie_id} no encontrada")
 
-        existing = self.session.execute(
-            db.select(self.entry_model).where(
-                self.entry_model.user_id == user_id,
-                self.entry_model.content_type == "movie",
-                self.entry_model.movie_id == movie_id,
-            )
-        ).scalars().first()
-        if existing:
-            raise BadRequest("La pelicula ya existe en la watchlist del usuario")
-
         entry = self.entry_model(
             user_id=user_id,
             content_type="movie",
@@ -76,41 +412,58 @@ class ProgressService:
             total_episodes=None,
         )
         self.session.add(entry)
+        # El indice unico uq_watch_entries_user_movie detecta el duplicado
         try:
+            self.stats.apply_delta(user_id, entry_contribution("movie", entry.status, entry.watched_episodes))
             self.session.commit()
+        except IntegrityError as exc:
+            self.session.rollback()
+            if _is_unique_violation(exc):
+                raise BadRequest("La pelicula ya existe en la watchlist del usuario") from None
+            raise
         except Exception:
             self.session.rollback()
             raise
+        self.cache.invalidate(("watchlist", user_id))
         return entry.to_dict()
 
     def add_series(self, user_id: int, series_id: int) -> dict:
         """Agrega una serie a la lista del usuario."""
-        # TODO: crear WatchEntry inicial con temporadas/episodios en cero.
-        user = self.session.get(self.user_model, user_id)
-        if not user:
-            raise NotFound(f"Usuario con id {user_id} no encontrado")
+        if self._use_single_statement():
+            serie = self.series_model
+            entry = self.entry_model
+            duplicate = db.and_(entry.content_type == "series", entry.series_id == series_id)
+            series_total = (
+                db.select(serie.total_episodes)
+                .where(serie.id == series_id)
+                .scalar_subquery()
+            )
+            created = self._insert_entry(user_id, serie, series_id, duplicate, {
+                "content_type": db.literal("series"),
+                "content_id": serie.id,
+                "series_id": serie.id,
+                "status": db.literal("watching"),
+                "current_season": db.case((serie.total_seasons >= 1, 1), else_=None),
+                "current_episode": db.literal(0),
+                "watched_episodes": db.literal(0),
+            }, series_total=series_total, stats_delta=entry_contribution("series", "watching", 0))
+            if created is None:
+                self._raise_insert_failure(
+                    user_id,
+                    serie,
+                    series_id,
+                    f"Serie con id {series_id} no encontrada",
+                    "La serie ya existe en la watchlist del usuario",
+                )
+            self.cache.invalidate(("watchlist", user_id))
+            return created
+
+        self._ensure_user(user_id)
 
         serie = self.session.get(self.series_model, series_id)
         if not serie:
             raise NotFound(f"Serie con id {series_id} no encontrada")
 
-        existing = self.session.execute(
-            db.select(self.entry_model).where(
-                self.entry_model.user_id == user_id,
-                self.entry_model.content_type == "series",
-                self.entry_model.series_id == series_id,
-            )
-        ).scalars().first()
-        if existing:
-            raise BadRequest("La serie ya existe en la watchlist del usuario")
-
-        # Calcular total de episodios si hay temporadas cargadas
-        try:
-            seasons = serie.seasons.all()  # lazy="dynamic"
-        except Exception:
-            seasons = list(serie.seasons) if hasattr(serie, "seasons") else []
-        total_eps = sum((s.episodes_count or 0) for s in seasons) if seasons else 0
-
         entry = self.entry_model(
             user_id=user_id,
             content_type="series",
@@ -120,34 +473,40 @@ class ProgressService:
             current_season=1 if (serie.total_seasons or 0) >= 1 else None,
             current_episode=0,
             watched_episodes=0,
-            total_episodes=total_eps or None,
+            # Sin copia: el total se lee de Serie.total_episodes
+            total_episodes=None,
         )
         self.session.add(entry)
+        # El indice unico uq_watch_entries_user_series detecta el duplicado
         try:
+            self.stats.apply_delta(user_id, entry_contribution("series", entry.status, entry.watched_episodes))
             self.session.commit()
+        except IntegrityError as exc:
+            self.session.rollback()
+            if _is_unique_violation(exc):
+                raise BadRequest("La serie ya existe en la watchlist del usuario") from None
+            raise
         except Exception:
             self.session.rollback()
             raise
+        self.cache.invalidate(("watchlist", user_id))
         return entry.to_dict()
 
-    def update_series_progress(self, user_id: int, series_id: int, payload: dict) -> dict:
-        """Actualiza el progreso de una serie en la lista del usuario."""
-        # TODO: validar limites de temporadas y episodios, recalcular porcentaje.
-        if not isinstance(payload, dict):
-            raise BadRequest("El cuerpo de la solicitud debe ser un objeto JSON.")
-
-        entry = self.session.execute(
-            db.select(self.entry_model).where(
-                self.entry_model.user_id == user_id,
-                self.entry_model.content_type == "series",
-                self.entry_model.series_id == series_id,
+    def _find_season(self, series_id: int, number: int):
+        """Temporada ``number`` de la serie, o ``None``."""
+        return self.session.execute(
+            db.select(self.season_model).where(
+                self.season_model.series_id == series_id,
+                self.season_model.number == number,
             )
         ).scalars().first()
-        if not entry:
-            raise NotFound("No existe una entrada de progreso para esta serie y usuario")
 
-        serie = entry.series or self.session.get(self.series_model, series_id)
+    def _apply_progress(self, entry, serie, payload: dict, find_season) -> None:
+        """Valida ``payload`` y aplica los cambios de progreso sobre ``entry``.
 
+        ``find_season(series_id, number)`` devuelve la temporada o ``None``;
+        permite consultarla puntualmente o resolverla de un lote precargado.
+        """
         # Validaciones y asignaciones opcionales
         if "current_season" in payload:
             cs = payload.get("current_season")
@@ -163,12 +522,7 @@ class ProgressService:
                 raise BadRequest("current_episode debe ser un entero >= 0 o null")
             # Si se conoce la temporada actual, validamos contra episodes_count
             if ce and entry.current_season:
-                season = self.session.execute(
-                    db.select(self.season_model).where(
-                        self.season_model.series_id == series_id,
-                        self.season_model.number == entry.current_season,
-                    )
-                ).scalars().first()
+                season = find_season(entry.series_id, entry.current_season)
                 if season and ce > (season.episodes_count or 0):
                     raise BadRequest("current_episode excede los episodios de la temporada actual")
             entry.current_episode = ce
@@ -183,7 +537,8 @@ class ProgressService:
             we = payload.get("watched_episodes")
             if we is not None and (not isinstance(we, int) or we < 0):
                 raise BadRequest("watched_episodes debe ser un entero >= 0 o null")
-            if we is not None and entry.total_episodes is not None and we > entry.total_episodes:
+            total = entry.effective_total_episodes()
+            if we is not None and total is not None and we > total:
                 raise BadRequest("watched_episodes no puede superar total_episodes")
             entry.watched_episodes = we
 
@@ -195,35 +550,231 @@ class ProgressService:
             entry.status = status
             if status == "completed":
                 # Marca como visto por completo si conocemos el total
-                if entry.total_episodes:
-                    entry.watched_episodes = entry.total_episodes
+                total = entry.effective_total_episodes()
+                if total:
+                    entry.watched_episodes = total
+
+        entry.percentage = entry.percentage_watched()
+
+    @staticmethod
+    def _contribution(entry) -> dict[str, int]:
+        return entry_contribution(entry.content_type, entry.status, entry.watched_episodes)
+
+    def update_series_progress(self, user_id: int, series_id: int, payload: dict) -> dict:
+        """Actualiza el progreso de una serie en la lista del usuario."""
+        # TODO: validar limites de temporadas y episodios, recalcular porcentaje.
+        if not isinstance(payload, dict):
+            raise BadRequest("El cuerpo de la solicitud debe ser un objeto JSON.")
+
+        entry = self.session.execute(
+            db.select(self.entry_model).where(
+                self.entry_model.user_id == user_id,
+                self.entry_model.content_type == "series",
+                self.entry_model.series_id == series_id,
+            )
+        ).scalars().first()
+        if not entry:
+            raise NotFound("No existe una entrada de progreso para esta serie y usuario")
+
+        serie = entry.series or self.session.get(self.series_model, series_id)
+        before = self._contribution(entry)
+        self._apply_progress(entry, serie, payload, self._find_season)
 
         try:
+            self.stats.apply_delta(user_id, contribution_delta(before, self._contribution(entry)))
             self.session.commit()
         except Exception:
             self.session.rollback()
             raise
+        self.cache.invalidate(("watchlist", user_id))
         return entry.to_dict()
 
+    def update_series_progress_batch(self, user_id: int, updates: list) -> dict:
+        """Aplica varias actualizaciones de progreso con un unico commit.
+
+        Carga todas las entradas (con su serie) en una consulta y las
+        temporadas de esas series en otra; cada item se valida con las mismas
+        reglas que ``update_series_progress`` y un item invalido no afecta a
+        los demas. Devuelve un resultado por item, en el orden recibido.
+        """
+        if not isinstance(updates, list) or not updates:
+            raise BadRequest("El cuerpo debe ser una lista no vacia de actualizaciones")
+        max_items = current_app.config.get("PROGRESS_BATCH_MAX_ITEMS", DEFAULT_BATCH_MAX_ITEMS)
+        if len(updates) > max_items:
+            raise BadRequest(f"Se admiten como maximo {max_items} actualizaciones por solicitud")
+
+        results: list[dict | None] = [None] * len(updates)
+        pending = []
+        for index, item in enumerate(updates):
+            series_id = item.get("series_id") if isinstance(item, dict) else None
+            if not isinstance(series_id, int) or isinstance(series_id, bool):
+                results[index] = {"series_id": series_id, "status": 400, "detail": "series_id debe ser un entero"}
+                continue
+            pending.append((index, series_id, {k: v for k, v in item.items() if k != "series_id"}))
+
+        entry_model, season_model = self.entry_model, self.season_model
+        entries = {}
+        if pending:
+            rows = self.session.execute(
+                db.select(entry_model)
+                .outerjoin(entry_model.series)
+                .options(contains_eager(entry_model.series))
+                .where(
+                    entry_model.user_id == user_id,
+                    entry_model.content_type == "series",
+                    entry_model.series_id.in_({series_id for _, series_id, _ in pending}),
+                )
+            ).scalars().all()
+            entries = {entry.series_id: entry for entry in rows}
+
+        # Todas las temporadas de las series con algun current_episode: un item
+        # anterior del lote puede cambiar la temporada actual contra la que se valida
+        affected = {
+            series_id
+            for _, series_id, payload in pending
+            if series_id in entries and payload.get("current_episode")
+        }
+        seasons = {}
+        if affected:
+            seasons = {
+                (season.series_id, season.number): season
+                for season in self.session.execute(
+                    db.select(season_model).where(season_model.series_id.in_(affected))
+                ).scalars()
+            }
+
+        def find_season(series_id: int, number: int):
+            return seasons.get((series_id, number))
+
+        applied = []
+        stats_delta: dict[str, int] = {}
+        for index, series_id, payload in pending:
+            entry = entries.get(series_id)
+            if entry is None:
+                results[index] = {
+                    "series_id": series_id,
+                    "status": 404,
+                    "detail": "No existe una entrada de progreso para esta serie y usuario",
+                }
+                continue
+            snapshot = {field: getattr(entry, field) for field in PROGRESS_FIELDS}
+            before = self._contribution(entry)
+            try:
+                self._apply_progress(entry, entry.series, payload, find_season)
+            except BadRequest as br:
+                for field, value in snapshot.items():
+                    setattr(entry, field, value)
+                results[index] = {"series_id": series_id, "status": 400, "detail": br.description}
+                continue
+            for key, value in contribution_delta(before, self._contribution(entry)).items():
+                stats_delta[key] = stats_delta.get(key, 0) + value
+            applied.append((index, series_id, entry.id))
+
+        if applied:
+            try:
+                self.stats.apply_delta(user_id, contribution_delta({}, stats_delta))
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+            self.cache.invalidate(("watchlist", user_id))
+
+            # Estado final de las entradas actualizadas en una sola consulta
+            stmt = (
+                db.select(*ENTRY_SERIALIZER.columns(entry_model), self.series_model.total_episodes)
+                .outerjoin(self.series_model, self.series_model.id == entry_model.series_id)
+                .where(entry_model.id.in_({entry_id for _, _, entry_id in applied}))
+            )
+            serialized = {row.id: serialize_entry_row(row) for row in self.session.execute(stmt)}
+            for index, series_id, entry_id in applied:
+                results[index] = {"series_id": series_id, "status": 200, "entry": serialized[entry_id]}
+
+        return {"updated": len(applied), "results": results}
+
+    def get_stats(self, user_id: int) -> dict:
+        """Contadores precalculados de la watchlist del usuario.
+
+        Lee una sola fila de ``user_stats``; un usuario sin fila todavia no
+        agrego contenidos y se informa con los contadores en cero.
+        """
+        stats = self.stats.stats_model
+        row = self.session.execute(
+            db.select(*STATS_SERIALIZER.columns(stats), self.user_model.id)
+            .select_from(self.user_model)
+            .outerjoin(stats, stats.user_id == self.user_model.id)
+            .where(self.user_model.id == user_id)
+        ).first()
+        if row is None:
+            raise NotFound(f"Usuario con id {user_id} no encontrado")
+        data = serialize_stats_row(tuple(value or 0 for value in row[:-1]))
+        return {"user_id": user_id, **data}
+
 
 service = ProgressService()
 
 
 @bp.get("/me/watchlist")
 def get_my_watchlist():
-    """Devuelve la lista de seguimiento del usuario actual."""
+    """Devuelve la lista de seguimiento del usuario actual.
+
+    ``?stream=1`` o ``Accept: application/x-ndjson`` la emiten en streaming,
+    con los mismos filtros y orden que la pagina. Con ``status``, ``content_type``, ``updated_since``, ``sort``, ``cursor``
+    o ``limit`` responde una pagina ``{"items", "next_cursor"}``. Sin ellos,
+    ``If-None-Match`` permite revalidar el listado completo con un 304.
+    """
     user_id = request.headers.get("X-User-Id", type=int)
     # TODO: validar el header y manejar autenticacion simulada.
     if not user_id:
         return jsonify({"detail": "Header X-User-Id requerido"}), 400
     try:
-        return jsonify(service.list_watchlist(user_id)), 200
+        query = parse_watchlist_args(request.args)
+        fmt = stream_format(request)
+        if fmt:
+            return stream_response(service.iter_watchlist(user_id, yield_per(), query), fmt)
+        if query is not None:
+            return jsonify(service.list_watchlist_page(user_id, query)), 200
+        validators = service.watchlist_validators(user_id)
+        response = conditional_json(request, validators, lambda: service.list_watchlist(user_id, validators[0]))
+        response.vary.add("X-User-Id")
+        return response
+    except NotFound as nf:
+        return jsonify({"detail": str(nf)}), 404
+    except BadRequest as br:
+        return jsonify({"detail": str(br)}), 400
+
+
+@bp.get("/me/watchlist/changes")
+def get_my_watchlist_changes():
+    """Cambios de la watchlist desde ``?since=<token>`` para sincronizar clientes."""
+    user_id = request.headers.get("X-User-Id", type=int)
+    if not user_id:
+        return jsonify({"detail": "Header X-User-Id requerido"}), 400
+    try:
+        _, limit = parse_page_args(request.args)
+        changes = service.list_changes(user_id, request.args.get("since") or None, limit)
+        response = jsonify(changes)
+        response.vary.add("X-User-Id")
+        return response, 200
     except NotFound as nf:
         return jsonify({"detail": str(nf)}), 404
+    except Gone as gone:
+        return jsonify({"detail": str(gone)}), 410
     except BadRequest as br:
         return jsonify({"detail": str(br)}), 400
 
 
+@bp.get("/me/stats")
+def get_my_stats():
+    """Devuelve los contadores de la watchlist del usuario actual."""
+    user_id = request.headers.get("X-User-Id", type=int)
+    if not user_id:
+        return jsonify({"detail": "Header X-User-Id requerido"}), 400
+    try:
+        return jsonify(service.get_stats(user_id)), 200
+    except NotFound as nf:
+        return jsonify({"detail": str(nf)}), 404
+
+
 @bp.post("/watchlist/movies/<int:movie_id>")
 def add_movie_to_watchlist(movie_id: int):
     """Agrega una pelicula a la lista del usuario."""
@@ -256,6 +807,20 @@ def add_series_to_watchlist(series_id: int):
         return jsonify({"detail": str(br)}), 400
 
 
+@bp.patch("/progress/series")
+def update_series_progress_batch():
+    """Sincroniza el progreso de varias series: recibe una lista de
+    ``{"series_id": ..., <campos de progreso>}`` y responde un resultado por item."""
+    user_id = request.headers.get("X-User-Id", type=int)
+    payload = request.get_json(silent=True)
+    if not user_id:
+        return jsonify({"detail": "Header X-User-Id requerido"}), 400
+    try:
+        return jsonify(service.update_series_progress_batch(user_id, payload)), 200
+    except BadRequest as br:
+        return jsonify({"detail": str(br)}), 400
+
+
 @bp.patch("/progress/series/<int:series_id>")
 def update_series_progress(series_id: int):
     """Actualiza los datos de progreso de una serie."""
@@ -2,11 +2,23 @@
 
 from __future__ import annotations
 
+from typing import Iterator
+
 from flask import Blueprint, jsonify, request
+from sqlalchemy.orm import selectinload
 from werkzeug.exceptions import BadRequest, NotFound
 
-from src.extensions import db
-from src.models import Serie, Season
+from src.api.bulk import NDJSON_MIMETYPES, bulk_insert, iter_ndjson
+from src.api.conditional import Validators, conditional_json, weak_etag
+from src.api.pagination import keyset_page, parse_page_args, wants_all
+from src.api.stats import UserStatsService
+from src.api.sync import record_tombstones
+from src.api.streaming import stream_format, stream_response, yield_per
+from src.extensions import cache, db
+from src.models import Serie, Season, WatchEntry
+from src.models.season import SEASON_SERIALIZER
+from src.models.watch_entry import percentage_expression
+from src.models.serie import SERIE_SERIALIZER
 
 bp = Blueprint("series", __name__, url_prefix="/series")
 
@@ -15,20 +27,69 @@ class SeriesService:
     """Gestiona las operaciones CRUD sobre Series y Seasons."""
 
     # TODO: inyectar modelos Series y Season junto a la sesion de base de datos.
-    def __init__(self, session=None, series_model=None, season_model=None) -> None:
+    def __init__(self, session=None, series_model=None, season_model=None, cache_backend=None, stats_service=None) -> None:
         self.session = session or db.session
         self.series_model = series_model or Serie
         self.season_model = season_model or Season
-
-    def list_series(self) -> list[dict]:
+        self.cache = cache_backend or cache
+        self.stats = stats_service or UserStatsService(self.session)
+
+    def _select_columns(self):
+        """Select de solo columnas: las filas se serializan sin hidratar objetos ORM."""
+        return db.select(*SERIE_SERIALIZER.columns(self.series_model))
+
+    def _serialize_rows(self, rows, include_seasons: bool) -> list[dict]:
+        """Serializa filas de series; con ``include_seasons`` agrega sus temporadas
+        usando una unica consulta adicional."""
+        items = [SERIE_SERIALIZER.from_row(row) for row in rows]
+        if include_seasons and items:
+            by_series = {item["id"]: item for item in items}
+            for item in items:
+                item["seasons"] = []
+            season = self.season_model
+            seasons = self.session.execute(
+                db.select(*SEASON_SERIALIZER.columns(season))
+                .where(season.series_id.in_(by_series))
+                .order_by(season.series_id, season.number)
+            ).all()
+            for row in seasons:
+                by_series[row.series_id]["seasons"].append(SEASON_SERIALIZER.from_row(row))
+        return items
+
+    def list_series(self, include_seasons: bool = False) -> list[dict]:
         """Retorna la lista de series disponibles."""
-        # TODO: consultar las series existentes y devolverlas serializadas.
-        items = self.session.execute(db.select(self.series_model)).scalars().all()
-        return [s.to_dict() for s in items]
+        rows = self.session.execute(self._select_columns()).all()
+        return self._serialize_rows(rows, include_seasons)
+
+    def list_series_page(self, cursor: str | None, limit: int, include_seasons: bool = False) -> dict:
+        """Retorna una pagina de series ordenada por (created_at, id)."""
+        rows, next_cursor = keyset_page(
+            self.session,
+            self._select_columns(),
+            self.series_model.created_at,
+            self.series_model.id,
+            cursor,
+            limit,
+        )
+        return {"items": self._serialize_rows(rows, include_seasons), "next_cursor": next_cursor}
+
+    def iter_series(self, batch_size: int, include_seasons: bool = False) -> Iterator[dict]:
+        """Recorre todas las series trayendolas de a ``batch_size`` filas.
+
+        Con ``include_seasons`` agrega las temporadas con una consulta por
+        lote. Es un generador: la consulta se ejecuta al empezar a
+        recorrerlo, ya dentro del contexto de la respuesta en streaming.
+        """
+        result = self.session.execute(
+            self._select_columns()
+            .order_by(self.series_model.created_at, self.series_model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for rows in result.partitions():
+            yield from self._serialize_rows(rows, include_seasons)
 
-    def create_series(self, payload: dict) -> dict:
-        """Crea una nueva serie."""
-        # TODO: validar payload (titulo, temporadas, etc.) y persistir la serie.
+    def validate_create(self, payload: dict) -> dict:
+        """Valida el payload de alta y devuelve los valores de las columnas."""
         if not isinstance(payload, dict):
             raise BadRequest("El cuerpo de la solicitud debe ser un objeto JSON.")
 
@@ -41,10 +102,11 @@ class SeriesService:
             if not isinstance(total_seasons, int) or total_seasons < 1:
                 raise BadRequest("total_seasons debe ser un entero >= 1")
 
-        serie = self.series_model(
-            title=title.strip(),
-            total_seasons=total_seasons,
-        )
+        return {"title": title.strip(), "total_seasons": total_seasons}
+
+    def create_series(self, payload: dict) -> dict:
+        """Crea una nueva serie."""
+        serie = self.series_model(**self.validate_create(payload))
         self.session.add(serie)
         try:
             self.session.commit()
@@ -53,13 +115,36 @@ class SeriesService:
             raise
         return serie.to_dict()
 
+    def bulk_create_series(self, lines, batch_size: int | None = None) -> dict:
+        """Importa series desde lineas NDJSON ya decodificadas, por lotes."""
+        return bulk_insert(self.session, self.series_model.__table__, lines, self.validate_create, batch_size)
+
+    def _load_series(self, series_id: int) -> tuple[Validators, dict]:
+        """Validadores y detalle (con temporadas) de una serie, a traves del cache."""
+
+        def load() -> tuple[Validators, dict]:
+            serie = self.session.get(
+                self.series_model,
+                series_id,
+                options=[selectinload(self.series_model.seasons)],
+            )
+            if not serie:
+                raise NotFound(f"Serie con id {series_id} no encontrada")
+            etag = weak_etag("series", serie.id, serie.version, serie.updated_at)
+            return (etag, serie.updated_at), serie.to_dict(include_seasons=True)
+
+        return self.cache.get_or_set(("series", series_id), load)
+
     def get_series(self, series_id: int) -> dict:
         """Obtiene una serie y sus temporadas asociadas."""
         # TODO: recuperar el registro y manejar la ausencia del recurso.
-        serie = self.session.get(self.series_model, series_id)
-        if not serie:
-            raise NotFound(f"Serie con id {series_id} no encontrada")
-        return serie.to_dict(include_seasons=True)
+        return dict(self._load_series(series_id)[1])
+
+    def series_detail(self, series_id: int) -> tuple[Validators, dict]:
+        """Validadores y detalle de una serie con una sola lectura; los cambios
+        de temporadas tambien incrementan la version de la serie."""
+        validators, detail = self._load_series(series_id)
+        return validators, dict(detail)
 
     def update_series(self, series_id: int, payload: dict) -> dict:
         """Actualiza los campos permitidos de una serie."""
@@ -67,7 +152,11 @@ class SeriesService:
         if not isinstance(payload, dict):
             raise BadRequest("El cuerpo de la solicitud debe ser un objeto JSON.")
 
-        serie = self.session.get(self.series_model, series_id)
+        serie = self.session.get(
+            self.series_model,
+            series_id,
+            options=[selectinload(self.series_model.seasons)],
+        )
         if not serie:
             raise NotFound(f"Serie con id {series_id} no encontrada")
 
@@ -94,6 +183,7 @@ class SeriesService:
         except Exception:
             self.session.rollback()
             raise
+        self.cache.invalidate(("series", series_id))
         return serie.to_dict(include_seasons=True)
 
     def delete_series(self, series_id: int) -> None:
@@ -102,12 +192,23 @@ class SeriesService:
         serie = self.session.get(self.series_model, series_id)
         if not serie:
             raise NotFound(f"Serie con id {series_id} no encontrada")
-        self.session.delete(serie)
         try:
+            # Las entradas de la serie se borran en cascada
+            self.stats.remove_entries(WatchEntry.content_type == "series", WatchEntry.series_id == series_id)
+            record_tombstones(self.session, WatchEntry.content_type == "series", WatchEntry.series_id == series_id)
+            # Las temporadas no se cargan (passive_deletes) y SQLite no aplica
+            # el ON DELETE CASCADE sin PRAGMA foreign_keys: se borran aca
+            self.session.execute(
+                db.delete(self.season_model)
+                .where(self.season_model.series_id == series_id)
+                .execution_options(synchronize_session=False)
+            )
+            self.session.delete(serie)
             self.session.commit()
         except Exception:
             self.session.rollback()
             raise
+        self.cache.invalidate(("series", series_id))
 
     def add_season(self, series_id: int, payload: dict) -> dict:
         """Agrega una temporada a una serie existente."""
@@ -147,24 +248,122 @@ class SeriesService:
         # Mantener total_seasons como max(number, total_seasons)
         if number > (serie.total_seasons or 0):
             serie.total_seasons = number
+        # Total desnormalizado: incremento atomico en la misma transaccion
+        serie.total_episodes = self.series_model.total_episodes + episodes_count
+
+        try:
+            self._refresh_entry_percentages(series_id)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        self.cache.invalidate(("series", series_id))
+        return season.to_dict()
+
+    def _refresh_entry_percentages(self, series_id: int) -> None:
+        """Recalcula ``WatchEntry.percentage`` de las entradas que usan el total de la serie.
+
+        Se ejecuta dentro de la transaccion que cambio ``total_episodes``; las
+        entradas con total propio no dependen del catalogo y no se tocan.
+        """
+        entry = WatchEntry
+        series_total = (
+            db.select(self.series_model.total_episodes)
+            .where(self.series_model.id == entry.series_id)
+            .scalar_subquery()
+        )
+        self.session.execute(
+            db.update(entry)
+            .where(
+                entry.content_type == "series",
+                entry.series_id == series_id,
+                entry.total_episodes.is_(None),
+            )
+            .values(percentage=percentage_expression(series_total, entry.watched_episodes, entry.status))
+            .execution_options(synchronize_session=False)
+        )
+
+    def _get_season(self, series_id: int, number: int):
+        """Busca la temporada ``number`` de una serie o lanza 404."""
+        season = self.session.execute(
+            db.select(self.season_model).where(
+                self.season_model.series_id == series_id,
+                self.season_model.number == number,
+            )
+        ).scalars().first()
+        if not season:
+            raise NotFound(f"Temporada {number} no encontrada para la serie {series_id}")
+        return season
+
+    def update_season(self, series_id: int, number: int, payload: dict) -> dict:
+        """Actualiza la cantidad de episodios de una temporada."""
+        if not isinstance(payload, dict):
+            raise BadRequest("El cuerpo de la solicitud debe ser un objeto JSON.")
+
+        season = self._get_season(series_id, number)
+
+        if "episodes_count" in payload:
+            episodes_count = payload.get("episodes_count")
+            if not isinstance(episodes_count, int) or episodes_count < 0:
+                raise BadRequest("episodes_count debe ser un entero >= 0")
+            delta = episodes_count - (season.episodes_count or 0)
+            season.episodes_count = episodes_count
+            if delta:
+                self.session.execute(
+                    db.update(self.series_model)
+                    .where(self.series_model.id == series_id)
+                    .values(total_episodes=self.series_model.total_episodes + delta)
+                )
+                self._refresh_entry_percentages(series_id)
 
         try:
             self.session.commit()
         except Exception:
             self.session.rollback()
             raise
+        self.cache.invalidate(("series", series_id))
         return season.to_dict()
 
+    def delete_season(self, series_id: int, number: int) -> None:
+        """Elimina una temporada y descuenta sus episodios del total de la serie."""
+        season = self._get_season(series_id, number)
+        episodes_count = season.episodes_count or 0
+        self.session.delete(season)
+        # Siempre se actualiza la serie para que su version refleje el cambio
+        self.session.execute(
+            db.update(self.series_model)
+            .where(self.series_model.id == series_id)
+            .values(total_episodes=self.series_model.total_episodes - episodes_count)
+        )
+        try:
+            self._refresh_entry_percentages(series_id)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        self.cache.invalidate(("series", series_id))
+
 
 service = SeriesService()
 
 
 @bp.get("/")
 def list_series():
-    """Devuelve todas las series registradas."""
-    # TODO: invocar service.list_series y devolver respuesta paginada si aplica.
+    """Devuelve las series paginadas por cursor (``?all=1`` devuelve todas).
+
+    ``?include_seasons=1`` agrega las temporadas de cada serie con una sola
+    consulta adicional (una por lote en streaming). ``?stream=1`` o
+    ``Accept: application/x-ndjson`` exportan todas las series en streaming.
+    """
+    include_seasons = request.args.get("include_seasons", "").lower() in {"1", "true", "yes"}
     try:
-        return jsonify(service.list_series()), 200
+        fmt = stream_format(request)
+        if fmt:
+            return stream_response(service.iter_series(yield_per(), include_seasons), fmt)
+        if wants_all(request.args):
+            return jsonify(service.list_series(include_seasons)), 200
+        cursor, limit = parse_page_args(request.args)
+        return jsonify(service.list_series_page(cursor, limit, include_seasons)), 200
     except BadRequest as br:
         return jsonify({"detail": str(br)}), 400
 
@@ -181,12 +380,22 @@ def create_series():
         return jsonify({"detail": str(br)}), 400
 
 
+@bp.post("/bulk")
+def bulk_create_series():
+    """Importa series desde un cuerpo NDJSON (un objeto JSON por linea)."""
+    if request.mimetype not in NDJSON_MIMETYPES:
+        return jsonify({"detail": "Content-Type debe ser application/x-ndjson"}), 415
+    report = service.bulk_create_series(iter_ndjson(request.stream))
+    return jsonify(report), 200
+
+
 @bp.get("/<int:series_id>")
 def retrieve_series(series_id: int):
-    """Devuelve los detalles de una serie."""
+    """Devuelve los detalles de una serie (304 si el cliente ya tiene la version actual)."""
     # TODO: invocar service.get_series y construir respuesta con temporadas.
     try:
-        return jsonify(service.get_series(series_id)), 200
+        validators, detail = service.series_detail(series_id)
+        return conditional_json(request, validators, lambda: detail)
     except NotFound as nf:
         return jsonify({"detail": str(nf)}), 404
 
@@ -227,3 +436,25 @@ def add_season(series_id: int):
         return jsonify({"detail": str(nf)}), 404
     except BadRequest as br:
         return jsonify({"detail": str(br)}), 400
+
+
+@bp.put("/<int:series_id>/seasons/<int:number>")
+def update_season(series_id: int, number: int):
+    """Actualiza una temporada de una serie."""
+    payload = request.get_json(silent=True) or {}
+    try:
+        return jsonify(service.update_season(series_id, number, payload)), 200
+    except NotFound as nf:
+        return jsonify({"detail": str(nf)}), 404
+    except BadRequest as br:
+        return jsonify({"detail": str(br)}), 400
+
+
+@bp.delete("/<int:series_id>/seasons/<int:number>")
+def delete_season(series_id: int, number: int):
+    """Elimina una temporada de una serie."""
+    try:
+        service.delete_season(series_id, number)
+        return "", 204
+    except NotFound as nf:
+        return jsonify({"detail": str(nf)}), 404
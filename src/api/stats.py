@@ -0,0 +1,104 @@
+"""Mantenimiento incremental de ``UserStats`` dentro de las transacciones de escritura.
+
+Los servicios calculan el aporte de cada entrada antes y despues del cambio
+y aplican la diferencia con un ``UPDATE ... SET col = col + delta`` antes de
+su commit, asi la lectura de ``GET /me/stats`` es una sola fila sin importar
+el tamano de la watchlist.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy.exc import IntegrityError
+
+from src.extensions import db
+from src.models import UserStats, WatchEntry
+from src.models.user_stats import STATS_COUNTERS
+
+
+class UserStatsService:
+    """Aplica deltas a los contadores por usuario; no confirma transacciones."""
+
+    def __init__(self, session=None, stats_model=None, entry_model=None) -> None:
+        self.session = session or db.session
+        self.stats_model = stats_model or UserStats
+        self.entry_model = entry_model or WatchEntry
+
+    def _aggregate_columns(self) -> list:
+        """Contadores calculados desde cero sobre ``watch_entries``."""
+        entry = self.entry_model
+
+        def count_if(condition):
+            return db.func.coalesce(db.func.sum(db.case((condition, 1), else_=0)), 0)
+
+        return [
+            db.func.count(entry.id),
+            count_if(entry.content_type == "movie"),
+            count_if(entry.content_type == "series"),
+            count_if(entry.status == "watching"),
+            count_if(entry.status == "completed"),
+            count_if(entry.status == "paused"),
+            db.func.coalesce(
+                db.func.sum(db.case((entry.content_type == "series", db.func.coalesce(entry.watched_episodes, 0)), else_=0)),
+                0,
+            ),
+        ]
+
+    def apply_delta(self, user_id: int, delta: dict[str, int]) -> None:
+        """Suma ``delta`` a la fila del usuario, creandola si todavia no existe.
+
+        La fila nueva se calcula desde cero con las entradas ya enviadas a la
+        base, que incluyen el cambio en curso; si otra transaccion la crea al
+        mismo tiempo se reintenta el ``UPDATE``.
+        """
+        if not delta:
+            return
+        if self._update(user_id, delta):
+            return
+        self.session.flush()
+        try:
+            with self.session.begin_nested():
+                self.session.execute(
+                    db.insert(self.stats_model).from_select(
+                        ["user_id", *STATS_COUNTERS],
+                        db.select(db.literal(user_id), *self._aggregate_columns()).where(
+                            self.entry_model.user_id == user_id
+                        ),
+                    )
+                )
+        except IntegrityError:
+            self._update(user_id, delta)
+
+    def _update(self, user_id: int, delta: dict[str, int]) -> bool:
+        stats = self.stats_model
+        values = {name: getattr(stats, name) + value for name, value in delta.items()}
+        result = self.session.execute(
+            db.update(stats).where(stats.user_id == user_id).values(**values, updated_at=db.func.now())
+        )
+        return result.rowcount > 0
+
+    def remove_entries(self, *criteria) -> None:
+        """Descuenta las entradas que cumplen ``criteria`` antes de borrarlas.
+
+        Agrupa por usuario y descuenta con un ``UPDATE`` por lote, para los
+        borrados de catalogo que arrastran entradas de muchos usuarios.
+        """
+        entry, table = self.entry_model, self.stats_model.__table__
+        rows = self.session.execute(
+            db.select(entry.user_id, *self._aggregate_columns()).where(*criteria).group_by(entry.user_id)
+        ).all()
+        if not rows:
+            return
+        params = [
+            {"uid": row[0], **{f"d_{name}": value for name, value in zip(STATS_COUNTERS, row[1:])}}
+            for row in rows
+        ]
+        # Sentencia Core: executemany con un juego de parametros por usuario
+        self.session.execute(
+            db.update(table)
+            .where(table.c.user_id == db.bindparam("uid"))
+            .values(
+                **{name: table.c[name] - db.bindparam(f"d_{name}") for name in STATS_COUNTERS},
+                updated_at=db.func.now(),
+            ),
+            params,
+        )
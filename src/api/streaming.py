@@ -0,0 +1,64 @@
+"""Respuestas en streaming para exportar listados completos."""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+from flask import Request, Response, current_app, stream_with_context
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+DEFAULT_YIELD_PER = 1000
+
+
+def stream_format(req: Request) -> str | None:
+    """Determina si el cliente pidio un listado en streaming y en que formato.
+
+    ``Accept: application/x-ndjson`` o ``?stream=ndjson`` devuelven NDJSON;
+    ``?stream=1`` devuelve el mismo arreglo JSON que ``?all=1`` pero emitido
+    fila a fila. Devuelve ``None`` si no se pidio streaming.
+    """
+    stream = req.args.get("stream", "").lower()
+    if stream == "ndjson":
+        return "ndjson"
+    if stream in {"1", "true", "yes", "json"}:
+        return "json"
+    if req.accept_mimetypes.best == NDJSON_MIMETYPE:
+        return "ndjson"
+    return None
+
+
+def yield_per() -> int:
+    """Cantidad de filas que se traen de la base por cada lote del cursor."""
+    return current_app.config.get("STREAM_YIELD_PER", DEFAULT_YIELD_PER)
+
+
+def _ndjson(items: Iterable[dict]) -> Iterator[str]:
+    dumps = current_app.json.dumps
+    for item in items:
+        yield dumps(item) + "\n"
+
+
+def _json_array(items: Iterable[dict]) -> Iterator[str]:
+    dumps = current_app.json.dumps
+    yield "["
+    first = True
+    for item in items:
+        if first:
+            first = False
+            yield dumps(item)
+        else:
+            yield "," + dumps(item)
+    yield "]"
+
+
+def stream_response(items: Iterable[dict], fmt: str) -> Response:
+    """Construye una respuesta que serializa y envia cada fila al recorrerla.
+
+    ``items`` debe ser perezoso (por ejemplo un generador con ``yield_per``)
+    para que la memoria del worker no dependa del tamano de la tabla.
+    """
+    if fmt == "ndjson":
+        body, mimetype = _ndjson(items), NDJSON_MIMETYPE
+    else:
+        body, mimetype = _json_array(items), "application/json"
+    return Response(stream_with_context(body), mimetype=mimetype)
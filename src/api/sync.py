@@ -0,0 +1,113 @@
+"""Sincronizacion incremental de la watchlist: tokens, tombstones y compactacion.
+
+El token de ``GET /me/watchlist/changes`` guarda dos marcas ``(fecha, id)``:
+la ultima entrada (por ``updated_at``) y el ultimo tombstone (por
+``deleted_at``) ya entregados. Una transaccion puede confirmarse despues de
+que otra con una fecha posterior ya fue leida, por eso la marca nunca avanza
+mas alla de ``ahora - WATCHLIST_SYNC_SAFETY_SECONDS``: los cambios de esa
+ventana se reenvian en la siguiente consulta y el cliente los aplica por id.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_
+from werkzeug.exceptions import BadRequest
+
+from src.api.conditional import as_utc
+from src.extensions import db
+from src.models import WatchEntry, WatchEntryTombstone
+
+DEFAULT_SAFETY_SECONDS = 5.0
+DEFAULT_RETENTION_DAYS = 30
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+Watermark = tuple[datetime, int]
+
+
+def encode_sync_token(entries: Watermark, deleted: Watermark) -> str:
+    """Token opaco con las marcas de entradas y de tombstones."""
+    raw = json.dumps(
+        [entries[0].isoformat(), entries[1], deleted[0].isoformat(), deleted[1]],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_sync_token(token: str) -> tuple[Watermark, Watermark]:
+    """Recupera las marcas de un token de ``encode_sync_token``."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        entries_at, entries_id, deleted_at, deleted_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        entries = (as_utc(datetime.fromisoformat(entries_at)), entries_id)
+        deleted = (as_utc(datetime.fromisoformat(deleted_at)), deleted_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise BadRequest("token invalido") from None
+    if not all(isinstance(item_id, int) and not isinstance(item_id, bool) for item_id in (entries[1], deleted[1])):
+        raise BadRequest("token invalido")
+    return entries, deleted
+
+
+def after(column, id_column, mark: Watermark):
+    """Filas con clave ``(column, id)`` posterior a ``mark``."""
+    at, item_id = mark
+    return or_(column > at, and_(column == at, id_column > item_id))
+
+
+def advance(previous: Watermark, last: Watermark | None, has_more: bool, horizon: datetime) -> Watermark:
+    """Nueva marca tras entregar filas hasta ``last``.
+
+    Si quedan filas se continua desde ``last``; si no, la marca se limita a
+    ``horizon`` para volver a mirar la ventana de seguridad. Una consulta sin
+    filas tambien avanza hasta ``horizon``: si no, la marca de tombstones de
+    un cliente sin eliminaciones quedaria atras de la retencion y recibiria 410.
+    """
+    if last is None:
+        return max(previous, (horizon, 0))
+    last = (as_utc(last[0]), last[1])
+    if has_more:
+        return last
+    return max(previous, min(last, (horizon, 0)))
+
+
+def sync_horizon(app_config) -> datetime:
+    """Limite hasta el que los cambios ya se consideran confirmados."""
+    seconds = app_config.get("WATCHLIST_SYNC_SAFETY_SECONDS", DEFAULT_SAFETY_SECONDS)
+    return datetime.now(timezone.utc) - timedelta(seconds=seconds)
+
+
+def retention_limit(app_config) -> datetime:
+    """Fecha desde la que se conservan tombstones."""
+    days = app_config.get("WATCHLIST_TOMBSTONE_RETENTION_DAYS", DEFAULT_RETENTION_DAYS)
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+def record_tombstones(session, *criteria) -> None:
+    """Registra tombstones de las entradas que cumplen ``criteria`` antes de borrarlas."""
+    entry = WatchEntry
+    session.execute(
+        db.insert(WatchEntryTombstone).from_select(
+            ["user_id", "entry_id", "content_type", "content_id", "deleted_at"],
+            db.select(
+                entry.user_id,
+                entry.id,
+                entry.content_type,
+                entry.content_id,
+                db.literal(datetime.now(timezone.utc), db.DateTime(timezone=True)),
+            ).where(*criteria),
+        )
+    )
+
+
+def compact_tombstones(session, older_than: datetime) -> int:
+    """Borra los tombstones anteriores a ``older_than``; devuelve cuantos."""
+    result = session.execute(
+        db.delete(WatchEntryTombstone)
+        .where(WatchEntryTombstone.deleted_at < older_than)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    return result.rowcount
@@ -0,0 +1,202 @@
+"""Modo ASGI: la misma aplicacion Flask sobre un engine asyncio de SQLAlchemy.
+
+Cada solicitud se ejecuta completa (blueprints, servicios y serializacion)
+dentro de ``AsyncSession.run_sync``: el codigo sincronico de los servicios
+usa una ``Session`` cuyas consultas se esperan sobre aiosqlite/asyncpg, de
+modo que mientras una solicitud espera a la base el event loop atiende
+otras. El envio del cuerpo tambien es asincronico, incluidas las respuestas
+en streaming.
+
+El cuerpo de la solicitud se lee completo antes de despachar; las
+importaciones NDJSON muy grandes conviene hacerlas contra el modo WSGI.
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+from typing import Any, Awaitable, Callable
+
+from flask import Flask
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.util import await_only
+
+from src import create_app
+from src.extensions import db
+from src.instrumentation import instrument_engine
+from src.query_debug import debug_engine
+from src.sqlite_tuning import configure_engine
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+}
+
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+
+def async_database_url(url: str) -> str:
+    """Traduce la URL sincronica al driver asyncio equivalente."""
+    scheme, _, rest = url.partition("://")
+    driver = ASYNC_DRIVERS.get(scheme.split("+", 1)[0])
+    if driver is None:
+        raise RuntimeError(f"No hay driver asyncio configurado para {scheme!r}")
+    return f"{driver}://{rest}"
+
+
+def _engine_options(app: Flask) -> dict:
+    """Opciones del engine sincronico que aplican tambien al asyncio."""
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    # El pool instrumentado y la conexion con lock son del driver sqlite3/psycopg
+    options.pop("poolclass", None)
+    options.pop("connect_args", None)
+    return options
+
+
+def build_environ(scope: dict, body: bytes) -> dict:
+    """Construye el environ WSGI de una solicitud HTTP ASGI."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ: dict[str, Any] = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").lower()
+        value = raw_value.decode("latin-1")
+        if name == "content-type":
+            environ["CONTENT_TYPE"] = value
+        elif name != "content-length":
+            key = "HTTP_" + name.upper().replace("-", "_")
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class _Responder:
+    """``start_response`` WSGI que envia por ASGI desde el greenlet de ``run_sync``.
+
+    Retiene el ultimo fragmento para que una respuesta de un solo bloque
+    salga en un unico mensaje con ``more_body=False``.
+    """
+
+    def __init__(self, send: Send) -> None:
+        self.send = send
+        self.status = 500
+        self.headers: list[tuple[bytes, bytes]] = []
+        self.started = False
+        self.pending: bytes | None = None
+
+    def start_response(self, status: str, headers: list[tuple[str, str]], exc_info=None):
+        if exc_info is not None and self.started:
+            raise exc_info[1].with_traceback(exc_info[2])
+        self.status = int(status.split(" ", 1)[0])
+        self.headers = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+        return self.write
+
+    def _emit(self, body: bytes, more_body: bool) -> None:
+        if not self.started:
+            await_only(self.send({"type": "http.response.start", "status": self.status, "headers": self.headers}))
+            self.started = True
+        await_only(self.send({"type": "http.response.body", "body": body, "more_body": more_body}))
+
+    def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        if self.pending is not None:
+            self._emit(self.pending, True)
+        self.pending = chunk
+
+    def finish(self) -> None:
+        self._emit(self.pending or b"", False)
+
+
+class AsyncWatchlogApp:
+    """Aplicacion ASGI que despacha a ``flask_app`` con sesiones asyncio."""
+
+    def __init__(self, flask_app: Flask, engine: AsyncEngine) -> None:
+        self.flask_app = flask_app
+        self.engine = engine
+        self.sessionmaker = async_sessionmaker(engine)
+
+    async def __call__(self, scope: dict, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            raise RuntimeError(f"Tipo de conexion ASGI no soportado: {scope['type']}")
+        body = await self._read_body(receive)
+        environ = build_environ(scope, body)
+        async with self.sessionmaker() as session:
+            await session.run_sync(self._dispatch, environ, send)
+
+    def _dispatch(self, session, environ: dict, send: Send) -> None:
+        """Ejecuta la solicitud WSGI con ``session`` como ``db.session``.
+
+        La solicitud reutiliza el app context empujado aqui, por lo que el
+        registro de ``db.session`` apunta a ``session`` y el teardown de
+        Flask-SQLAlchemy la cierra al terminar.
+        """
+        responder = _Responder(send)
+        with self.flask_app.app_context():
+            db.session.registry.set(session)
+            iterable = self.flask_app.wsgi_app(environ, responder.start_response)
+            try:
+                for chunk in iterable:
+                    responder.write(chunk)
+            finally:
+                close = getattr(iterable, "close", None)
+                if close is not None:
+                    close()
+            responder.finish()
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def create_asgi_app(config_object) -> AsyncWatchlogApp:
+    """Crea la aplicacion Flask y la envuelve con un engine asyncio."""
+    flask_app = create_app(config_object)
+    engine = create_async_engine(
+        async_database_url(flask_app.config["SQLALCHEMY_DATABASE_URI"]),
+        **_engine_options(flask_app),
+    )
+    configure_engine(flask_app, engine.sync_engine)
+    if flask_app.config.get("REQUEST_METRICS_ENABLED", True):
+        instrument_engine(engine.sync_engine)
+    debug_engine(flask_app, engine.sync_engine)
+    return AsyncWatchlogApp(flask_app, engine)
@@ -0,0 +1,382 @@
+"""Cache de lecturas de catalogo: L1 en proceso (TTL + LRU) y L2 compartido opcional."""
+
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from time import monotonic
+from typing import Any, Callable, Hashable
+
+from flask import Flask, current_app
+
+from src.cache_backends import SharedBackend, backend_from_url
+
+EXTENSION_KEY = "watchlog_cache"
+DEFAULT_TTL = 60
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_MISSING = object()
+# Marcas de los tipos que JSON no distingue, para recuperarlos al leer del L2
+_TUPLE_TAG = "__tuple__"
+_DATETIME_TAG = "__datetime__"
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(key: Hashable) -> str:
+    """Clave de texto comun a L1 y L2: ``("movie", 1)`` -> ``"movie:1"``."""
+    if isinstance(key, str):
+        return key
+    return ":".join(str(part) for part in key)
+
+
+def approx_size(value: Any) -> int:
+    """Tamano aproximado en bytes de un valor JSON (dicts, listas, escalares)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(approx_size(item) for item in value)
+    return size
+
+
+class LocalCache:
+    """Diccionario LRU con expiracion por TTL y limite de entradas y de memoria.
+
+    Es seguro entre hilos: todas las operaciones toman el mismo lock. Los
+    valores guardados se comparten entre solicitudes y no deben modificarse.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[Hashable, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Cambia con cada invalidacion; ver get_or_set
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _pop(self, key: Hashable) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Devuelve el valor vigente de ``key`` y lo marca como recien usado."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            expires_at, _, value = item
+            if expires_at <= monotonic():
+                self._pop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, epoch: int | None = None) -> bool:
+        """Guarda ``value``; con ``epoch`` solo si no hubo invalidaciones desde entonces."""
+        size = approx_size(value)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            if epoch is not None and epoch != self._epoch:
+                return False
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (monotonic() + self.ttl, size, value)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+            return True
+
+    def delete(self, *keys: Hashable) -> None:
+        """Invalida ``keys``; las cargas en curso no podran guardar su resultado."""
+        with self._lock:
+            self._epoch += 1
+            for key in keys:
+                if key in self._data:
+                    self._pop(key)
+                    self.invalidations += 1
+
+    @property
+    def epoch(self) -> int:
+        """Contador de invalidaciones; se captura antes de una carga."""
+        with self._lock:
+            return self._epoch
+
+    def clear(self) -> None:
+        """Vacia el cache."""
+        with self._lock:
+            self._epoch += 1
+            self._data.clear()
+            self._bytes = 0
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Lectura a traves del cache: si ``key`` no esta, la carga con ``loader``.
+
+        Si otra solicitud invalida algo mientras ``loader`` consulta la base, el
+        resultado se devuelve pero no se guarda, para no cachear datos previos
+        a esa escritura.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        epoch = self.epoch
+        value = loader()
+        self.set(key, value, epoch)
+        return value
+
+    def stats(self) -> dict:
+        """Contadores de uso para monitoreo."""
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+def _tag(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _tag(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_tag(item) for item in value]
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_tag(item) for item in value]}
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    return value
+
+
+def _untag(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1:
+            if _TUPLE_TAG in value:
+                return tuple(_untag(item) for item in value[_TUPLE_TAG])
+            if _DATETIME_TAG in value:
+                return datetime.fromisoformat(value[_DATETIME_TAG])
+        return {key: _untag(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_untag(item) for item in value]
+    return value
+
+
+class JSONCodec:
+    """Serializa los valores del L2 como JSON, conservando tuplas y fechas.
+
+    Los valores del L2 los puede escribir cualquiera con acceso al Redis o al
+    archivo compartido, por eso no se usa pickle. ``dumps``/``loads`` son los
+    del proveedor JSON de la aplicacion (orjson si esta instalado).
+    """
+
+    def __init__(self, dumps: Callable[[Any], str] = json.dumps, loads: Callable[[str | bytes], Any] = json.loads) -> None:
+        self._dumps = dumps
+        self._loads = loads
+
+    def dumps(self, value: Any) -> bytes:
+        return self._dumps(_tag(value)).encode("utf-8")
+
+    def loads(self, raw: bytes) -> Any:
+        return _untag(self._loads(raw))
+
+
+class TieredCache:
+    """L1 ``LocalCache`` delante de un ``SharedBackend`` opcional.
+
+    Antes de cada lectura se aplican al L1 las invalidaciones publicadas por
+    otros workers. Si el L2 falla, se registra el error y se sigue como si no
+    existiera: el cache nunca hace fallar una solicitud.
+    """
+
+    def __init__(self, local: LocalCache, shared: SharedBackend | None = None, codec: JSONCodec | None = None) -> None:
+        self.local = local
+        self.shared = shared
+        self.codec = codec or JSONCodec()
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.l2_errors = 0
+        self.remote_invalidations = 0
+
+    def _shared_call(self, method: str, *args: Any, default: Any = None) -> Any:
+        try:
+            return getattr(self.shared, method)(*args)
+        except Exception:
+            self.l2_errors += 1
+            logger.warning("cache L2 (%s) fallo en %s", self.shared.name, method, exc_info=True)
+            return default
+
+    def _sync(self) -> None:
+        keys = self._shared_call("poll", default=[])
+        if keys:
+            self.local.delete(*keys)
+            self.remote_invalidations += len(keys)
+
+    def _get_shared(self, key: str, epoch: int) -> Any:
+        raw = self._shared_call("get", key)
+        if raw is None:
+            self.l2_misses += 1
+            return _MISSING
+        try:
+            value = self.codec.loads(raw)
+        except ValueError:
+            # Valor ilegible (por ejemplo, pickle de una version anterior): se recarga
+            self.l2_errors += 1
+            return _MISSING
+        self.l2_hits += 1
+        self.local.set(key, value, epoch)
+        return value
+
+    def _set_shared(self, key: str, value: Any, generation: int) -> None:
+        raw = self.codec.dumps(value)
+        self._shared_call("set", key, raw, self.local.ttl, generation)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Busca ``key`` en L1 y luego en L2."""
+        if self.shared is None:
+            return self.local.get(key, default)
+        self._sync()
+        value = self.local.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._get_shared(key, self.local.epoch)
+        return default if value is _MISSING else value
+
+    def set(self, key: str, value: Any) -> None:
+        """Guarda ``value`` en ambos niveles."""
+        self.local.set(key, value)
+        if self.shared is not None:
+            generation = self._shared_call("generation", key)
+            if generation is not None:
+                self._set_shared(key, value, generation)
+
+    def get_or_set(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Lectura a traves de L1 y L2; ver ``LocalCache.get_or_set``.
+
+        La generacion de la clave en L2 se lee antes de ``loader``, asi una
+        carga que se cruza con una escritura de otro worker no llega al L2.
+        """
+        if self.shared is None:
+            return self.local.get_or_set(key, loader)
+        self._sync()
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        epoch = self.local.epoch
+        value = self._get_shared(key, epoch)
+        if value is not _MISSING:
+            return value
+        generation = self._shared_call("generation", key)
+        value = loader()
+        self.local.set(key, value, epoch)
+        if generation is not None:
+            self._set_shared(key, value, generation)
+        return value
+
+    def delete(self, *keys: str) -> None:
+        """Invalida ``keys`` en este worker y las publica para los demas."""
+        self.local.delete(*keys)
+        if self.shared is not None:
+            self._shared_call("invalidate", list(keys))
+
+    def stats(self) -> dict:
+        """Contadores de L1 y, si hay, de L2."""
+        data = self.local.stats()
+        if self.shared is not None:
+            data["l2"] = {
+                "backend": self.shared.name,
+                "hits": self.l2_hits,
+                "misses": self.l2_misses,
+                "errors": self.l2_errors,
+                "remote_invalidations": self.remote_invalidations,
+            }
+        return data
+
+
+class Cache:
+    """Extension de Flask que guarda un ``TieredCache`` por aplicacion.
+
+    Con ``CACHE_ENABLED`` en falso las lecturas van directo al ``loader``;
+    sin definir, el cache solo se activa si hay L2. Sin L2 el cache es solo
+    por proceso y entre workers de gunicorn la consistencia depende del TTL;
+    con L2 las escrituras se propagan a todos los workers.
+    """
+
+    def init_app(self, app: Flask, shared: SharedBackend | None = None) -> None:
+        """Crea el cache de ``app``; ``shared`` permite inyectar el backend L2."""
+        tiered = None
+        enabled = app.config.get("CACHE_ENABLED")
+        if enabled is None:
+            enabled = shared is not None or bool(app.config.get("CACHE_L2_URL"))
+        if enabled:
+            local = LocalCache(
+                ttl=app.config.get("CACHE_TTL", DEFAULT_TTL),
+                max_entries=app.config.get("CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+                max_bytes=app.config.get("CACHE_MAX_BYTES", DEFAULT_MAX_BYTES),
+            )
+            url = app.config.get("CACHE_L2_URL")
+            if shared is None and url:
+                shared = backend_from_url(
+                    url,
+                    origin=uuid.uuid4().hex,
+                    poll_interval=app.config.get("CACHE_L2_POLL_INTERVAL", 0.5),
+                )
+            tiered = TieredCache(local, shared, JSONCodec(app.json.dumps, app.json.loads))
+        app.extensions[EXTENSION_KEY] = tiered
+
+    @property
+    def backend(self) -> TieredCache | None:
+        """Cache de la aplicacion actual o ``None`` si esta deshabilitado."""
+        return current_app.extensions.get(EXTENSION_KEY)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Valor cacheado de ``key`` o ``default``."""
+        backend = self.backend
+        if backend is None:
+            return default
+        return backend.get(cache_key(key), default)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Guarda ``value`` en el cache."""
+        backend = self.backend
+        if backend is not None:
+            backend.set(cache_key(key), value)
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Ver ``TieredCache.get_or_set``."""
+        backend = self.backend
+        if backend is None:
+            return loader()
+        return backend.get_or_set(cache_key(key), loader)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Elimina ``keys`` del cache; llamar despues de confirmar la escritura."""
+        backend = self.backend
+        if backend is not None:
+            backend.delete(*(cache_key(key) for key in keys))
+
+    def stats(self) -> dict:
+        """Contadores del cache o ``{"enabled": False}``."""
+        backend = self.backend
+        if backend is None:
+            return {"enabled": False}
+        return {"enabled": True, **backend.stats()}
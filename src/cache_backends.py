@@ -0,0 +1,282 @@
+"""Backends compartidos (L2) del cache con invalidacion entre workers.
+
+Cada backend guarda valores ya serializados, lleva un numero de generacion
+por clave (que aumenta con cada invalidacion) y expone las invalidaciones
+publicadas por otros procesos para que cada worker limpie su L1.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from time import monotonic, time
+from urllib.parse import urlparse
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Las invalidaciones viejas solo sirven para comparar generaciones de cargas
+# en curso; pasado este tiempo se pueden borrar.
+INVALIDATION_RETENTION = 3600
+
+
+class SharedBackend(ABC):
+    """Interfaz comun de los backends L2.
+
+    ``origin`` identifica al proceso que publica una invalidacion, para no
+    volver a aplicarse las propias. Incluye el pid: con ``gunicorn --preload``
+    el backend se crea antes del fork y todos los workers lo heredan.
+    """
+
+    name = "shared"
+
+    def __init__(self, origin: str) -> None:
+        self._origin = origin
+
+    @property
+    def origin(self) -> str:
+        """Origen de las invalidaciones de este proceso."""
+        return f"{self._origin}-{os.getpid()}"
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Valor serializado vigente de ``key`` o ``None``."""
+
+    @abstractmethod
+    def generation(self, key: str) -> int:
+        """Generacion actual de ``key``; se lee antes de cargar el valor."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float, generation: int) -> bool:
+        """Guarda ``value`` solo si la generacion de ``key`` no cambio."""
+
+    @abstractmethod
+    def invalidate(self, keys: list[str]) -> None:
+        """Borra ``keys``, aumenta su generacion y avisa a los demas workers."""
+
+    @abstractmethod
+    def poll(self) -> list[str]:
+        """Claves invalidadas por otros procesos desde la ultima llamada."""
+
+    @abstractmethod
+    def ping(self) -> None:
+        """Verifica que el backend responde; lanza una excepcion si no."""
+
+
+class SQLiteBackend(SharedBackend):
+    """L2 en un archivo SQLite compartido por los workers de la misma maquina.
+
+    Las invalidaciones se registran en una tabla con id autoincremental; cada
+    worker consulta las nuevas como mucho una vez cada ``poll_interval``
+    segundos, que es la ventana maxima de lectura desactualizada de su L1.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, origin: str, poll_interval: float = 0.5) -> None:
+        super().__init__(origin)
+        self.path = path
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._poll_lock = threading.Lock()
+        self._next_poll = 0.0
+        self._last_id = self._connection().execute(
+            "SELECT coalesce(max(id), 0) FROM cache_invalidations"
+        ).fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexion propia de cada hilo (y de cada proceso tras un fork)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS cache_invalidations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL,
+                    origin TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_cache_invalidations_key
+                    ON cache_invalidations (key, id);
+                """
+            )
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key: str) -> bytes | None:
+        row = self._connection().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?",
+            (key, time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def generation(self, key: str) -> int:
+        return self._connection().execute(
+            "SELECT coalesce(max(id), 0) FROM cache_invalidations WHERE key = ?",
+            (key,),
+        ).fetchone()[0]
+
+    def set(self, key: str, value: bytes, ttl: float, generation: int) -> bool:
+        cursor = self._connection().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) "
+            "SELECT ?, ?, ? WHERE "
+            "(SELECT coalesce(max(id), 0) FROM cache_invalidations WHERE key = ?) = ?",
+            (key, value, time() + ttl, key, generation),
+        )
+        return cursor.rowcount > 0
+
+    def invalidate(self, keys: list[str]) -> None:
+        now = time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO cache_invalidations (key, origin, created_at) VALUES (?, ?, ?)",
+                [(key, self.origin, now) for key in keys],
+            )
+            conn.executemany("DELETE FROM cache_entries WHERE key = ?", [(key,) for key in keys])
+            conn.execute("DELETE FROM cache_invalidations WHERE created_at < ?", (now - INVALIDATION_RETENTION,))
+            conn.execute("DELETE FROM cache_entries WHERE expires_at < ?", (now,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def poll(self) -> list[str]:
+        now = monotonic()
+        if now < self._next_poll or not self._poll_lock.acquire(blocking=False):
+            return []
+        try:
+            self._next_poll = now + self.poll_interval
+            rows = self._connection().execute(
+                "SELECT id, key, origin FROM cache_invalidations WHERE id > ? ORDER BY id",
+                (self._last_id,),
+            ).fetchall()
+            if rows:
+                self._last_id = rows[-1][0]
+            return [key for _, key, origin in rows if origin != self.origin]
+        finally:
+            self._poll_lock.release()
+
+    def ping(self) -> None:
+        self._connection().execute("SELECT 1 FROM cache_invalidations LIMIT 1").fetchall()
+
+
+_REDIS_SET_IF_GENERATION = """
+local current = redis.call('GET', KEYS[2]) or '0'
+if current == ARGV[3] then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+class RedisBackend(SharedBackend):
+    """L2 en Redis; las invalidaciones se difunden por pub/sub.
+
+    Un hilo suscriptor (iniciado en cada proceso al primer uso, para que
+    sobreviva al fork de gunicorn) acumula las claves recibidas hasta el
+    proximo ``poll``. ``client`` permite usar un sustituto como fakeredis.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str | None, origin: str, prefix: str = "watchlog:cache:", client=None) -> None:
+        if client is None:
+            if redis is None:
+                raise RuntimeError("CACHE_L2_URL usa redis pero el paquete redis no esta instalado")
+            client = redis.Redis.from_url(url)
+        super().__init__(origin)
+        self.client = client
+        self.prefix = prefix
+        self.channel = f"{prefix}invalidations"
+        self._set_script = client.register_script(_REDIS_SET_IF_GENERATION)
+        self._pending: deque[str] = deque()
+        self._subscriber = None
+        self._subscriber_pid = None
+        self._subscriber_lock = threading.Lock()
+
+    def _value_key(self, key: str) -> str:
+        return f"{self.prefix}v:{key}"
+
+    def _generation_key(self, key: str) -> str:
+        return f"{self.prefix}g:{key}"
+
+    def _ensure_subscriber(self) -> None:
+        if self._subscriber_pid == os.getpid():
+            return
+        with self._subscriber_lock:
+            if self._subscriber_pid == os.getpid():
+                return
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self._on_message})
+            self._subscriber = pubsub.run_in_thread(sleep_time=0.5, daemon=True)
+            self._subscriber_pid = os.getpid()
+
+    def _on_message(self, message: dict) -> None:
+        data = message["data"]
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        origin, _, key = data.partition("|")
+        if origin != self.origin:
+            self._pending.append(key)
+
+    def get(self, key: str) -> bytes | None:
+        self._ensure_subscriber()
+        return self.client.get(self._value_key(key))
+
+    def generation(self, key: str) -> int:
+        return int(self.client.get(self._generation_key(key)) or 0)
+
+    def set(self, key: str, value: bytes, ttl: float, generation: int) -> bool:
+        keys = [self._value_key(key), self._generation_key(key)]
+        return bool(self._set_script(keys=keys, args=[value, int(ttl * 1000), str(generation)]))
+
+    def invalidate(self, keys: list[str]) -> None:
+        pipe = self.client.pipeline(transaction=True)
+        for key in keys:
+            pipe.incr(self._generation_key(key))
+            pipe.expire(self._generation_key(key), INVALIDATION_RETENTION)
+            pipe.delete(self._value_key(key))
+            pipe.publish(self.channel, f"{self.origin}|{key}")
+        pipe.execute()
+
+    def ping(self) -> None:
+        self.client.ping()
+
+    def poll(self) -> list[str]:
+        self._ensure_subscriber()
+        keys = []
+        while self._pending:
+            keys.append(self._pending.popleft())
+        return keys
+
+
+def backend_from_url(url: str, origin: str, poll_interval: float = 0.5) -> SharedBackend:
+    """Crea el backend L2 indicado por ``CACHE_L2_URL``.
+
+    ``redis://``/``rediss://`` usan Redis; ``sqlite:///ruta`` un archivo local.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme in {"redis", "rediss", "unix"}:
+        return RedisBackend(url, origin)
+    if parsed.scheme == "sqlite":
+        path = url[len("sqlite:///"):]
+        if not path:
+            raise RuntimeError("CACHE_L2_URL sqlite requiere una ruta: sqlite:///ruta/cache.db")
+        return SQLiteBackend(path, origin, poll_interval)
+    raise RuntimeError(f"CACHE_L2_URL no soportada: {url!r}")
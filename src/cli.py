@@ -0,0 +1,95 @@
+"""Comandos disponibles con ``flask --app wsgi <comando>`` o ``<grupo> <comando>``."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+
+from src.api.sync import compact_tombstones, retention_limit
+from src.extensions import db
+from src.seed import DEFAULT_CHUNK_SIZE, SeedPlan, Seeder, sync_sequences
+
+watchlist_cli = AppGroup("watchlist", help="Mantenimiento de las watchlists.")
+
+
+@watchlist_cli.command("compact-tombstones")
+@click.option("--days", type=int, default=None, help="Retencion en dias (por defecto WATCHLIST_TOMBSTONE_RETENTION_DAYS).")
+def compact_tombstones_command(days: int | None) -> None:
+    """Borra los tombstones de entradas eliminadas mas antiguos que la retencion.
+
+    Los clientes con un token anterior a la retencion reciben 410 en
+    ``GET /me/watchlist/changes`` y deben descargar la watchlist completa.
+    """
+    if days is None:
+        older_than = retention_limit(current_app.config)
+    else:
+        older_than = datetime.now(timezone.utc) - timedelta(days=days)
+    removed = compact_tombstones(db.session, older_than)
+    click.echo(f"{removed} tombstones eliminados (anteriores a {older_than.isoformat()})")
+
+
+@click.command("seed")
+@click.option("--users", type=int, default=10_000, show_default=True)
+@click.option("--movies", type=int, default=20_000, show_default=True)
+@click.option("--series", type=int, default=5_000, show_default=True)
+@click.option("--seasons", type=int, default=6, show_default=True, help="Maximo de temporadas por serie.")
+@click.option("--episodes", type=int, default=12, show_default=True, help="Maximo de episodios por temporada.")
+@click.option("--entries", type=int, default=1_000_000, show_default=True, help="Total de entradas de watchlist.")
+@click.option("--zipf", type=float, default=1.1, show_default=True, help="Exponente de popularidad y actividad.")
+@click.option("--max-per-user", type=int, default=5_000, show_default=True, help="Entradas maximas por usuario.")
+@click.option("--seed", "seed_value", type=int, default=0, show_default=True, help="Semilla del generador.")
+@click.option("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, show_default=True, help="Filas por lote.")
+@click.option("--reset", is_flag=True, help="Vacia antes las tablas del dataset.")
+def seed_command(
+    users: int,
+    movies: int,
+    series: int,
+    seasons: int,
+    episodes: int,
+    entries: int,
+    zipf: float,
+    max_per_user: int,
+    seed_value: int,
+    chunk_size: int,
+    reset: bool,
+) -> None:
+    """Carga un dataset sintetico determinista con popularidad zipf.
+
+    Las tablas tienen que estar vacias (o usar ``--reset``) porque los ids se
+    asignan desde 1. Ver ``src/seed.py``.
+    """
+    plan = SeedPlan(
+        users=users,
+        movies=movies,
+        series=series,
+        seasons=seasons,
+        episodes=episodes,
+        entries=entries,
+        zipf=zipf,
+        max_per_user=max_per_user,
+        seed=seed_value,
+        chunk_size=chunk_size,
+    )
+    with db.engine.connect() as connection:
+        try:
+            seeder = Seeder(connection, plan, echo=click.echo)
+        except ValueError as exc:
+            raise click.BadParameter(str(exc)) from None
+        if reset:
+            seeder.reset()
+        elif not seeder.is_empty():
+            raise click.ClickException("la base ya tiene datos; usar --reset para vaciarla")
+        started = perf_counter()
+        loaded = seeder.run()
+        sync_sequences(connection)
+    click.echo(f"{sum(loaded.values())} filas cargadas en {perf_counter() - started:.1f} s")
+
+
+def register_commands(app: Flask) -> None:
+    """Agrega los grupos de comandos a ``app.cli``."""
+    app.cli.add_command(watchlist_cli)
+    app.cli.add_command(seed_command)
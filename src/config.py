@@ -5,11 +5,21 @@ from __future__ import annotations
 import os
 from pathlib import Path
 
+from .pool import InstrumentedQueuePool
+
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 INSTANCE_PATH = BASE_DIR / "instance"
 
 
+def _optional_flag(name: str) -> bool | None:
+    """Booleano de la variable ``name``; ``None`` si no esta definida."""
+    value = os.getenv(name)
+    if not value:
+        return None
+    return value.lower() in {"1", "true", "yes"}
+
+
 class BaseConfig:
     """Config comun a cualquier entorno."""
 
@@ -20,12 +30,50 @@ class BaseConfig:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JSON_SORT_KEYS = False
+    # auto | orjson | msgspec | stdlib (ver src/json_provider.py)
+    JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv("PAGINATION_DEFAULT_LIMIT", "50"))
+    PAGINATION_MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", "200"))
+    BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "5000"))
+    BULK_MAX_ERRORS = int(os.getenv("BULK_MAX_ERRORS", "1000"))
+    STREAM_YIELD_PER = int(os.getenv("STREAM_YIELD_PER", "1000"))
+    PROGRESS_BATCH_MAX_ITEMS = int(os.getenv("PROGRESS_BATCH_MAX_ITEMS", "200"))
+    # Sincronizacion incremental de la watchlist (ver src/api/sync.py)
+    WATCHLIST_SYNC_SAFETY_SECONDS = float(os.getenv("WATCHLIST_SYNC_SAFETY_SECONDS", "5"))
+    WATCHLIST_TOMBSTONE_RETENTION_DAYS = int(os.getenv("WATCHLIST_TOMBSTONE_RETENTION_DAYS", "30"))
+    # Cache de lecturas de catalogo (ver src/cache.py). Sin definir (None) solo
+    # se activa con L2: sin L2 los demas workers servirian datos viejos hasta el TTL
+    CACHE_ENABLED = _optional_flag("CACHE_ENABLED")
+    CACHE_TTL = int(os.getenv("CACHE_TTL", "60"))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # L2 compartido entre workers: redis://host:6379/0 o sqlite:///ruta/cache.db
+    CACHE_L2_URL = os.getenv("CACHE_L2_URL", "")
+    CACHE_L2_POLL_INTERVAL = float(os.getenv("CACHE_L2_POLL_INTERVAL", "0.5"))
+    # Metricas por solicitud y header Server-Timing (ver src/instrumentation.py)
+    REQUEST_METRICS_ENABLED = os.getenv("REQUEST_METRICS_ENABLED", "1").lower() in {"1", "true", "yes"}
+    SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "1").lower() in {"1", "true", "yes"}
+    # Comprobaciones de /health/ready en segundo plano (ver src/readiness.py)
+    HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "5"))
+    HEALTH_POOL_SATURATION = float(os.getenv("HEALTH_POOL_SATURATION", "0.9"))
+    HEALTH_CHECK_MIGRATIONS = os.getenv("HEALTH_CHECK_MIGRATIONS", "1").lower() in {"1", "true", "yes"}
+    # Perfil opcional para SQLite en produccion (ver src/sqlite_tuning.py)
+    SQLITE_TUNING = os.getenv("SQLITE_TUNING", "0").lower() in {"1", "true", "yes"}
+    SQLITE_WRITE_LOCK = os.getenv("SQLITE_WRITE_LOCK", "0").lower() in {"1", "true", "yes"}
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-64000"))
 
 
 class DevelopmentConfig(BaseConfig):
     """Config pensada para desarrollo local."""
 
     DEBUG = True
+    # Diagnostico de consultas (ver src/query_debug.py)
+    QUERY_DEBUG_REPEATED = os.getenv("QUERY_DEBUG_REPEATED", "warn")
+    QUERY_DEBUG_REPEAT_THRESHOLD = int(os.getenv("QUERY_DEBUG_REPEAT_THRESHOLD", "3"))
+    QUERY_DEBUG_SLOW_MS = float(os.getenv("QUERY_DEBUG_SLOW_MS", "100"))
 
 
 class TestingConfig(BaseConfig):
@@ -33,6 +81,12 @@ class TestingConfig(BaseConfig):
 
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    # En CI una consulta repetida hace fallar la solicitud
+    QUERY_DEBUG_REPEATED = os.getenv("QUERY_DEBUG_REPEATED", "raise")
+    QUERY_DEBUG_REPEAT_THRESHOLD = int(os.getenv("QUERY_DEBUG_REPEAT_THRESHOLD", "3"))
+    QUERY_DEBUG_SLOW_MS = float(os.getenv("QUERY_DEBUG_SLOW_MS", "250"))
+    # El esquema de los tests se crea con create_all, sin alembic_version
+    HEALTH_CHECK_MIGRATIONS = False
 
 
 class ProductionConfig(BaseConfig):
@@ -40,3 +94,12 @@ class ProductionConfig(BaseConfig):
 
     DEBUG = False
     TESTING = False
+    # Pool por worker de gunicorn: conexiones totales = workers * (size + overflow)
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1").lower() in {"1", "true", "yes"},
+    }
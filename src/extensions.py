@@ -3,5 +3,14 @@
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
+from src.cache import Cache
+from src.instrumentation import RequestMetrics
+from src.query_debug import QueryDebugger
+from src.readiness import Readiness
+
 db = SQLAlchemy()
 migrate = Migrate()
+cache = Cache()
+request_metrics = RequestMetrics()
+query_debugger = QueryDebugger()
+readiness = Readiness()
@@ -0,0 +1,141 @@
+"""Instrumentacion por solicitud: duracion, sentencias SQL y tiempo en SQL.
+
+Los eventos ``before_cursor_execute``/``after_cursor_execute`` del engine
+suman en el acumulador de la solicitud en curso, guardado en una
+``ContextVar`` (propia de cada hilo y de cada greenlet de ``run_sync`` en
+modo ASGI). Al armar la respuesta se agrega, si esta habilitado, el header
+``Server-Timing`` y se registran los histogramas por endpoint de
+``src.metrics``. En streaming el registro espera al cierre de la respuesta,
+despues de enviar el cuerpo y sus consultas; si una excepcion propagada
+impidio armar la respuesta, se registra como 500 en el teardown.
+El costo por sentencia son dos ``perf_counter`` y una suma.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from time import perf_counter
+
+from flask import Flask, Response, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUEST_SQL_SECONDS, HTTP_REQUEST_SQL_STATEMENTS, HTTP_REQUESTS
+
+# Endpoint de las solicitudes que no coinciden con ninguna ruta
+UNMATCHED_ENDPOINT = "unmatched"
+# Metodos con etiqueta propia; el resto comparte OTHER_METHOD para acotar la cardinalidad
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+OTHER_METHOD = "other"
+
+
+class RequestStats:
+    """Acumulador de una solicitud."""
+
+    __slots__ = ("started", "sql_count", "sql_seconds", "status")
+
+    def __init__(self) -> None:
+        self.started = perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        # Codigo de la respuesta armada; ``None`` si no se llego a armarla
+        self.status: int | None = None
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("watchlog_request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    """Acumulador de la solicitud en curso o ``None`` fuera de una solicitud."""
+    return _current.get()
+
+
+def method_label(method: str) -> str:
+    """Etiqueta del metodo HTTP: los desconocidos se agrupan en ``other``."""
+    return method if method in KNOWN_METHODS else OTHER_METHOD
+
+
+def record_request(stats: RequestStats, endpoint: str, method: str, status: int) -> None:
+    """Registra en ``src.metrics`` una solicitud terminada."""
+    HTTP_REQUESTS.labels(endpoint, method, str(status)).inc()
+    HTTP_REQUEST_SECONDS.labels(endpoint, method).observe(perf_counter() - stats.started)
+    HTTP_REQUEST_SQL_STATEMENTS.labels(endpoint, method).observe(stats.sql_count)
+    HTTP_REQUEST_SQL_SECONDS.labels(endpoint, method).observe(stats.sql_seconds)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._watchlog_started = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    started = getattr(context, "_watchlog_started", None)
+    if stats is not None and started is not None:
+        stats.sql_count += 1
+        stats.sql_seconds += perf_counter() - started
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registra los eventos de medicion de SQL en ``engine`` (una sola vez)."""
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RequestMetrics:
+    """Extension de Flask que mide cada solicitud.
+
+    Con ``REQUEST_METRICS_ENABLED`` en falso no registra nada. Con
+    ``SERVER_TIMING_HEADER`` agrega ``Server-Timing: app;dur=..,
+    db;dur=..;desc="N queries"`` (milisegundos), visible en el navegador.
+    En respuestas en streaming el header solo cubre hasta el primer byte;
+    las metricas incluyen el cuerpo completo y sus consultas.
+    """
+
+    def init_app(self, app: Flask, engine: Engine | None = None) -> None:
+        """Agrega los hooks de solicitud y, si se pasa, instrumenta ``engine``."""
+        if not app.config.get("REQUEST_METRICS_ENABLED", True):
+            return
+        if engine is not None:
+            instrument_engine(engine)
+        server_timing = app.config.get("SERVER_TIMING_HEADER", True)
+
+        @app.before_request
+        def _start_request_stats() -> None:
+            _current.set(RequestStats())
+
+        @app.after_request
+        def _record_request_stats(response: Response) -> Response:
+            stats = _current.get()
+            if stats is None:
+                return response
+            stats.status = response.status_code
+            endpoint = request.endpoint or UNMATCHED_ENDPOINT
+            method = method_label(request.method)
+            if response.is_streamed:
+                # Las consultas del cuerpo corren al enviarlo; el servidor cierra la respuesta al terminar
+                def _record_on_close() -> None:
+                    _current.set(None)
+                    record_request(stats, endpoint, method, response.status_code)
+
+                response.call_on_close(_record_on_close)
+            else:
+                _current.set(None)
+                record_request(stats, endpoint, method, response.status_code)
+            if server_timing:
+                elapsed = perf_counter() - stats.started
+                response.headers.add(
+                    "Server-Timing",
+                    f'app;dur={elapsed * 1000:.2f}, db;dur={stats.sql_seconds * 1000:.2f};desc="{stats.sql_count} queries"',
+                )
+            return response
+
+        @app.teardown_request
+        def _record_failed_request(exc: BaseException | None = None) -> None:
+            # Sin respuesta armada (excepcion propagada) no habra cierre: se registra como 500
+            stats = _current.get()
+            if stats is None or stats.status is not None:
+                return
+            _current.set(None)
+            record_request(stats, request.endpoint or UNMATCHED_ENDPOINT, method_label(request.method), 500)
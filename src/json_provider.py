@@ -0,0 +1,107 @@
+"""Proveedor JSON de la aplicacion con backends rapidos opcionales."""
+
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable
+
+from flask import Flask, Response
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+BACKENDS = ("auto", "orjson", "msgspec", "stdlib")
+
+
+def _default(o: Any) -> Any:
+    """Convierte los tipos que los backends no serializan de forma nativa."""
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _resolve_backend(name: str) -> str:
+    """Elige el backend pedido o el mas rapido disponible con ``auto``."""
+    if name not in BACKENDS:
+        raise RuntimeError(f"JSON_BACKEND invalido: {name!r}, opciones: {', '.join(BACKENDS)}")
+    if name == "auto":
+        if orjson is not None:
+            return "orjson"
+        if msgspec is not None:
+            return "msgspec"
+        return "stdlib"
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("JSON_BACKEND=orjson pero el paquete orjson no esta instalado")
+    if name == "msgspec" and msgspec is None:
+        raise RuntimeError("JSON_BACKEND=msgspec pero el paquete msgspec no esta instalado")
+    return name
+
+
+class WatchlogJSONProvider(JSONProvider):
+    """Serializa respuestas con orjson/msgspec si estan instalados.
+
+    Las fechas se emiten en ISO 8601 de forma nativa, por lo que los modelos
+    pueden devolver ``datetime`` sin convertirlos. El backend se elige con
+    ``JSON_BACKEND`` (``auto`` por defecto) y ``JSON_SORT_KEYS`` vuelve a
+    tener efecto.
+    """
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__(app)
+        self.backend = _resolve_backend(app.config.get("JSON_BACKEND", "auto"))
+        self.sort_keys = bool(app.config.get("JSON_SORT_KEYS", False))
+        self._dumps_bytes, self._loads = self._build(self.backend)
+
+    def _build(self, backend: str) -> tuple[Callable[[Any], bytes], Callable[[Any], Any]]:
+        """Prepara las funciones de codificacion/decodificacion del backend."""
+        if backend == "orjson":
+            option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+            return (lambda obj: orjson.dumps(obj, default=_default, option=option)), orjson.loads
+        if backend == "msgspec":
+            encoder = msgspec.json.Encoder(enc_hook=_default, order="sorted" if self.sort_keys else None)
+            return encoder.encode, msgspec.json.decode
+        encoder = json.JSONEncoder(
+            default=_default,
+            ensure_ascii=False,
+            sort_keys=self.sort_keys,
+            separators=(",", ":"),
+        )
+        return (lambda obj: encoder.encode(obj).encode("utf-8")), json.loads
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serializa ``obj`` a texto JSON."""
+        if kwargs:
+            # Opciones especificas del modulo json (indent, etc.)
+            kwargs.setdefault("default", _default)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Decodifica texto JSON."""
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return self._loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Igual que ``jsonify`` pero sin pasar por ``str`` intermedio."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj) + b"\n", mimetype="application/json")
@@ -0,0 +1,251 @@
+"""Metricas en proceso (contadores e histogramas) para instrumentacion.
+
+Los valores son por proceso: con varios workers de gunicorn cada uno expone
+los suyos y Prometheus los agrega por la etiqueta ``instance``/``pid``.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Iterable, Sequence
+
+# Segundos: de medio milisegundo a 10 s, pensados para esperas y consultas
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Cantidad de sentencias SQL por solicitud
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """Etiquetas en formato de exposicion de Prometheus: ``{a="1",b="2"}``."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Contador monotono seguro entre hilos."""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Incrementa el contador."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        """Valor acumulado."""
+        return self._value
+
+    def samples(self, labels: dict[str, str] | None = None) -> list[str]:
+        """Lineas de exposicion de Prometheus (sin ``HELP``/``TYPE``)."""
+        return [f"{self.name}{format_labels(labels or {})} {_format_value(self._value)}"]
+
+    def render(self) -> list[str]:
+        """Familia completa en formato de exposicion de Prometheus."""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter", *self.samples()]
+
+
+class Histogram:
+    """Histograma de buckets fijos con semantica de Prometheus (acumulativo)."""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        # Un casillero extra para +Inf
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Registra una observacion."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        """Cuenta, suma y conteos acumulados por limite superior (``le``)."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip((*self.buckets, "+Inf"), counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {"count": running, "sum": total, "buckets": cumulative}
+
+    def quantile(self, q: float) -> float | None:
+        """Estima el cuantil ``q`` interpolando dentro del bucket, como Prometheus.
+
+        Si cae en el bucket ``+Inf`` devuelve el ultimo limite finito.
+        """
+        with self._lock:
+            counts = list(self._counts)
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        running, lower = 0, 0.0
+        for bound, count in zip(self.buckets, counts):
+            if count and running + count >= rank:
+                return lower + (bound - lower) * (rank - running) / count
+            running += count
+            lower = bound
+        return self.buckets[-1]
+
+    def samples(self, labels: dict[str, str] | None = None) -> list[str]:
+        """Lineas ``_bucket``, ``_sum`` y ``_count`` de exposicion de Prometheus."""
+        labels = labels or {}
+        data = self.snapshot()
+        lines = [
+            f"{self.name}_bucket{format_labels({**labels, 'le': bound})} {count}"
+            for bound, count in data["buckets"].items()
+        ]
+        lines.append(f"{self.name}_sum{format_labels(labels)} {_format_value(data['sum'])}")
+        lines.append(f"{self.name}_count{format_labels(labels)} {data['count']}")
+        return lines
+
+    def render(self) -> list[str]:
+        """Familia completa en formato de exposicion de Prometheus."""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram", *self.samples()]
+
+
+class LabeledMetric:
+    """Familia de ``Counter`` o ``Histogram`` con una serie por combinacion de etiquetas.
+
+    Las etiquetas deben tener cardinalidad acotada (endpoint, metodo, codigo).
+    """
+
+    def __init__(self, metric_class, name: str, documentation: str, labelnames: Sequence[str], **options) -> None:
+        self.metric_class = metric_class
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.options = options
+        self._children: dict[tuple[str, ...], Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """Serie de las etiquetas ``values`` (en el orden de ``labelnames``)."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self.metric_class(self.name, self.documentation, **self.options)
+                    self._children[values] = child
+        return child
+
+    def children(self) -> list[tuple[dict[str, str], Counter | Histogram]]:
+        """Series existentes con sus etiquetas."""
+        with self._lock:
+            items = list(self._children.items())
+        return [(dict(zip(self.labelnames, values)), child) for values, child in items]
+
+    def render(self) -> list[str]:
+        """Familia completa en formato de exposicion de Prometheus."""
+        kind = "histogram" if self.metric_class is Histogram else "counter"
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {kind}"]
+        for labels, child in self.children():
+            lines.extend(child.samples(labels))
+        return lines
+
+
+class QuantileGauge:
+    """Cuantiles estimados de un ``LabeledMetric`` de histogramas, como gauges.
+
+    Prometheus puede calcularlos con ``histogram_quantile``; este gauge los
+    deja listos para tableros simples y para ``/metrics`` leido a mano.
+    """
+
+    def __init__(self, name: str, documentation: str, source: LabeledMetric, quantiles: Iterable[float] = QUANTILES) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.source = source
+        self.quantiles = tuple(quantiles)
+
+    def render(self) -> list[str]:
+        """Familia completa en formato de exposicion de Prometheus."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for labels, histogram in self.source.children():
+            for q in self.quantiles:
+                value = histogram.quantile(q)
+                if value is not None:
+                    lines.append(f"{self.name}{format_labels({**labels, 'quantile': str(q)})} {_format_value(value)}")
+        return lines
+
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "watchlog_db_pool_checkout_seconds",
+    "Tiempo para obtener una conexion del pool (espera, conexion nueva y pre-ping).",
+)
+DB_POOL_TIMEOUTS = Counter(
+    "watchlog_db_pool_timeouts_total",
+    "Checkouts que agotaron pool_timeout sin conseguir conexion.",
+)
+
+HTTP_REQUESTS = LabeledMetric(
+    Counter,
+    "watchlog_http_requests_total",
+    "Solicitudes atendidas por endpoint, metodo y codigo de estado.",
+    ("endpoint", "method", "status"),
+)
+HTTP_REQUEST_SECONDS = LabeledMetric(
+    Histogram,
+    "watchlog_http_request_duration_seconds",
+    "Duracion de las solicitudes (en streaming, hasta enviar el cuerpo), por endpoint.",
+    ("endpoint", "method"),
+)
+HTTP_REQUEST_QUANTILES = QuantileGauge(
+    "watchlog_http_request_duration_quantile_seconds",
+    "p50/p95/p99 estimados de la duracion de las solicitudes, por endpoint.",
+    HTTP_REQUEST_SECONDS,
+)
+HTTP_REQUEST_SQL_STATEMENTS = LabeledMetric(
+    Histogram,
+    "watchlog_http_request_sql_statements",
+    "Sentencias SQL ejecutadas por solicitud, por endpoint.",
+    ("endpoint", "method"),
+    buckets=COUNT_BUCKETS,
+)
+HTTP_REQUEST_SQL_SECONDS = LabeledMetric(
+    Histogram,
+    "watchlog_http_request_sql_seconds",
+    "Tiempo acumulado en SQL por solicitud, por endpoint.",
+    ("endpoint", "method"),
+)
+
+# Familias expuestas en GET /metrics, en orden
+REGISTRY = (
+    HTTP_REQUESTS,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUEST_QUANTILES,
+    HTTP_REQUEST_SQL_STATEMENTS,
+    HTTP_REQUEST_SQL_SECONDS,
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_POOL_TIMEOUTS,
+)
+
+
+def render_prometheus(metrics: Iterable = REGISTRY) -> str:
+    """Texto de exposicion de Prometheus (formato 0.0.4) de ``metrics``."""
+    lines: list[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
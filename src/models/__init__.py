@@ -2,9 +2,12 @@
 
 # TODO: exponer nuevos modelos cuando se creen.
 from .movie import Movie  # noqa: F401
+from .movie_genre import MovieGenre  # noqa: F401
 from .season import Season  # noqa: F401
 from .serie import Serie  # noqa: F401
 from .user import User  # noqa: F401
+from .user_stats import UserStats  # noqa: F401
 from .watch_entry import WatchEntry  # noqa: F401
+from .watch_entry_tombstone import WatchEntryTombstone  # noqa: F401
 
-__all__ = ["Movie", "Season", "Serie", "User", "WatchEntry"]
+__all__ = ["Movie", "MovieGenre", "Season", "Serie", "User", "UserStats", "WatchEntry", "WatchEntryTombstone"]
@@ -3,18 +3,26 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 from datetime import datetime, timezone
-from sqlalchemy import JSON, DateTime, String, Integer
+from sqlalchemy import JSON, DateTime, String, Integer, Index
 from src.extensions import db
+from src.models.serializers import RowSerializer
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 
 if TYPE_CHECKING:
+    from src.models.movie_genre import MovieGenre
     from src.models.watch_entry import WatchEntry
 
 class Movie(db.Model):
     """Representa una pelicula dentro del catalogo."""
 
     __tablename__ = "movies"
+    __table_args__ = (
+        # Clave de la paginacion por cursor (keyset) de GET /movies/
+        Index("ix_movies_created_at_id", "created_at", "id"),
+        # GET /movies/?year=...: filtro por anio con el mismo orden del cursor
+        Index("ix_movies_release_year_created_at_id", "release_year", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(120), nullable=False)
@@ -23,8 +31,31 @@ class Movie(db.Model):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
+        # Valor desde Python para guardar siempre con microsegundos: el cursor
+        # compara created_at y en SQLite la comparacion es textual.
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )
+    # Validadores de GET condicional (ETag / Last-Modified): cada UPDATE de la
+    # fila, tambien los hechos con db.update(), incrementa version.
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
     )
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("version") + 1,
+    )
+    # Indice de Movie.genre, mantenido por MovieService
+    genre_links: Mapped[list["MovieGenre"]] = relationship(
+        cascade="all, delete-orphan",
+    )
     # Movie -> WatchEntry (one to many collection)
     watch_entries: Mapped[list["WatchEntry"]] = relationship(
         back_populates="movie",
@@ -37,11 +68,9 @@ class Movie(db.Model):
 
     def to_dict(self) -> dict:
         """Serializa la instancia para respuestas JSON."""
-        created = getattr(self, "created_at", datetime.now(timezone.utc))
-        return {
-            "id": getattr(self, "id", None),
-            "title": getattr(self, "title", None),
-            "genre": getattr(self, "genre", None),
-            "release_year": getattr(self, "release_year", None),
-            "created_at": created.isoformat(),
-        }
+        return MOVIE_SERIALIZER.from_object(self)
+
+
+MOVIE_SERIALIZER = RowSerializer(
+    ("id", "title", "genre", "release_year", "created_at"),
+)
@@ -0,0 +1,37 @@
+"""Indice normalizado de generos de peliculas."""
+
+from __future__ import annotations
+from typing import Iterable
+from src.extensions import db
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, ForeignKey, Index
+
+GENRE_MAX_LENGTH = 50
+
+
+class MovieGenre(db.Model):
+    """Un genero de una pelicula; refleja ``Movie.genre`` para filtrar con indice.
+
+    ``Movie.genre`` conserva la lista tal como la envio el cliente; aca se
+    guarda normalizada (sin espacios extremos y en minusculas).
+    """
+
+    __tablename__ = "movie_genres"
+    __table_args__ = (
+        # GET /movies/?genre=...: del genero a sus peliculas
+        Index("ix_movie_genres_genre_movie_id", "genre", "movie_id"),
+    )
+
+    movie_id: Mapped[int] = mapped_column(ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    genre: Mapped[str] = mapped_column(String(GENRE_MAX_LENGTH), primary_key=True)
+
+
+def normalize_genre(name: str) -> str:
+    """Clave de busqueda de un genero."""
+    return name.strip().lower()
+
+
+def genre_keys(genres: Iterable[str]) -> list[str]:
+    """Generos normalizados, sin vacios ni repetidos, en el orden original."""
+    keys = (normalize_genre(name) for name in genres)
+    return list(dict.fromkeys(key for key in keys if key))
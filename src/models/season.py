@@ -3,6 +3,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 from src.extensions import db
+from src.models.serializers import RowSerializer
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy import Integer, ForeignKey, UniqueConstraint
 
@@ -25,14 +26,11 @@ class Season(db.Model):
     # Use TYPE_CHECKING import for type hints
     series: Mapped["Serie"] = relationship(
         back_populates="seasons",
-        lazy="selectin", 
     )
     
     def to_dict(self) -> dict:
         """Serializa la temporada en un diccionario."""
-        return {
-            "id": getattr(self, "id", None),
-            "series_id": getattr(self, "series_id", None),
-            "number": getattr(self, "number", None),
-            "episodes_count": getattr(self, "episodes_count", None),
-        }
+        return SEASON_SERIALIZER.from_object(self)
+
+
+SEASON_SERIALIZER = RowSerializer(("id", "series_id", "number", "episodes_count"))
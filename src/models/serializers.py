@@ -0,0 +1,43 @@
+"""Serializadores precompilados para los modelos.
+
+Cada serializador conoce de antemano sus campos, por lo que puede construir
+el diccionario tanto desde una instancia ORM como desde una ``Row`` de un
+``select`` de columnas, sin hidratar objetos en la sesion. Las fechas se
+dejan como ``datetime``: el proveedor JSON de la aplicacion las convierte.
+"""
+
+from __future__ import annotations
+
+from operator import attrgetter
+from typing import Any, Sequence
+
+
+class RowSerializer:
+    """Convierte filas o instancias de un modelo en diccionarios."""
+
+    __slots__ = ("fields", "_size", "_getter")
+
+    def __init__(self, fields: Sequence[str]) -> None:
+        self.fields = tuple(fields)
+        self._size = len(self.fields)
+        self._getter = attrgetter(*self.fields)
+
+    def columns(self, model) -> list:
+        """Columnas del modelo en el orden que espera ``from_row``."""
+        return [getattr(model, name) for name in self.fields]
+
+    def from_row(self, row: Sequence[Any]) -> dict:
+        """Serializa una fila cuyas primeras posiciones son ``fields``.
+
+        Las posiciones extra (columnas agregadas por un join) se ignoran.
+        """
+        return dict(zip(self.fields, row))
+
+    def values(self, instance) -> tuple:
+        """Lee de una vez los valores de ``fields`` de una instancia ORM."""
+        values = self._getter(instance)
+        return (values,) if self._size == 1 else values
+
+    def from_object(self, instance) -> dict:
+        """Serializa una instancia ORM."""
+        return self.from_row(self.values(instance))
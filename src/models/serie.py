@@ -4,9 +4,10 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from datetime import datetime, timezone
 from src.extensions import db
-from sqlalchemy import String, Integer, DateTime
+from src.models.serializers import RowSerializer
+from sqlalchemy import String, Integer, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 
 if TYPE_CHECKING:
     from src.models.season import Season
@@ -16,19 +17,45 @@ class Serie(db.Model):
     """Representa una serie cargada por los usuarios."""
 
     __tablename__ = "series"
+    __table_args__ = (
+        # Clave de la paginacion por cursor (keyset) de GET /series/
+        Index("ix_series_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(150), nullable=False)
     total_seasons: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    # Suma de episodes_count de sus temporadas, mantenida al escribir temporadas
+    total_episodes: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
+        # Valor desde Python para guardar siempre con microsegundos: el cursor
+        # compara created_at y en SQLite la comparacion es textual.
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )
+    # Validadores de GET condicional (ETag / Last-Modified): cada UPDATE de la
+    # fila, tambien los hechos con db.update(), incrementa version.
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
     )
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("version") + 1,
+    )
 
+    # Carga perezosa: cada endpoint decide su estrategia (selectinload, etc.)
+    # para que listar series no arrastre temporadas ni entradas de watchlist.
     seasons: Mapped[list["Season"]] = relationship(
         back_populates="series",
-        lazy="selectin",
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
@@ -36,7 +63,6 @@ class Serie(db.Model):
     watch_entries: Mapped[list["WatchEntry"]] = relationship(
         back_populates="series",
         cascade="all, delete-orphan",
-        lazy="selectin",
     )
 
     def __repr__(self) -> str:
@@ -45,13 +71,12 @@ class Serie(db.Model):
 
     def to_dict(self, include_seasons: bool = False) -> dict:
         """Serializa la serie y opcionalmente sus temporadas."""
-        created = getattr(self, "created_at", datetime.now(timezone.utc))
-        data = {
-            "id": getattr(self, "id", None),
-            "title": getattr(self, "title", None),
-            "total_seasons": getattr(self, "total_seasons", None),
-            "created_at": created.isoformat(),
-        }
+        data = SERIE_SERIALIZER.from_object(self)
         if include_seasons:
-            data["seasons"] = [s.to_dict() for s in getattr(self, "seasons", [])]
+            data["seasons"] = [s.to_dict() for s in self.seasons]
         return data
+
+
+SERIE_SERIALIZER = RowSerializer(
+    ("id", "title", "total_seasons", "total_episodes", "created_at"),
+)
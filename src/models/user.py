@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 from typing import TYPE_CHECKING
-from datetime import datetime, timezone
+from datetime import datetime
 from src.extensions import db
+from src.models.serializers import RowSerializer
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy import String, Integer, DateTime
 from sqlalchemy.sql import func
@@ -37,10 +38,7 @@ class User(db.Model):
 
     def to_dict(self) -> dict:
         """Serializa al usuario para respuestas JSON."""
-        created = getattr(self, "created_at", datetime.now(timezone.utc))
-        return {
-            "id": getattr(self, "id", None),
-            "name": getattr(self, "name", None),
-            "email": getattr(self, "email", None),
-            "created_at": created.isoformat(),
-        }
+        return USER_SERIALIZER.from_object(self)
+
+
+USER_SERIALIZER = RowSerializer(("id", "name", "email", "created_at"))
@@ -0,0 +1,68 @@
+"""Agregado por usuario de su watchlist, mantenido en cada escritura."""
+
+from __future__ import annotations
+from datetime import datetime
+from src.extensions import db
+from src.models.serializers import RowSerializer
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, DateTime, ForeignKey
+from sqlalchemy.sql import func
+
+
+class UserStats(db.Model):
+    """Contadores de la watchlist de un usuario.
+
+    Solo guarda valores que dependen de las propias entradas (cantidades por
+    tipo y estado, episodios vistos), asi los cambios de catalogo no obligan
+    a recalcular el agregado de cada usuario.
+    """
+
+    __tablename__ = "user_stats"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    entries: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    movies: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    series: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    watching: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    completed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    paused: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Suma de watched_episodes de las entradas de series
+    episodes_watched: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+# Columnas que se actualizan sumando deltas
+STATS_COUNTERS = ("entries", "movies", "series", "watching", "completed", "paused", "episodes_watched")
+
+STATS_SERIALIZER = RowSerializer(STATS_COUNTERS)
+
+
+def entry_contribution(content_type: str | None, status: str | None, watched_episodes: int | None) -> dict[str, int]:
+    """Aporte de una entrada a los contadores de ``UserStats``."""
+    contribution = {"entries": 1}
+    if content_type in ("movie", "series"):
+        contribution["movies" if content_type == "movie" else "series"] = 1
+    if status in ("watching", "completed", "paused"):
+        contribution[status] = 1
+    if content_type == "series" and watched_episodes:
+        contribution["episodes_watched"] = watched_episodes
+    return contribution
+
+
+def contribution_delta(before: dict[str, int], after: dict[str, int]) -> dict[str, int]:
+    """Diferencia entre dos aportes, sin las claves que no cambian."""
+    delta = {key: after.get(key, 0) - before.get(key, 0) for key in before.keys() | after.keys()}
+    return {key: value for key, value in delta.items() if value}
+
+
+def serialize_stats_row(row) -> dict:
+    """Serializa los contadores y agrega el porcentaje de completados."""
+    data = STATS_SERIALIZER.from_row(row)
+    entries = data["entries"] or 0
+    data["completed_percentage"] = round(data["completed"] * 100.0 / entries, 2) if entries else 0.0
+    return data
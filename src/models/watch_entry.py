@@ -4,9 +4,10 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from datetime import datetime, timezone
 from src.extensions import db
+from src.models.serializers import RowSerializer
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from sqlalchemy import String, Integer, DateTime, ForeignKey
-from sqlalchemy.sql import func
+from sqlalchemy import String, Integer, Float, DateTime, ForeignKey, Index, text
+from sqlalchemy.sql import func, literal_column
 
 if TYPE_CHECKING:
     from src.models.movie import Movie
@@ -18,6 +19,35 @@ class WatchEntry(db.Model):
     """Relacion entre un usuario y un contenido (pelicula o serie)."""
 
     __tablename__ = "watch_entries"
+    __table_args__ = (
+        # Listado de la watchlist por usuario (y tipo de contenido)
+        Index("ix_watch_entries_user_content_type", "user_id", "content_type"),
+        # Un contenido solo puede estar una vez en la watchlist de cada usuario;
+        # los indices parciales tambien resuelven las busquedas por contenido.
+        Index(
+            "uq_watch_entries_user_movie",
+            "user_id",
+            "movie_id",
+            unique=True,
+            sqlite_where=text("content_type = 'movie'"),
+            postgresql_where=text("content_type = 'movie'"),
+        ),
+        Index(
+            "uq_watch_entries_user_series",
+            "user_id",
+            "series_id",
+            unique=True,
+            sqlite_where=text("content_type = 'series'"),
+            postgresql_where=text("content_type = 'series'"),
+        ),
+        # Borrados en cascada desde movies/series
+        Index("ix_watch_entries_movie_id", "movie_id"),
+        Index("ix_watch_entries_series_id", "series_id"),
+        # Orden y cursor de GET /me/watchlist paginado (ver list_watchlist_page)
+        Index("ix_watch_entries_user_updated_at_id", "user_id", "updated_at", "id"),
+        Index("ix_watch_entries_user_status_updated_at_id", "user_id", "status", "updated_at", "id"),
+        Index("ix_watch_entries_user_percentage_id", "user_id", "percentage", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -29,12 +59,27 @@ class WatchEntry(db.Model):
     current_season: Mapped[int] = mapped_column(Integer, nullable=True)
     current_episode: Mapped[int] = mapped_column(Integer, nullable=True)
     watched_episodes: Mapped[int] = mapped_column(Integer, nullable=True, default=0)
+    # Solo se guarda si el usuario lo fija; las series usan Serie.total_episodes
     total_episodes: Mapped[int] = mapped_column(Integer, nullable=True)
+    # Copia de percentage_watched() para ordenar en SQL; se recalcula al
+    # editar el progreso y al cambiar el total de episodios de la serie
+    percentage: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
+        # Valor desde Python para guardar siempre con microsegundos: el cursor
+        # de GET /me/watchlist compara updated_at y en SQLite es textual.
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
-        onupdate=func.now(),
+    )
+    # Junto con updated_at forma el ETag de GET /me/watchlist
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("version") + 1,
     )
 
     user: Mapped["User"] = relationship(
@@ -49,37 +94,99 @@ class WatchEntry(db.Model):
         back_populates="watch_entries",
     )
 
-    def percentage_watched(self) -> float:
+    def effective_total_episodes(self, series_total_episodes: int | None = None) -> int | None:
+        """Total de episodios a usar: el fijado en la entrada o el de la serie.
+
+        ``series_total_episodes`` permite pasar el total ya consultado (por
+        ejemplo con un join) para no cargar la relacion ``series``.
+        """
+        return effective_total(self.total_episodes, self.content_type, self._series_total(series_total_episodes))
+
+    def _series_total(self, series_total_episodes: int | None) -> int | None:
+        """Total de la serie, cargando la relacion solo si hace falta."""
+        if series_total_episodes is not None or self.total_episodes is not None or self.content_type != "series":
+            return series_total_episodes
+        return self.series.total_episodes if self.series is not None else None
+
+    def percentage_watched(self, series_total_episodes: int | None = None) -> float:
         """Calcula el porcentaje completado para el contenido asociado."""
-        total = self.total_episodes or 0
-        watched = self.watched_episodes or 0
-        if total <= 0:
-            return 100.0 if self.status == "completed" else 0.0
-        pct = (watched / float(total)) * 100.0
-        return max(0.0, min(100.0, round(pct, 2)))
+        total = self.effective_total_episodes(series_total_episodes)
+        return compute_percentage(total, self.watched_episodes, self.status)
 
     def mark_as_watched(self) -> None:
         """Marca el contenido como completado."""
-        if self.total_episodes and (self.watched_episodes or 0) < self.total_episodes:
-            self.watched_episodes = self.total_episodes
+        total = self.effective_total_episodes()
+        if total and (self.watched_episodes or 0) < total:
+            self.watched_episodes = total
         self.status = "completed"
+        self.percentage = self.percentage_watched()
         self.updated_at = datetime.now(timezone.utc)
 
-    def to_dict(self) -> dict:
+    def to_dict(self, series_total_episodes: int | None = None) -> dict:
         """Serializa la entrada para respuestas JSON."""
-        updated = getattr(self, "updated_at", datetime.now(timezone.utc))
-        return {
-            "id": getattr(self, "id", None),
-            "user_id": getattr(self, "user_id", None),
-            "content_type": getattr(self, "content_type", None),
-            "movie_id": getattr(self, "movie_id", None),
-            "series_id": getattr(self, "series_id", None),
-            "content_id": getattr(self, "content_id", None),
-            "status": getattr(self, "status", None),
-            "current_season": getattr(self, "current_season", None),
-            "current_episode": getattr(self, "current_episode", None),
-            "watched_episodes": getattr(self, "watched_episodes", None),
-            "total_episodes": getattr(self, "total_episodes", None),
-            "percentage": self.percentage_watched(),
-            "updated_at": updated.isoformat(),
-        }
+        return serialize_entry_row((*ENTRY_SERIALIZER.values(self), self._series_total(series_total_episodes)))
+
+
+def effective_total(total_episodes: int | None, content_type: str | None, series_total: int | None) -> int | None:
+    """Total propio de la entrada o, para series, el total de la serie."""
+    if total_episodes is not None:
+        return total_episodes
+    return series_total if content_type == "series" else None
+
+
+def compute_percentage(total: int | None, watched: int | None, status: str | None) -> float:
+    """Porcentaje visto limitado a [0, 100]; 100 si esta completado sin total.
+
+    Se redondea a centesimas con la mitad hacia arriba usando solo enteros,
+    igual que ``percentage_expression``, asi el valor guardado para ordenar
+    coincide con el de la respuesta.
+    """
+    total = total or 0
+    if total <= 0:
+        return 100.0 if status == "completed" else 0.0
+    hundredths = ((watched or 0) * 20000 + total) // (2 * total)
+    return max(0.0, min(100.0, hundredths / 100))
+
+
+def percentage_expression(total, watched, status):
+    """Equivalente SQL de ``compute_percentage`` para columnas o subconsultas.
+
+    La division entera (``//``) es la misma en SQLite y PostgreSQL para
+    valores no negativos; los negativos terminan en 0 igual que en Python.
+    """
+    total = func.coalesce(total, 0)
+    hundredths = (func.coalesce(watched, 0) * 20000 + total) // (total * 2)
+    return db.case(
+        (total <= 0, db.case((status == "completed", 100.0), else_=0.0)),
+        (hundredths > 10000, 100.0),
+        (hundredths < 0, 0.0),
+        else_=db.cast(hundredths, Float) / 100.0,
+    )
+
+
+ENTRY_SERIALIZER = RowSerializer(
+    (
+        "id",
+        "user_id",
+        "content_type",
+        "movie_id",
+        "series_id",
+        "content_id",
+        "status",
+        "current_season",
+        "current_episode",
+        "watched_episodes",
+        "total_episodes",
+        "updated_at",
+    ),
+)
+
+
+def serialize_entry_row(row) -> dict:
+    """Serializa una fila con las columnas de ``ENTRY_SERIALIZER`` y, al final,
+    el total de episodios de la serie (o ``None``)."""
+    data = ENTRY_SERIALIZER.from_row(row)
+    total = effective_total(data["total_episodes"], data["content_type"], row[-1])
+    data["total_episodes"] = total
+    data["percentage"] = compute_percentage(total, data["watched_episodes"], data["status"])
+    return data
@@ -0,0 +1,38 @@
+"""Registro de entradas de watchlist eliminadas, para la sincronizacion incremental."""
+
+from __future__ import annotations
+from datetime import datetime, timezone
+from src.extensions import db
+from src.models.serializers import RowSerializer
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, DateTime, Index
+from sqlalchemy.sql import func
+
+
+class WatchEntryTombstone(db.Model):
+    """Marca que una entrada dejo de existir; se compacta por antiguedad."""
+
+    __tablename__ = "watch_entry_tombstones"
+    __table_args__ = (
+        # Cambios de un usuario desde un token de GET /me/watchlist/changes
+        Index("ix_watch_entry_tombstones_user_deleted_at_id", "user_id", "deleted_at", "id"),
+        # Compactacion por retencion
+        Index("ix_watch_entry_tombstones_deleted_at", "deleted_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    # Sin claves foraneas: la entrada (y su contenido) ya no existen
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    entry_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    content_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    content_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        # Mismo formato que WatchEntry.updated_at para comparar el token en SQLite
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )
+
+
+TOMBSTONE_SERIALIZER = RowSerializer(("entry_id", "content_type", "content_id", "deleted_at"))
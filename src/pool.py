@@ -0,0 +1,47 @@
+"""Pool de conexiones instrumentado para produccion."""
+
+from __future__ import annotations
+
+from time import perf_counter
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool, QueuePool
+
+from src.metrics import DB_POOL_CHECKOUT_SECONDS, DB_POOL_TIMEOUTS
+
+
+class InstrumentedQueuePool(QueuePool):
+    """``QueuePool`` que mide la latencia de checkout y cuenta los timeouts.
+
+    Se mide ``connect`` completo (espera en la cola, apertura de overflow y
+    ``pool_pre_ping``), que es lo que percibe cada solicitud.
+    """
+
+    def connect(self):
+        start = perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(perf_counter() - start)
+
+
+def pool_status(pool: Pool) -> dict:
+    """Configuracion y ocupacion actual de ``pool`` junto a sus metricas."""
+    data: dict = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        data.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # QueuePool cuenta desde -size; solo interesan las conexiones extra
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        data["checkout_seconds"] = DB_POOL_CHECKOUT_SECONDS.snapshot()
+        data["timeouts"] = DB_POOL_TIMEOUTS.value
+    return data
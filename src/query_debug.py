@@ -0,0 +1,197 @@
+"""Diagnostico de consultas para desarrollo y CI: N+1 y consultas lentas.
+
+Con ``QUERY_DEBUG_REPEATED`` en ``warn`` o ``raise`` se cuenta, por
+solicitud, cada ``SELECT`` por su forma (SQL con los parametros y las listas
+``IN`` colapsados). Si una misma forma se ejecuta ``QUERY_DEBUG_REPEAT_THRESHOLD``
+veces o mas, al terminar la solicitud se registra un warning o se lanza
+``RepeatedQueryError`` con la pila del codigo del proyecto que la origino:
+el patron tipico de una relacion perezosa recorrida en un bucle.
+
+Con ``QUERY_DEBUG_SLOW_MS`` mayor que cero cada sentencia que lo supera se
+registra junto con su plan (``EXPLAIN QUERY PLAN`` en SQLite, ``EXPLAIN``
+en el resto), dentro o fuera de una solicitud, salvo en las conexiones con
+la opcion de ejecucion ``QUIET_OPTION`` (cargas masivas como ``flask seed``).
+
+Solo se activa desde ``DevelopmentConfig`` y ``TestingConfig``; las
+consultas de respuestas en streaming corren despues de ``after_request`` y
+no entran en el conteo.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sysconfig
+import traceback
+from contextvars import ContextVar
+from time import perf_counter
+
+from flask import Flask, Response, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "warn", "raise")
+DEFAULT_REPEAT_THRESHOLD = 3
+# Frames de la pila que se muestran al reportar una consulta repetida
+STACK_LIMIT = 8
+
+# Sentencias con plan; el resto (DDL, PRAGMA) se registra sin plan
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+# Opcion de ejecucion que excluye una conexion del registro de consultas lentas
+QUIET_OPTION = "query_debug_quiet"
+
+_LIBRARY_PATHS = tuple({sysconfig.get_paths()[name] for name in ("stdlib", "platstdlib", "purelib", "platlib")})
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RepeatedQueryError(RuntimeError):
+    """Una solicitud repitio la misma consulta mas veces que el umbral."""
+
+
+def query_shape(statement: str) -> str:
+    """Forma de una sentencia: espacios normalizados y listas ``IN`` colapsadas."""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def _verb(statement: str) -> str:
+    return statement.lstrip()[:6].upper()
+
+
+def _project_stack() -> list[traceback.FrameSummary]:
+    """Frames de la pila actual fuera de la stdlib, las dependencias y este modulo."""
+    frames = [
+        frame
+        for frame in traceback.extract_stack()
+        if not frame.filename.startswith(_LIBRARY_PATHS) and frame.filename != __file__
+    ]
+    return frames[-STACK_LIMIT:]
+
+
+class QueryTracker:
+    """Conteo por forma de las consultas de una solicitud."""
+
+    __slots__ = ("threshold", "counts", "stacks")
+
+    def __init__(self, threshold: int) -> None:
+        self.threshold = threshold
+        self.counts: dict[str, int] = {}
+        self.stacks: dict[str, list[traceback.FrameSummary]] = {}
+
+    def record(self, statement: str) -> None:
+        shape = query_shape(statement)
+        count = self.counts.get(shape, 0) + 1
+        self.counts[shape] = count
+        if count == self.threshold:
+            self.stacks[shape] = _project_stack()
+
+    def offenders(self) -> list[tuple[str, int, list[traceback.FrameSummary]]]:
+        """Formas que alcanzaron el umbral, de la mas repetida a la menos."""
+        return sorted(
+            ((shape, self.counts[shape], stack) for shape, stack in self.stacks.items()),
+            key=lambda item: -item[1],
+        )
+
+    def report(self, endpoint: str) -> str:
+        """Texto con cada consulta repetida y la pila que la origino."""
+        parts = [f"{endpoint}: consultas repetidas (umbral {self.threshold})"]
+        for shape, count, stack in self.offenders():
+            parts.append(f"  {count}x {shape}")
+            parts.extend("    " + line.rstrip("\n") for line in traceback.format_list(stack))
+        return "\n".join(parts)
+
+
+_current: ContextVar[QueryTracker | None] = ContextVar("watchlog_query_tracker", default=None)
+
+
+def explain(connection, statement: str, parameters) -> list[str]:
+    """Plan de ``statement`` con sus parametros, sin ejecutarla."""
+    prefix = "EXPLAIN QUERY PLAN " if connection.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [str(row[-1]) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def debug_engine(app: Flask, engine: Engine) -> None:
+    """Registra en ``engine`` los eventos de diagnostico que ``app`` habilita."""
+    track = app.config.get("QUERY_DEBUG_REPEATED", "off") != "off"
+    slow_seconds = (app.config.get("QUERY_DEBUG_SLOW_MS") or 0) / 1000
+    if not track and not slow_seconds:
+        return
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._watchlog_debug_started = perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        if track and not executemany:
+            tracker = _current.get()
+            if tracker is not None and _verb(statement) in ("SELECT", "WITH"):
+                tracker.record(statement)
+        started = getattr(context, "_watchlog_debug_started", None)
+        if slow_seconds and started is not None and not context.execution_options.get(QUIET_OPTION):
+            elapsed = perf_counter() - started
+            if elapsed >= slow_seconds:
+                _log_slow_query(conn, statement, parameters, executemany, elapsed)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+def _log_slow_query(conn, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+    if executemany:
+        plan = ["(executemany: sin plan)"]
+    elif _verb(statement) not in EXPLAINABLE:
+        plan = ["(sin plan)"]
+    else:
+        try:
+            plan = explain(conn, statement, parameters)
+        except Exception as exc:  # el plan es informativo: nunca corta la consulta original
+            plan = [f"(sin plan: {exc})"]
+    logger.warning(
+        "Consulta lenta (%.1f ms): %s\n  plan:\n%s",
+        elapsed * 1000,
+        _WHITESPACE.sub(" ", statement).strip(),
+        "\n".join(f"    {line}" for line in plan),
+    )
+
+
+class QueryDebugger:
+    """Extension de Flask que aplica ``QUERY_DEBUG_REPEATED`` por solicitud."""
+
+    def init_app(self, app: Flask, engine: Engine | None = None) -> None:
+        """Agrega los hooks de solicitud y, si se pasa, instrumenta ``engine``."""
+        mode = app.config.get("QUERY_DEBUG_REPEATED", "off")
+        if mode not in MODES:
+            raise RuntimeError(f"QUERY_DEBUG_REPEATED invalido: {mode!r} (opciones: {', '.join(MODES)})")
+        if engine is not None:
+            debug_engine(app, engine)
+        if mode == "off":
+            return
+        threshold = app.config.get("QUERY_DEBUG_REPEAT_THRESHOLD", DEFAULT_REPEAT_THRESHOLD)
+
+        @app.before_request
+        def _start_query_tracker() -> None:
+            _current.set(QueryTracker(threshold))
+
+        @app.after_request
+        def _check_repeated_queries(response: Response) -> Response:
+            tracker = _current.get()
+            _current.set(None)
+            if tracker is None or not tracker.stacks:
+                return response
+            report = tracker.report(request.endpoint or request.path)
+            if mode == "raise":
+                raise RepeatedQueryError(report)
+            logger.warning(report)
+            return response
+
+        @app.teardown_request
+        def _clear_query_tracker(exc: BaseException | None = None) -> None:
+            _current.set(None)
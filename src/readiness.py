@@ -0,0 +1,208 @@
+"""Comprobaciones de dependencias en segundo plano para ``/health/ready``.
+
+Un hilo por proceso (iniciado con el primer sondeo, para que exista en cada
+worker despues del fork de gunicorn) ejecuta las comprobaciones cada
+``HEALTH_CHECK_INTERVAL`` segundos y guarda el resultado; los sondeos del
+balanceador solo leen ese resultado, asi no agregan carga a la base y una
+consulta lenta aislada no cambia el estado de la instancia.
+
+Las comprobaciones criticas (saturacion del pool, base, migraciones) hacen
+que la instancia deje de estar lista; al fallar una, las criticas siguientes
+se omiten para no quedar esperando una conexion. La del cache L2 solo marca
+la instancia como ``degraded``, porque el cache ya tolera la caida del L2.
+Si el hilo deja de actualizar el resultado (por ejemplo, bloqueado en una
+base que no responde) el resultado vencido tambien cuenta como no listo. En
+modo ASGI se comprueba el engine sincronico, que apunta a la misma base.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from time import monotonic, perf_counter, sleep
+from typing import Callable
+
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from flask import Flask, current_app
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from src.cache import EXTENSION_KEY as CACHE_EXTENSION_KEY
+from src.pool import pool_status
+
+EXTENSION_KEY = "watchlog_readiness"
+DEFAULT_INTERVAL = 5.0
+DEFAULT_POOL_SATURATION = 0.9
+# Intervalos sin actualizar tras los que el resultado se considera vencido
+STALE_INTERVALS = 3
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+class CheckFailed(Exception):
+    """La dependencia respondio, pero en un estado no aceptable."""
+
+    def __init__(self, message: str, detail: dict | None = None) -> None:
+        super().__init__(message)
+        self.detail = detail or {}
+
+
+def _engine(app: Flask):
+    return app.extensions["sqlalchemy"].engine
+
+
+def check_database(app: Flask) -> dict:
+    """``SELECT 1`` con una conexion del pool."""
+    with _engine(app).connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return {}
+
+
+def check_pool(app: Flask) -> dict:
+    """Conexiones en uso respecto de la capacidad del pool (size + overflow)."""
+    pool = _engine(app).pool
+    status = pool_status(pool)
+    if not isinstance(pool, QueuePool) or status["max_overflow"] < 0:
+        return {"class": status["class"]}
+    capacity = status["size"] + status["max_overflow"]
+    saturation = status["checked_out"] / capacity if capacity else 0.0
+    detail = {"checked_out": status["checked_out"], "capacity": capacity, "saturation": round(saturation, 3)}
+    limit = app.config.get("HEALTH_POOL_SATURATION", DEFAULT_POOL_SATURATION)
+    if saturation >= limit:
+        raise CheckFailed(f"pool saturado ({saturation:.0%} >= {limit:.0%})", detail)
+    return detail
+
+
+def check_migrations(app: Flask) -> dict:
+    """La revision aplicada en la base coincide con la cabeza de ``migrations/``."""
+    directory = os.path.join(BASE_DIR, app.extensions["migrate"].directory)
+    heads = sorted(ScriptDirectory(directory).get_heads())
+    with _engine(app).connect() as conn:
+        current = sorted(MigrationContext.configure(conn).get_current_heads())
+    detail = {"current": current, "head": heads}
+    if current != heads:
+        raise CheckFailed("la base no esta en la ultima migracion", detail)
+    return detail
+
+
+def check_cache(app: Flask) -> dict:
+    """Responde el L2 compartido, si esta configurado."""
+    backend = app.extensions.get(CACHE_EXTENSION_KEY)
+    if backend is None:
+        return {"enabled": False}
+    if backend.shared is None:
+        return {"enabled": True, "l2": None}
+    backend.shared.ping()
+    return {"enabled": True, "l2": backend.shared.name}
+
+
+Check = Callable[[Flask], dict]
+
+
+def default_checks(app: Flask) -> dict[str, tuple[Check, bool]]:
+    """Comprobaciones habilitadas para ``app``: nombre -> (comprobacion, critica)."""
+    checks: dict[str, tuple[Check, bool]] = {
+        "pool": (check_pool, True),
+        "database": (check_database, True),
+    }
+    if app.config.get("HEALTH_CHECK_MIGRATIONS", True):
+        checks["migrations"] = (check_migrations, True)
+    checks["cache"] = (check_cache, False)
+    return checks
+
+
+class ReadinessMonitor:
+    """Ejecuta las comprobaciones de una aplicacion y guarda el ultimo resultado."""
+
+    def __init__(self, app: Flask, checks: dict[str, tuple[Check, bool]]) -> None:
+        self.app = app
+        self.checks = checks
+        self.interval = app.config.get("HEALTH_CHECK_INTERVAL", DEFAULT_INTERVAL)
+        self._result: dict | None = None
+        self._updated = 0.0
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def run_checks(self) -> dict:
+        """Ejecuta todas las comprobaciones y guarda el resultado."""
+        results = {}
+        critical_failed = False
+        with self.app.app_context():
+            for name, (check, critical) in self.checks.items():
+                if critical and critical_failed:
+                    # Con el pool saturado o la base caida, las demas esperarian una conexion
+                    results[name] = {"status": "skipped", "critical": critical}
+                    continue
+                start = perf_counter()
+                try:
+                    result = {"status": "ok", **check(self.app)}
+                except CheckFailed as exc:
+                    result = {"status": "error", "error": str(exc), **exc.detail}
+                except Exception as exc:  # cualquier falla de la dependencia cuenta como caida
+                    result = {"status": "error", "error": f"{type(exc).__name__}: {exc}"}
+                result["critical"] = critical
+                result["latency_ms"] = round((perf_counter() - start) * 1000, 2)
+                results[name] = result
+                critical_failed = critical_failed or (critical and result["status"] == "error")
+        failed = [result for result in results.values() if result["status"] == "error"]
+        if critical_failed:
+            status = "error"
+        else:
+            status = "degraded" if failed else "ok"
+        payload = {"status": status, "checked_at": datetime.now(timezone.utc).isoformat(), "checks": results}
+        with self._lock:
+            self._result, self._updated = payload, monotonic()
+        return payload
+
+    def _loop(self) -> None:
+        while True:
+            sleep(self.interval)
+            try:
+                self.run_checks()
+            except Exception:  # el hilo no debe morir; el resultado vencido lo delata
+                pass
+
+    def _ensure_thread(self) -> None:
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name="watchlog-readiness", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def status(self) -> dict:
+        """Ultimo resultado; el primer sondeo de cada proceso espera la primera ronda."""
+        if self._result is None or self._pid != os.getpid():
+            self.run_checks()
+        self._ensure_thread()
+        with self._lock:
+            payload, updated = dict(self._result), self._updated
+        age = monotonic() - updated
+        payload["age_seconds"] = round(age, 3)
+        if age > self.interval * STALE_INTERVALS:
+            payload["status"] = "error"
+            payload["error"] = "resultado vencido: las comprobaciones no terminan"
+        return payload
+
+
+class Readiness:
+    """Extension de Flask que guarda un ``ReadinessMonitor`` por aplicacion."""
+
+    def init_app(self, app: Flask, checks: dict[str, tuple[Check, bool]] | None = None) -> None:
+        """Crea el monitor de ``app``; ``checks`` permite reemplazar las comprobaciones."""
+        app.extensions[EXTENSION_KEY] = ReadinessMonitor(app, checks or default_checks(app))
+
+    @property
+    def monitor(self) -> ReadinessMonitor:
+        """Monitor de la aplicacion actual."""
+        return current_app.extensions[EXTENSION_KEY]
+
+    def status(self) -> dict:
+        """Ver ``ReadinessMonitor.status``."""
+        return self.monitor.status()
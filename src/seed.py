@@ -0,0 +1,336 @@
+"""Datos sinteticos para desarrollo y pruebas de carga (``flask seed``).
+
+La popularidad sigue una distribucion zipf: los contenidos (peliculas y
+series mezcladas) se ordenan al azar y el de rango ``r`` se elige con peso
+``1 / r**zipf``, asi unas pocas series acumulan miles de usuarios y la
+mayoria del catalogo casi no aparece. La actividad de los usuarios sigue la
+misma forma: unos pocos tienen miles de entradas (hasta ``max_per_user``) y
+la mayoria unas pocas.
+
+Todo sale de un ``random.Random(seed)``, incluidas las fechas, por lo que la
+misma semilla y los mismos tamanios producen las mismas filas. Los ids se
+asignan desde 1, por eso las tablas tienen que estar vacias. Las filas se
+insertan con ``insert()`` de Core en lotes de ``chunk_size`` (sin objetos
+ORM ni sesion) y cada lote se confirma por separado; los indices
+secundarios de ``watch_entries`` se quitan durante la carga y se recrean al
+final, que es mas rapido que mantenerlos fila por fila.
+"""
+
+from __future__ import annotations
+
+import random
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from time import perf_counter
+from typing import Callable
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Connection
+
+from src.models import Movie, MovieGenre, Season, Serie, User, UserStats, WatchEntry, WatchEntryTombstone
+from src.models.movie_genre import genre_keys
+from src.models.user_stats import STATS_COUNTERS, entry_contribution
+from src.models.watch_entry import compute_percentage
+from src.query_debug import QUIET_OPTION
+
+GENRES = ("drama", "comedy", "action", "thriller", "horror", "sci-fi", "romance", "documentary", "animation")
+# Estados en decimos: 30% watching, 50% completed, 20% paused
+STATUS_DECILES = ("watching",) * 3 + ("completed",) * 5 + ("paused",) * 2
+DEFAULT_CHUNK_SIZE = 50_000
+# Las fechas generadas caen en [EPOCH, EPOCH + SPAN]
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+SPAN_SECONDS = 5 * 365 * 24 * 3600
+# Rondas de sorteo por popularidad antes de completar al azar uniforme
+DRAW_ROUNDS = 3
+
+# Hijos antes que padres, para vaciar sin violar claves foraneas
+TABLES = (WatchEntryTombstone, UserStats, WatchEntry, MovieGenre, Season, Movie, Serie, User)
+
+
+@dataclass
+class SeedPlan:
+    """Tamanios y forma del dataset."""
+
+    users: int = 10_000
+    movies: int = 20_000
+    series: int = 5_000
+    # Maximos por serie y por temporada; cada serie sortea los suyos
+    seasons: int = 6
+    episodes: int = 12
+    entries: int = 1_000_000
+    zipf: float = 1.1
+    max_per_user: int = 5_000
+    seed: int = 0
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    @property
+    def catalog(self) -> int:
+        return self.movies + self.series
+
+    def validate(self) -> None:
+        """``ValueError`` si el plan no se puede cumplir."""
+        if min(self.users, self.seasons, self.episodes, self.chunk_size) < 1 or self.catalog < 1:
+            raise ValueError("users, seasons, episodes, chunk_size y movies + series deben ser positivos")
+        if self.entries < 0 or self.zipf <= 0:
+            raise ValueError("entries no puede ser negativo y zipf debe ser positivo")
+        # Cada usuario tiene a lo sumo una entrada por contenido
+        if self.entries > self.users * self.per_user_limit:
+            raise ValueError(
+                f"{self.entries} entradas no entran en {self.users} usuarios "
+                f"(maximo {self.per_user_limit} por usuario)"
+            )
+
+    @property
+    def per_user_limit(self) -> int:
+        """Entradas maximas de un usuario: ``max_per_user`` y la mitad del catalogo."""
+        return max(1, min(self.max_per_user, self.catalog // 2))
+
+
+def zipf_cum_weights(n: int, exponent: float) -> list[float]:
+    """Pesos acumulados de los rangos ``1..n`` con peso ``1 / rango**exponent``."""
+    return list(accumulate(1.0 / rank**exponent for rank in range(1, n + 1)))
+
+
+def allocate(total: int, weights: list[float], limit: int) -> list[int]:
+    """Reparte ``total`` proporcional a ``weights`` sin pasar ``limit`` por posicion.
+
+    Lo que excede el limite se vuelve a repartir entre las posiciones libres;
+    el resto del redondeo va de a uno a las de mayor peso.
+    """
+    counts = [0] * len(weights)
+    remaining = total
+    while remaining > 0:
+        free = [index for index, count in enumerate(counts) if count < limit]
+        weight = sum(weights[index] for index in free)
+        assigned = 0
+        for index in free:
+            share = min(int(remaining * weights[index] / weight), limit - counts[index])
+            counts[index] += share
+            assigned += share
+        remaining -= assigned
+        if assigned == 0:
+            for index in sorted(free, key=weights.__getitem__, reverse=True)[:remaining]:
+                counts[index] += 1
+            remaining = 0
+    return counts
+
+
+def _timestamp(rng: random.Random) -> datetime:
+    return EPOCH + timedelta(seconds=rng.random() * SPAN_SECONDS)
+
+
+class Seeder:
+    """Carga un ``SeedPlan`` en la base de ``connection``."""
+
+    def __init__(self, connection: Connection, plan: SeedPlan, echo: Callable[[str], None] | None = None) -> None:
+        plan.validate()
+        self.connection = connection.execution_options(**{QUIET_OPTION: True})
+        self.plan = plan
+        self.rng = random.Random(plan.seed)
+        self.echo = echo or (lambda message: None)
+        self.movie_genres: list[list[str]] = []
+        # Por serie: episodios acumulados al final de cada temporada
+        self.series_episodes: list[list[int]] = []
+        self.stats: list[dict] = []
+
+    def is_empty(self) -> bool:
+        """Indica si ninguna tabla del dataset tiene filas."""
+        return all(
+            self.connection.execute(select(func.count()).select_from(model.__table__)).scalar_one() == 0
+            for model in TABLES
+        )
+
+    def reset(self) -> None:
+        """Vacia las tablas del dataset."""
+        for model in TABLES:
+            self.connection.execute(model.__table__.delete())
+        self.connection.commit()
+
+    def run(self) -> dict[str, int]:
+        """Genera y carga todo el dataset; devuelve las filas por tabla."""
+        return {
+            "users": self._load(User, self._users()),
+            "movies": self._load(Movie, self._movies()),
+            "movie_genres": self._load(MovieGenre, self._movie_genres()),
+            "series": self._load(Serie, self._series()),
+            "seasons": self._load(Season, self._seasons()),
+            **self._load_entries(),
+        }
+
+    def _load(self, model, rows) -> int:
+        """Inserta ``rows`` (un iterable) en lotes; devuelve cuantas filas cargo."""
+        table, chunk, loaded, started = model.__table__, [], 0, perf_counter()
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == self.plan.chunk_size:
+                loaded += self._flush(table, chunk)
+                chunk = []
+        if chunk:
+            loaded += self._flush(table, chunk)
+        elapsed = perf_counter() - started
+        self.echo(f"{table.name}: {loaded} filas en {elapsed:.1f} s ({loaded / max(elapsed, 1e-9):,.0f} filas/s)")
+        return loaded
+
+    def _flush(self, table, chunk: list[dict]) -> int:
+        self.connection.execute(table.insert(), chunk)
+        self.connection.commit()
+        return len(chunk)
+
+    def _users(self):
+        for user_id in range(1, self.plan.users + 1):
+            yield {
+                "id": user_id,
+                "name": f"user {user_id}",
+                "email": f"user{user_id}@seed.local",
+                "created_at": _timestamp(self.rng),
+            }
+
+    def _movies(self):
+        rng = self.rng
+        for movie_id in range(1, self.plan.movies + 1):
+            genre = rng.sample(GENRES, rng.randint(1, 3))
+            self.movie_genres.append(genre)
+            created_at = _timestamp(rng)
+            yield {
+                "id": movie_id,
+                "title": f"movie {movie_id}",
+                "genre": genre,
+                "release_year": rng.randint(1950, 2025),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    def _movie_genres(self):
+        for movie_id, genre in enumerate(self.movie_genres, start=1):
+            for key in genre_keys(genre):
+                yield {"movie_id": movie_id, "genre": key}
+
+    def _series(self):
+        rng, plan = self.rng, self.plan
+        for series_id in range(1, plan.series + 1):
+            counts = [rng.randint(1, plan.episodes) for _ in range(rng.randint(1, plan.seasons))]
+            self.series_episodes.append(list(accumulate(counts)))
+            created_at = _timestamp(rng)
+            yield {
+                "id": series_id,
+                "title": f"series {series_id}",
+                "total_seasons": len(counts),
+                "total_episodes": sum(counts),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    def _seasons(self):
+        season_id = 0
+        for series_id, cumulative in enumerate(self.series_episodes, start=1):
+            previous = 0
+            for number, reached in enumerate(cumulative, start=1):
+                season_id += 1
+                yield {"id": season_id, "series_id": series_id, "number": number, "episodes_count": reached - previous}
+                previous = reached
+
+    def _load_entries(self) -> dict[str, int]:
+        """Carga ``watch_entries`` sin sus indices secundarios y luego ``user_stats``."""
+        indexes = sorted(WatchEntry.__table__.indexes, key=lambda index: index.name)
+        for index in indexes:
+            index.drop(self.connection, checkfirst=True)
+        self.connection.commit()
+        try:
+            loaded = self._load(WatchEntry, self._entries())
+        finally:
+            started = perf_counter()
+            for index in indexes:
+                index.create(self.connection, checkfirst=True)
+            self.connection.commit()
+            self.echo(f"watch_entries: {len(indexes)} indices recreados en {perf_counter() - started:.1f} s")
+        return {"watch_entries": loaded, "user_stats": self._load(UserStats, self.stats)}
+
+    def _entries(self):
+        """Entradas usuario por usuario, con contenidos sorteados por popularidad."""
+        rng, plan = self.rng, self.plan
+        catalog = list(range(plan.catalog))
+        rng.shuffle(catalog)
+        popularity = zipf_cum_weights(plan.catalog, plan.zipf)
+        # La actividad tambien es zipf, con los rangos repartidos al azar entre usuarios
+        activity = [1.0 / rank**plan.zipf for rank in range(1, plan.users + 1)]
+        rng.shuffle(activity)
+        counts = allocate(plan.entries, activity, plan.per_user_limit)
+        self.echo(f"watch_entries: usuario mas activo con {max(counts, default=0)} entradas")
+
+        for user_id, count in enumerate(counts, start=1):
+            totals = dict.fromkeys(STATS_COUNTERS, 0)
+            for content in self._pick(count, catalog, popularity):
+                entry = self._entry(user_id, content)
+                for key, value in entry_contribution(entry["content_type"], entry["status"], entry["watched_episodes"]).items():
+                    totals[key] += value
+                yield entry
+            self.stats.append({"user_id": user_id, **totals, "updated_at": EPOCH + timedelta(seconds=SPAN_SECONDS)})
+
+    def _pick(self, count: int, catalog: list[int], popularity: list[float]) -> list[int]:
+        """``count`` contenidos distintos, por popularidad y luego uniformes."""
+        rng = self.rng
+        picked: dict[int, None] = {}
+        for _ in range(DRAW_ROUNDS):
+            missing = count - len(picked)
+            if not missing:
+                break
+            picked.update(dict.fromkeys(rng.choices(catalog, cum_weights=popularity, k=missing)))
+        # La cola de la distribucion casi nunca sale: se completa al azar
+        while len(picked) < count:
+            picked.setdefault(rng.randrange(len(catalog)), None)
+        return list(picked)
+
+    def _entry(self, user_id: int, content: int) -> dict:
+        rng = self.rng
+        status = STATUS_DECILES[int(rng.random() * 10)]
+        entry = {
+            "user_id": user_id,
+            "status": status,
+            "total_episodes": None,
+            "updated_at": _timestamp(rng),
+            "version": 1,
+        }
+        if content < self.plan.movies:
+            movie_id = content + 1
+            entry.update(
+                content_type="movie",
+                content_id=movie_id,
+                movie_id=movie_id,
+                series_id=None,
+                current_season=None,
+                current_episode=None,
+                watched_episodes=0,
+                percentage=compute_percentage(None, 0, status),
+            )
+            return entry
+        series_id = content - self.plan.movies + 1
+        cumulative = self.series_episodes[series_id - 1]
+        total = cumulative[-1]
+        watched = total if status == "completed" else rng.randint(0, total)
+        # Temporada en curso: la primera cuyo acumulado alcanza lo visto
+        season = min(bisect_left(cumulative, watched), len(cumulative) - 1)
+        entry.update(
+            content_type="series",
+            content_id=series_id,
+            movie_id=None,
+            series_id=series_id,
+            current_season=season + 1,
+            current_episode=watched - (cumulative[season - 1] if season else 0),
+            watched_episodes=watched,
+            percentage=compute_percentage(total, watched, status),
+        )
+        return entry
+
+
+def sync_sequences(connection: Connection) -> None:
+    """En PostgreSQL mueve las secuencias de ids despues de insertar ids explicitos."""
+    if connection.dialect.name != "postgresql":
+        return
+    for model in (User, Movie, Serie, Season, WatchEntry):
+        table = model.__table__.name
+        connection.execute(
+            text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)")
+        )
+    connection.commit()
@@ -0,0 +1,122 @@
+"""Perfil de produccion para SQLite: pragmas por conexion y un unico escritor.
+
+Con ``SQLITE_TUNING`` cada conexion nueva activa WAL, ``synchronous=NORMAL``,
+``mmap_size``, ``cache_size`` y ``busy_timeout``. Con ``SQLITE_WRITE_LOCK``
+ademas las transacciones que escriben se serializan dentro del proceso con
+un lock de Python: los hilos de un worker hacen cola en el lock en lugar de
+competir por el lock de SQLite y reintentar con ``busy_timeout``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+_write_lock = threading.Lock()
+
+
+class WriteLockConnection(sqlite3.Connection):
+    """Conexion que libera el lock de escritura despues de COMMIT/ROLLBACK.
+
+    El lock se toma en ``before_cursor_execute`` con la primera sentencia de
+    escritura de la transaccion; sqlite3 abre la transaccion en ese momento.
+    """
+
+    holds_write_lock = False
+    write_lock_timeout = 5.0
+
+    def acquire_write_lock(self) -> None:
+        if not self.holds_write_lock:
+            # Si vence el timeout se sigue sin lock y decide busy_timeout
+            self.holds_write_lock = _write_lock.acquire(timeout=self.write_lock_timeout)
+
+    def release_write_lock(self) -> None:
+        if self.holds_write_lock:
+            self.holds_write_lock = False
+            _write_lock.release()
+
+    def commit(self) -> None:
+        try:
+            super().commit()
+        finally:
+            self.release_write_lock()
+
+    def rollback(self) -> None:
+        try:
+            super().rollback()
+        finally:
+            self.release_write_lock()
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self.release_write_lock()
+
+
+def is_sqlite(app: Flask) -> bool:
+    """Indica si la base principal de ``app`` es SQLite."""
+    return str(app.config.get("SQLALCHEMY_DATABASE_URI", "")).startswith("sqlite")
+
+
+def prepare_engine_options(app: Flask) -> None:
+    """Agrega a ``SQLALCHEMY_ENGINE_OPTIONS`` la clase de conexion con lock.
+
+    Debe llamarse antes de ``db.init_app``, que es cuando se crea el engine.
+    """
+    if not (is_sqlite(app) and app.config.get("SQLITE_WRITE_LOCK")):
+        return
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    connect_args = dict(options.get("connect_args") or {})
+    connect_args["factory"] = WriteLockConnection
+    options["connect_args"] = connect_args
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+
+def _pragmas(app: Flask) -> list[str]:
+    return [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={app.config.get('SQLITE_SYNCHRONOUS', 'NORMAL')}",
+        f"PRAGMA busy_timeout={int(app.config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+        f"PRAGMA mmap_size={int(app.config.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))}",
+        f"PRAGMA cache_size={int(app.config.get('SQLITE_CACHE_SIZE', -64000))}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def configure_engine(app: Flask, engine: Engine) -> None:
+    """Registra los eventos del perfil en ``engine`` segun la configuracion."""
+    if not is_sqlite(app):
+        return
+
+    if app.config.get("SQLITE_TUNING"):
+        pragmas = _pragmas(app)
+
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+    if app.config.get("SQLITE_WRITE_LOCK"):
+        timeout = int(app.config.get("SQLITE_BUSY_TIMEOUT_MS", 5000)) / 1000
+
+        @event.listens_for(engine, "connect")
+        def _set_lock_timeout(dbapi_connection, connection_record) -> None:
+            if isinstance(dbapi_connection, WriteLockConnection):
+                dbapi_connection.write_lock_timeout = timeout
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _lock_writes(conn, cursor, statement, parameters, context, executemany) -> None:
+            if statement.lstrip()[:7].upper().startswith(WRITE_PREFIXES):
+                dbapi_connection = conn.connection.dbapi_connection
+                if isinstance(dbapi_connection, WriteLockConnection):
+                    dbapi_connection.acquire_write_lock()
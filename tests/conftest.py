@@ -0,0 +1,100 @@
+"""Fixtures comunes: aplicacion con ``TestingConfig`` sobre SQLite en memoria."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from src import create_app
+from src.config import TestingConfig
+from src.extensions import db
+from src.models import User
+
+
+@pytest.fixture
+def config():
+    """Config de la aplicacion; los modulos la reemplazan para cambiar opciones."""
+    return TestingConfig
+
+
+@pytest.fixture
+def app(config):
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def user(app) -> int:
+    """Id de un usuario creado en la base."""
+    db.session.add(User(id=1, name="user 1", email="user1@test.local"))
+    db.session.commit()
+    return 1
+
+
+class StatementCounter:
+    """Sentencias SQL ejecutadas mientras el contador esta activo."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+
+@pytest.fixture
+def count_statements(app):
+    """``with count_statements() as counter`` cuenta las sentencias del bloque."""
+
+    @contextmanager
+    def counting():
+        counter = StatementCounter()
+        event.listen(db.engine, "before_cursor_execute", counter)
+        try:
+            yield counter
+        finally:
+            event.remove(db.engine, "before_cursor_execute", counter)
+
+    return counting
+
+
+@pytest.fixture
+def make_movie(client):
+    """Crea una pelicula por la API y devuelve su JSON."""
+
+    def make(**fields) -> dict:
+        payload = {"title": "movie", "genre": ["drama"], "release_year": 2000, **fields}
+        response = client.post("/movies/", json=payload)
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()
+
+    return make
+
+
+@pytest.fixture
+def make_series(client):
+    """Crea una serie con una temporada por cada valor de ``seasons`` (sus episodios)."""
+
+    def make(seasons: tuple[int, ...] = (10,), **fields) -> dict:
+        response = client.post("/series/", json={"title": "series", "total_seasons": len(seasons), **fields})
+        assert response.status_code == 201, response.get_json()
+        series = response.get_json()
+        for number, episodes in enumerate(seasons, start=1):
+            created = client.post(f"/series/{series['id']}/seasons", json={"number": number, "episodes_count": episodes})
+            assert created.status_code == 201, created.get_json()
+        return series
+
+    return make
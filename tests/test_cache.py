@@ -0,0 +1,83 @@
+"""Cache L1 de catalogo: TTL, LRU e invalidacion en las escrituras."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.cache import LocalCache
+from src import create_app
+from src.config import TestingConfig
+from src.extensions import cache
+
+
+class CachedConfig(TestingConfig):
+    CACHE_ENABLED = True
+
+
+@pytest.fixture
+def config():
+    return CachedConfig
+
+
+def test_cache_is_disabled_by_default_without_l2():
+    class DefaultConfig(TestingConfig):
+        CACHE_ENABLED = None
+        CACHE_L2_URL = ""
+
+    app = create_app(DefaultConfig)
+    with app.app_context():
+        assert cache.stats() == {"enabled": False}
+
+
+def test_local_cache_evicts_least_recently_used():
+    local = LocalCache(ttl=60, max_entries=2)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+    local.set("c", 3)
+    assert local.get("b") is None
+    assert local.get("a") == 1
+    assert local.stats()["evictions"] == 1
+
+
+def test_local_cache_expires_entries():
+    local = LocalCache(ttl=0)
+    local.set("a", 1)
+    assert local.get("a") is None
+    assert local.stats()["expirations"] == 1
+
+
+def test_load_crossing_an_invalidation_is_not_stored():
+    local = LocalCache()
+
+    def loader():
+        local.delete("a")
+        return "old"
+
+    assert local.get_or_set("a", loader) == "old"
+    assert local.get("a") is None
+
+
+def test_update_movie_invalidates_detail_and_etag(client, make_movie):
+    movie = make_movie(title="before")
+    first = client.get(f"/movies/{movie['id']}")
+    assert first.get_json()["title"] == "before"
+    assert client.put(f"/movies/{movie['id']}", json={"title": "after"}).status_code == 200
+    second = client.get(f"/movies/{movie['id']}", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.get_json()["title"] == "after"
+
+
+def test_add_season_invalidates_series_detail(client, make_series):
+    series = make_series(seasons=(5,))
+    assert client.get(f"/series/{series['id']}").get_json()["total_episodes"] == 5
+    client.post(f"/series/{series['id']}/seasons", json={"number": 2, "episodes_count": 7})
+    assert client.get(f"/series/{series['id']}").get_json()["total_episodes"] == 12
+
+
+def test_delete_movie_invalidates_detail(client, make_movie):
+    movie = make_movie()
+    assert client.get(f"/movies/{movie['id']}").status_code == 200
+    assert client.delete(f"/movies/{movie['id']}").status_code == 204
+    assert client.get(f"/movies/{movie['id']}").status_code == 404
+    assert cache.stats()["invalidations"] >= 1
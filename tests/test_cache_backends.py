@@ -0,0 +1,70 @@
+"""L2 compartido: invalidacion entre procesos y serializacion JSON."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src import cache_backends
+from src.cache import JSONCodec, LocalCache, TieredCache
+from src.cache_backends import SharedBackend, SQLiteBackend
+
+
+@pytest.fixture
+def l2_path(tmp_path):
+    return str(tmp_path / "cache.db")
+
+
+def test_shared_backend_is_abstract():
+    with pytest.raises(TypeError):
+        SharedBackend("origin")
+
+
+def test_invalidations_reach_workers_forked_with_the_same_origin(l2_path, monkeypatch):
+    # Con gunicorn --preload los workers heredan el backend y su origin
+    writer = SQLiteBackend(l2_path, "preloaded", poll_interval=0)
+    reader = SQLiteBackend(l2_path, "preloaded", poll_interval=0)
+    monkeypatch.setattr(cache_backends.os, "getpid", lambda: 101)
+    writer.invalidate(["movie:1"])
+    assert writer.poll() == []
+    monkeypatch.setattr(cache_backends.os, "getpid", lambda: 102)
+    assert reader.poll() == ["movie:1"]
+
+
+def test_tiered_cache_applies_remote_invalidations(l2_path, monkeypatch):
+    first = TieredCache(LocalCache(), SQLiteBackend(l2_path, "w", poll_interval=0))
+    second = TieredCache(LocalCache(), SQLiteBackend(l2_path, "w", poll_interval=0))
+    monkeypatch.setattr(cache_backends.os, "getpid", lambda: 201)
+    assert second.get_or_set("movie:1", lambda: {"title": "old"}) == {"title": "old"}
+    monkeypatch.setattr(cache_backends.os, "getpid", lambda: 202)
+    first.delete("movie:1")
+    monkeypatch.setattr(cache_backends.os, "getpid", lambda: 201)
+    assert second.get_or_set("movie:1", lambda: {"title": "new"}) == {"title": "new"}
+
+
+def test_l2_values_are_json_and_keep_tuples_and_datetimes(l2_path):
+    backend = SQLiteBackend(l2_path, "w", poll_interval=0)
+    tiered = TieredCache(LocalCache(), backend)
+    updated_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    value = (('W/"movie-1"', updated_at), {"id": 1, "genre": ["drama"], "created_at": updated_at})
+    tiered.set("movie:1", value)
+    raw = backend.get("movie:1")
+    assert raw.startswith(b"{")
+    assert JSONCodec().loads(raw) == value
+    fresh = TieredCache(LocalCache(), backend)
+    assert fresh.get("movie:1") == value
+
+
+def test_unreadable_l2_value_is_reloaded(l2_path):
+    backend = SQLiteBackend(l2_path, "w", poll_interval=0)
+    backend.set("movie:1", b"\x80\x04not json", 60, backend.generation("movie:1"))
+    tiered = TieredCache(LocalCache(), backend)
+    assert tiered.get_or_set("movie:1", lambda: {"id": 1}) == {"id": 1}
+    assert tiered.stats()["l2"]["errors"] == 1
+
+
+def test_codec_with_the_app_json_provider(app):
+    codec = JSONCodec(app.json.dumps, app.json.loads)
+    value = ("etag", datetime(2024, 5, 1, tzinfo=timezone.utc), [1, 2.5, None, True])
+    assert codec.loads(codec.dumps(value)) == value
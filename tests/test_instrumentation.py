@@ -0,0 +1,81 @@
+"""Metricas por solicitud: etiquetas, streaming y errores no manejados."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.config import TestingConfig
+from src.metrics import HTTP_REQUEST_SQL_STATEMENTS, HTTP_REQUESTS
+
+
+class MetricsConfig(TestingConfig):
+    # Los errores no manejados terminan en 500 en lugar de propagarse al test
+    PROPAGATE_EXCEPTIONS = False
+
+
+@pytest.fixture
+def config():
+    return MetricsConfig
+
+
+def _requests(endpoint: str, method: str, status: str) -> float:
+    return HTTP_REQUESTS.labels(endpoint, method, status).value
+
+
+def _send(client, path: str, method: str = "GET"):
+    """Solicitud completa: como un servidor WSGI, lee el cuerpo y cierra la respuesta."""
+    response = client.open(path, method=method)
+    response.get_data()
+    response.close()
+    return response
+
+
+def test_unknown_methods_share_one_label(client):
+    before = _requests("unmatched", "other", "405")
+    for method in ("PROPFIND", "X-CUSTOM-1", "X-CUSTOM-2"):
+        assert _send(client, "/movies/", method).status_code == 405
+    assert _requests("unmatched", "other", "405") == before + 3
+    assert not any(labels["method"].startswith("X-") for labels, _ in HTTP_REQUESTS.children())
+
+
+def test_unhandled_exception_is_counted_as_500(app, client):
+    def boom():
+        raise RuntimeError("boom")
+
+    app.add_url_rule("/boom", "boom", boom)
+    before = _requests("boom", "GET", "500")
+    assert _send(client, "/boom").status_code == 500
+    assert _requests("boom", "GET", "500") == before + 1
+
+
+def test_propagated_exception_is_counted_as_500(app, client):
+    def boom():
+        raise RuntimeError("boom")
+
+    app.add_url_rule("/boom", "boom", boom)
+    app.config["PROPAGATE_EXCEPTIONS"] = True
+    before = _requests("boom", "GET", "500")
+    with pytest.raises(RuntimeError):
+        client.get("/boom")
+    assert _requests("boom", "GET", "500") == before + 1
+
+
+def test_streamed_response_records_its_queries(client, make_movie):
+    make_movie()
+    histogram = HTTP_REQUEST_SQL_STATEMENTS.labels("movies.list_movies", "GET")
+    before = histogram.snapshot()
+    response = client.get("/movies/?stream=ndjson")
+    # El header se arma antes del cuerpo; las metricas esperan a que termine
+    assert 'desc="0 queries"' in response.headers["Server-Timing"]
+    assert response.get_data()
+    assert histogram.snapshot()["count"] == before["count"]
+    response.close()
+    after = histogram.snapshot()
+    assert after["count"] == before["count"] + 1
+    assert after["sum"] > before["sum"]
+
+
+def test_server_timing_header(client):
+    response = _send(client, "/movies/")
+    assert response.headers["Server-Timing"].startswith("app;dur=")
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
@@ -0,0 +1,49 @@
+"""``compute_percentage`` y su equivalente SQL deben coincidir fila a fila."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.extensions import db
+from src.models.watch_entry import compute_percentage, percentage_expression
+
+
+@pytest.mark.parametrize(
+    ("total", "watched", "status", "expected"),
+    [
+        (None, 0, "completed", 100.0),
+        (0, 3, "watching", 0.0),
+        (3, 1, "watching", 33.33),
+        (3, 2, "watching", 66.67),
+        # Media centesima exacta: se redondea hacia arriba, no al par
+        (800, 1, "watching", 0.13),
+        (10, 12, "watching", 100.0),
+        (10, -1, "watching", 0.0),
+    ],
+)
+def test_compute_percentage(total, watched, status, expected):
+    assert compute_percentage(total, watched, status) == expected
+
+
+def test_sql_expression_matches_python(app):
+    pairs = [(total, watched) for total in range(0, 401) for watched in range(-1, total + 2)]
+    table = db.Table(
+        "percentage_pairs",
+        db.MetaData(),
+        db.Column("total", db.Integer),
+        db.Column("watched", db.Integer),
+        prefixes=["TEMPORARY"],
+    )
+    table.create(db.session.connection())
+    db.session.execute(table.insert(), [{"total": total, "watched": watched} for total, watched in pairs])
+    stmt = db.select(
+        table.c.total,
+        table.c.watched,
+        percentage_expression(table.c.total, table.c.watched, db.literal("watching")),
+    )
+    mismatches = [
+        (total, watched, stored)
+        for total, watched, stored in db.session.execute(stmt)
+        if stored != compute_percentage(total, watched, "watching")
+    ]
+    assert mismatches == []
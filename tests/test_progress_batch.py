@@ -0,0 +1,95 @@
+"""``PATCH /progress/series``: resultados por item, series repetidas y consultas."""
+
+from __future__ import annotations
+
+import pytest
+
+SERIES = 5
+
+
+@pytest.fixture
+def headers(user) -> dict:
+    return {"X-User-Id": str(user)}
+
+
+@pytest.fixture
+def watched(client, headers, make_series) -> list[int]:
+    """Series en la watchlist: la temporada 1 tiene 2 episodios y la 3, 10."""
+    ids = []
+    for i in range(SERIES):
+        serie = make_series(seasons=(2, 5, 10), title=f"series {i}")
+        assert client.post(f"/watchlist/series/{serie['id']}", headers=headers).status_code == 201
+        ids.append(serie["id"])
+    return ids
+
+
+def _patch(client, headers, items):
+    return client.patch("/progress/series", json=items, headers=headers)
+
+
+def _entry(client, headers, series_id: int) -> dict:
+    return next(
+        item for item in client.get("/me/watchlist?all=1", headers=headers).get_json() if item["content_id"] == series_id
+    )
+
+
+def test_mixed_results_keep_order(client, headers, watched, make_series):
+    outside = make_series(title="not in watchlist")
+    response = _patch(
+        client,
+        headers,
+        [
+            {"series_id": watched[0], "watched_episodes": 3},
+            {"series_id": "x", "watched_episodes": 1},
+            {"series_id": outside["id"], "watched_episodes": 1},
+            {"series_id": watched[1], "watched_episodes": -1},
+        ],
+    )
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [result["status"] for result in body["results"]] == [200, 400, 404, 400]
+    assert body["updated"] == 1
+    assert body["results"][0]["entry"]["watched_episodes"] == 3
+
+
+def test_invalid_body_is_rejected(client, headers):
+    assert _patch(client, headers, []).status_code == 400
+    assert _patch(client, headers, {"series_id": 1}).status_code == 400
+
+
+def test_failed_item_leaves_the_entry_as_before(client, headers, watched):
+    series_id = watched[0]
+    before = _entry(client, headers, series_id)
+    response = _patch(
+        client,
+        headers,
+        [
+            {"series_id": series_id, "watched_episodes": 4},
+            # Falla en current_episode despues de cambiar current_season: no se aplica nada del item
+            {"series_id": series_id, "current_season": 2, "current_episode": 9},
+        ],
+    )
+    assert [result["status"] for result in response.get_json()["results"]] == [200, 400]
+    entry = _entry(client, headers, series_id)
+    assert entry["watched_episodes"] == 4
+    assert (entry["current_season"], entry["current_episode"]) == (before["current_season"], before["current_episode"])
+
+
+def test_repeated_series_validate_against_the_updated_season(client, headers, watched, count_statements):
+    items = []
+    for series_id in watched:
+        items += [{"series_id": series_id, "current_season": 3}, {"series_id": series_id, "current_episode": 8}]
+    with count_statements() as counter:
+        response = _patch(client, headers, items)
+    assert response.status_code == 200, response.get_json()
+    assert [result["status"] for result in response.get_json()["results"]] == [200] * len(items)
+    # Entradas, temporadas, UPDATE de las entradas y lectura final, sin importar cuantos items
+    assert len(counter) <= 4, "\n".join(counter.statements)
+    entry = _entry(client, headers, watched[0])
+    assert (entry["current_season"], entry["current_episode"]) == (3, 8)
+
+    # Con la temporada 1 (2 episodios) el mismo episodio se rechaza
+    response = _patch(
+        client, headers, [{"series_id": watched[0], "current_season": 1}, {"series_id": watched[0], "current_episode": 8}]
+    )
+    assert [result["status"] for result in response.get_json()["results"]] == [200, 400]
@@ -0,0 +1,150 @@
+"""Cota de sentencias SQL por endpoint: las lecturas no crecen con los datos."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.extensions import db
+from src.models import Season
+
+# Contenidos por tipo: con mas de uno por listado se detecta una carga por fila
+ROWS = 5
+
+
+@pytest.fixture
+def catalog(client, user, make_movie, make_series):
+    movies = [make_movie(title=f"movie {i}") for i in range(ROWS)]
+    series = [make_series(seasons=(8, 10), title=f"series {i}") for i in range(ROWS)]
+    headers = {"X-User-Id": str(user)}
+    for movie in movies:
+        assert client.post(f"/watchlist/movies/{movie['id']}", headers=headers).status_code == 201
+    for serie in series:
+        assert client.post(f"/watchlist/series/{serie['id']}", headers=headers).status_code == 201
+    # Contenidos fuera de la watchlist para medir las altas
+    extra = {"movie": make_movie(title="extra"), "series": make_series(title="extra")}
+    return {"movies": movies, "series": series, "extra": extra, "headers": headers}
+
+
+def _series_id(catalog) -> int:
+    return catalog["series"][0]["id"]
+
+
+def _movie_id(catalog) -> int:
+    return catalog["movies"][0]["id"]
+
+
+# (metodo, ruta, cuerpo, cota de sentencias); las rutas se arman con el catalogo
+READS = [
+    ("GET", lambda c: "/movies/", 1),
+    ("GET", lambda c: "/movies/?all=1", 1),
+    ("GET", lambda c: "/movies/?genre=drama", 1),
+    ("GET", lambda c: f"/movies/{_movie_id(c)}", 1),
+    ("GET", lambda c: "/series/", 1),
+    ("GET", lambda c: "/series/?all=1", 1),
+    ("GET", lambda c: "/series/?all=1&include_seasons=1", 2),
+    ("GET", lambda c: f"/series/{_series_id(c)}", 2),
+    ("GET", lambda c: "/me/watchlist", 3),
+    ("GET", lambda c: "/me/watchlist?sort=percentage", 2),
+    ("GET", lambda c: "/me/watchlist/changes", 3),
+    ("GET", lambda c: "/me/stats", 1),
+]
+
+WRITES = [
+    ("POST", lambda c: "/movies/", {"title": "new", "genre": ["drama", "comedy"], "release_year": 2001}, 3),
+    ("POST", lambda c: "/series/", {"title": "new", "total_seasons": 2}, 2),
+    ("POST", lambda c: f"/series/{_series_id(c)}/seasons", {"number": 3, "episodes_count": 6}, 6),
+    ("POST", lambda c: f"/watchlist/movies/{c['extra']['movie']['id']}", None, 2),
+    ("POST", lambda c: f"/watchlist/series/{c['extra']['series']['id']}", None, 2),
+    ("PUT", lambda c: f"/movies/{_movie_id(c)}", {"title": "renamed"}, 3),
+    ("PUT", lambda c: f"/series/{_series_id(c)}", {"title": "renamed"}, 5),
+    ("PATCH", lambda c: f"/progress/series/{_series_id(c)}", {"watched_episodes": 3}, 6),
+    (
+        "PATCH",
+        lambda c: "/progress/series",
+        lambda c: [{"series_id": serie["id"], "watched_episodes": 2, "status": "paused"} for serie in c["series"]],
+        4,
+    ),
+    ("PUT", lambda c: f"/series/{_series_id(c)}/seasons/1", {"episodes_count": 12}, 5),
+    ("DELETE", lambda c: f"/movies/{_movie_id(c)}", None, 9),
+    ("DELETE", lambda c: f"/series/{_series_id(c)}", None, 8),
+    ("DELETE", lambda c: f"/series/{_series_id(c)}/seasons/2", None, 4),
+]
+
+
+@pytest.mark.parametrize(("method", "path", "limit"), READS, ids=[f"{m} {i}" for i, (m, _, _) in enumerate(READS)])
+def test_read_statement_count(client, catalog, count_statements, method, path, limit):
+    url = path(catalog)
+    with count_statements() as counter:
+        response = client.open(url, method=method, headers=catalog["headers"])
+    assert response.status_code == 200, response.get_json()
+    assert len(counter) <= limit, f"{method} {url}: {len(counter)} sentencias\n" + "\n".join(counter.statements)
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "body", "limit"), WRITES, ids=[f"{m} {i}" for i, (m, _, _, _) in enumerate(WRITES)]
+)
+def test_write_statement_count(client, catalog, count_statements, method, path, body, limit):
+    url = path(catalog)
+    body = body(catalog) if callable(body) else body
+    with count_statements() as counter:
+        response = client.open(url, method=method, json=body, headers=catalog["headers"])
+    assert response.status_code in (200, 201, 204), response.get_json()
+    assert len(counter) <= limit, f"{method} {url}: {len(counter)} sentencias\n" + "\n".join(counter.statements)
+
+
+def _ndjson(rows: list[dict]) -> str:
+    return "\n".join(json.dumps(row) for row in rows)
+
+
+def test_bulk_import_series_statement_count(client, count_statements):
+    body = _ndjson([{"title": f"bulk {i}", "total_seasons": 2} for i in range(50)])
+    with count_statements() as counter:
+        response = client.post("/series/bulk", data=body, content_type="application/x-ndjson")
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()["inserted"] == 50
+    assert len(counter) <= 1, "\n".join(counter.statements)
+
+
+def test_bulk_import_movies_statement_count(client, count_statements):
+    # Un INSERT por lote de peliculas y otro para sus generos, sin importar cuantas lineas
+    body = _ndjson([{"title": f"bulk {i}", "genre": ["drama", f"g{i % 3}"], "release_year": 2000} for i in range(50)])
+    with count_statements() as counter:
+        response = client.post("/movies/bulk", data=body, content_type="application/x-ndjson")
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()["inserted"] == 50
+    assert len(counter) <= 2, "\n".join(counter.statements)
+    genres = client.get("/movies/?all=1&genre=g1").get_json()
+    assert sorted(movie["title"] for movie in genres) == sorted(f"bulk {i}" for i in range(50) if i % 3 == 1)
+
+
+@pytest.mark.parametrize("path", ["/me/watchlist", "/me/watchlist?all=1", "/me/watchlist?sort=percentage", "/me/stats"])
+def test_watchlist_reads_do_not_grow_with_watch_entries(client, catalog, count_statements, make_movie, make_series, path):
+    headers = catalog["headers"]
+    with count_statements() as before:
+        assert client.get(path, headers=headers).status_code == 200
+    for i in range(ROWS):
+        movie, serie = make_movie(title=f"more {i}"), make_series(title=f"more {i}")
+        assert client.post(f"/watchlist/movies/{movie['id']}", headers=headers).status_code == 201
+        assert client.post(f"/watchlist/series/{serie['id']}", headers=headers).status_code == 201
+    with count_statements() as after:
+        assert client.get(path, headers=headers).status_code == 200
+    assert len(after) == len(before), "\n".join(after.statements)
+
+
+def test_series_listing_does_not_grow_with_series(client, catalog, count_statements, make_series):
+    with count_statements() as before:
+        client.get("/series/?all=1&include_seasons=1")
+    for i in range(ROWS):
+        make_series(seasons=(3, 3), title=f"extra {i}")
+    with count_statements() as after:
+        client.get("/series/?all=1&include_seasons=1")
+    assert len(after) == len(before)
+
+
+def test_delete_series_removes_its_seasons(client, catalog):
+    series_id = _series_id(catalog)
+    assert client.delete(f"/series/{series_id}").status_code == 204
+    remaining = db.session.scalar(db.select(db.func.count()).select_from(Season).where(Season.series_id == series_id))
+    assert remaining == 0
@@ -0,0 +1,117 @@
+"""``GET /me/stats`` incremental contra el agregado calculado desde cero."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.api.stats import UserStatsService
+from src.extensions import db
+from src.models import User, UserStats, WatchEntry
+from src.models.user_stats import STATS_COUNTERS
+
+USERS = (1, 2)
+
+
+@pytest.fixture
+def users(app) -> tuple[int, ...]:
+    db.session.add_all(User(id=user_id, name=f"user {user_id}", email=f"user{user_id}@test.local") for user_id in USERS)
+    db.session.commit()
+    return USERS
+
+
+def _headers(user_id: int) -> dict:
+    return {"X-User-Id": str(user_id)}
+
+
+def _expected(user_id: int) -> dict:
+    """Contadores recalculados en Python a partir de las entradas."""
+    counters = dict.fromkeys(STATS_COUNTERS, 0)
+    for entry in db.session.scalars(db.select(WatchEntry).where(WatchEntry.user_id == user_id)):
+        counters["entries"] += 1
+        counters["movies" if entry.content_type == "movie" else "series"] += 1
+        counters[entry.status] += 1
+        if entry.content_type == "series":
+            counters["episodes_watched"] += entry.watched_episodes or 0
+    return counters
+
+
+def _assert_consistent(client, user_ids=USERS) -> None:
+    db.session.expire_all()
+    for user_id in user_ids:
+        served = client.get("/me/stats", headers=_headers(user_id)).get_json()
+        assert {name: served[name] for name in STATS_COUNTERS} == _expected(user_id), f"usuario {user_id}"
+
+
+@pytest.fixture
+def catalog(client, users, make_movie, make_series) -> dict:
+    movies = [make_movie(title=f"movie {i}") for i in range(2)]
+    series = [make_series(seasons=(5, 5), title=f"series {i}") for i in range(2)]
+    for user_id in users:
+        for movie in movies:
+            assert client.post(f"/watchlist/movies/{movie['id']}", headers=_headers(user_id)).status_code == 201
+        for serie in series:
+            assert client.post(f"/watchlist/series/{serie['id']}", headers=_headers(user_id)).status_code == 201
+    return {"movies": movies, "series": series}
+
+
+def test_add_entries(client, catalog):
+    _assert_consistent(client)
+    assert client.get("/me/stats", headers=_headers(1)).get_json()["entries"] == 4
+
+
+def test_single_progress_update(client, catalog):
+    series_id = catalog["series"][0]["id"]
+    response = client.patch(f"/progress/series/{series_id}", json={"watched_episodes": 4}, headers=_headers(1))
+    assert response.status_code == 200
+    response = client.patch(f"/progress/series/{series_id}", json={"status": "completed"}, headers=_headers(1))
+    assert response.status_code == 200
+    _assert_consistent(client)
+
+
+def test_batch_progress_with_a_failed_item(client, catalog):
+    first, second = (serie["id"] for serie in catalog["series"])
+    response = client.patch(
+        "/progress/series",
+        json=[
+            {"series_id": first, "watched_episodes": 3},
+            {"series_id": first, "status": "paused"},
+            {"series_id": second, "watched_episodes": 99},
+            {"series_id": second, "status": "completed"},
+        ],
+        headers=_headers(1),
+    )
+    assert [result["status"] for result in response.get_json()["results"]] == [200, 200, 400, 200]
+    _assert_consistent(client)
+
+
+def test_catalog_deletes(client, catalog):
+    client.patch(f"/progress/series/{catalog['series'][0]['id']}", json={"watched_episodes": 2}, headers=_headers(2))
+    assert client.delete(f"/movies/{catalog['movies'][0]['id']}").status_code == 204
+    _assert_consistent(client)
+    assert client.delete(f"/series/{catalog['series'][0]['id']}").status_code == 204
+    _assert_consistent(client)
+    assert client.get("/me/stats", headers=_headers(2)).get_json()["entries"] == 2
+
+
+def test_missing_row_is_created_from_the_aggregate(client, catalog):
+    db.session.execute(db.delete(UserStats).where(UserStats.user_id == 1))
+    db.session.commit()
+    series_id = catalog["series"][0]["id"]
+    assert client.patch(f"/progress/series/{series_id}", json={"watched_episodes": 5}, headers=_headers(1)).status_code == 200
+    _assert_consistent(client)
+
+
+def test_concurrently_created_row_falls_back_to_update(client, catalog, monkeypatch):
+    # Otra transaccion creo la fila entre el UPDATE fallido y el INSERT: se reintenta el UPDATE
+    original = UserStatsService._update
+    calls = []
+
+    def update_missing_once(self, user_id, delta):
+        calls.append(user_id)
+        return False if len(calls) == 1 else original(self, user_id, delta)
+
+    monkeypatch.setattr(UserStatsService, "_update", update_missing_once)
+    series_id = catalog["series"][0]["id"]
+    assert client.patch(f"/progress/series/{series_id}", json={"watched_episodes": 1}, headers=_headers(1)).status_code == 200
+    assert len(calls) == 2
+    _assert_consistent(client)
@@ -0,0 +1,70 @@
+"""Exportaciones en streaming: mismo contenido y filtros que ``?all=1``."""
+
+from __future__ import annotations
+
+import json
+
+
+def _ndjson(response) -> list[dict]:
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines() if line]
+
+
+def test_stream_movies_matches_all(client, make_movie):
+    for i in range(3):
+        make_movie(title=f"movie {i}")
+    listed = client.get("/movies/?all=1").get_json()
+    assert client.get("/movies/?stream=1").get_json() == listed
+    assert _ndjson(client.get("/movies/?stream=ndjson")) == listed
+
+
+def test_stream_movies_applies_filters(client, make_movie):
+    drama = make_movie(title="drama", genre=["Drama"], release_year=1999)
+    make_movie(title="comedy", genre=["comedy"], release_year=1999)
+    make_movie(title="old drama", genre=["drama"], release_year=1980)
+    rows = _ndjson(client.get("/movies/?stream=ndjson&genre=drama&year=1999"))
+    assert [row["id"] for row in rows] == [drama["id"]]
+
+
+def test_stream_movies_rejects_invalid_year(client):
+    response = client.get("/movies/?stream=1&year=abc")
+    assert response.status_code == 400
+
+
+def test_stream_watchlist_unknown_user_is_404(client):
+    response = client.get("/me/watchlist?stream=1", headers={"X-User-Id": "99"})
+    assert response.status_code == 404
+
+
+def test_stream_watchlist_applies_filters_and_sort(client, user, make_series):
+    headers = {"X-User-Id": str(user)}
+    series = [make_series(title=f"series {i}") for i in range(3)]
+    for serie in series:
+        assert client.post(f"/watchlist/series/{serie['id']}", headers=headers).status_code == 201
+    completed = [series[0]["id"], series[2]["id"]]
+    for series_id in completed:
+        response = client.patch(f"/progress/series/{series_id}", json={"status": "completed"}, headers=headers)
+        assert response.status_code == 200, response.get_json()
+
+    page = client.get("/me/watchlist?status=completed&sort=-updated_at&limit=50", headers=headers).get_json()
+    rows = _ndjson(client.get("/me/watchlist?stream=ndjson&status=completed&sort=-updated_at", headers=headers))
+    assert [row["content_id"] for row in rows] == [item["content_id"] for item in page["items"]]
+    assert sorted(row["content_id"] for row in rows) == sorted(completed)
+
+
+def test_stream_watchlist_rejects_invalid_filters(client, user):
+    response = client.get("/me/watchlist?stream=1&status=nope", headers={"X-User-Id": str(user)})
+    assert response.status_code == 400
+
+
+def test_stream_series_includes_seasons_by_batch(app, client, make_series, count_statements):
+    app.config["STREAM_YIELD_PER"] = 2
+    for i in range(5):
+        make_series(seasons=(3, 4), title=f"series {i}")
+    listed = client.get("/series/?all=1&include_seasons=1").get_json()
+    assert all(len(item["seasons"]) == 2 for item in listed)
+    with count_statements() as counter:
+        rows = _ndjson(client.get("/series/?stream=ndjson&include_seasons=1"))
+    assert rows == listed
+    # Una consulta de series y una de temporadas por cada lote de dos
+    assert len(counter) <= 4
+    assert "seasons" not in _ndjson(client.get("/series/?stream=ndjson"))[0]
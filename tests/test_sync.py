@@ -0,0 +1,90 @@
+"""Sincronizacion incremental: tokens, tombstones y retencion."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from src.config import TestingConfig
+
+# Retencion de medio segundo para poder superarla dentro del test
+RETENTION_SECONDS = 0.5
+
+
+class SyncConfig(TestingConfig):
+    WATCHLIST_SYNC_SAFETY_SECONDS = 0
+    WATCHLIST_TOMBSTONE_RETENTION_DAYS = RETENTION_SECONDS / 86400
+
+
+@pytest.fixture
+def config():
+    return SyncConfig
+
+
+@pytest.fixture
+def headers(user) -> dict:
+    return {"X-User-Id": str(user)}
+
+
+def _poll(client, headers, token=None):
+    query = f"?since={token}" if token else ""
+    return client.get(f"/me/watchlist/changes{query}", headers=headers)
+
+
+def test_polls_without_deletions_keep_the_token_valid(client, headers, make_movie):
+    movie = make_movie()
+    assert client.post(f"/watchlist/movies/{movie['id']}", headers=headers).status_code == 201
+    token = _poll(client, headers).get_json()["next_token"]
+    # Consultas frecuentes sin eliminaciones durante mas que la retencion
+    for _ in range(6):
+        time.sleep(RETENTION_SECONDS / 3)
+        response = _poll(client, headers, token)
+        assert response.status_code == 200, response.get_json()
+        assert response.get_json()["changes"] == []
+        token = response.get_json()["next_token"]
+
+
+def test_stale_token_is_gone(client, headers):
+    token = _poll(client, headers).get_json()["next_token"]
+    time.sleep(RETENTION_SECONDS * 1.2)
+    # Un cliente que no consulto durante la retencion debe descargar todo de nuevo
+    assert _poll(client, headers, token).status_code == 410
+
+
+def test_changes_and_deletions_follow_the_token(client, headers, make_movie):
+    kept, removed = make_movie(title="kept"), make_movie(title="removed")
+    for movie in (kept, removed):
+        assert client.post(f"/watchlist/movies/{movie['id']}", headers=headers).status_code == 201
+    first = _poll(client, headers).get_json()
+    assert sorted(item["content_id"] for item in first["changes"]) == sorted([kept["id"], removed["id"]])
+    assert first["deleted"] == [] and first["has_more"] is False
+
+    assert client.delete(f"/movies/{removed['id']}").status_code in (200, 204)
+    second = _poll(client, headers, first["next_token"]).get_json()
+    assert second["changes"] == []
+    assert [item["content_id"] for item in second["deleted"]] == [removed["id"]]
+
+    third = _poll(client, headers, second["next_token"]).get_json()
+    assert third["changes"] == [] and third["deleted"] == []
+
+
+def test_limit_pages_through_changes(client, headers, make_movie):
+    ids = []
+    for i in range(3):
+        movie = make_movie(title=f"movie {i}")
+        assert client.post(f"/watchlist/movies/{movie['id']}", headers=headers).status_code == 201
+        ids.append(movie["id"])
+    seen, token = [], None
+    while True:
+        page = _poll(client, headers, token) if token else client.get("/me/watchlist/changes?limit=2", headers=headers)
+        body = page.get_json()
+        seen += [item["content_id"] for item in body["changes"]]
+        token = body["next_token"]
+        if not body["has_more"]:
+            break
+    assert sorted(seen) == sorted(ids)
+
+
+def test_invalid_token_is_rejected(client, headers):
+    assert _poll(client, headers, "not-a-token").status_code == 400